@@ -269,6 +269,7 @@ class StackController(object):
         stacks = self.rpc_client.list_stacks(req.context,
                                              filters=filter_params,
                                              tenant_safe=tenant_safe,
+                                             summary=True,
                                              **params)
 
         count = None
@@ -55,6 +55,25 @@ def register_cache_configurations(conf):
     conf.register_group(constraint_cache_group)
     conf.register_opts(constraint_cache_opts, group=constraint_cache_group)
 
+    lookup_cache_group = cfg.OptGroup('client_lookup_cache')
+    lookup_cache_opts = [
+        cfg.IntOpt('expiration_time', default=60,
+                   help=_(
+                       'TTL, in seconds, for any cached item in the '
+                       'dogpile.cache region used for caching of the IDs '
+                       'that client plugins look up by name.')),
+        cfg.BoolOpt("caching", default=True,
+                    help=_(
+                        'Toggle to enable/disable caching when Orchestration '
+                        'Engine looks up the IDs of entities such as flavors, '
+                        'images and networks by name. Lookups are always '
+                        'shared within a single request. Please note that the '
+                        'global toggle for oslo.cache(enabled=True in [cache] '
+                        'group) must be enabled to use this feature.'))
+    ]
+    conf.register_group(lookup_cache_group)
+    conf.register_opts(lookup_cache_opts, group=lookup_cache_group)
+
     return conf
 
 
@@ -129,6 +129,35 @@ engine_opts = [
                help=_('Maximum events that will be available per stack. Older'
                       ' events will be deleted when this is reached. Set to 0'
                       ' for unlimited events per stack.')),
+    cfg.IntOpt('event_write_batch_size',
+               default=1,
+               help=_('Maximum number of events for a stack that the engine '
+                      'buffers before writing them to the database together. '
+                      'Buffered events are written within '
+                      'event_write_delay seconds, and always before the '
+                      'stack action completes or fails. Set to 1 to write '
+                      'each event as it occurs.')),
+    cfg.FloatOpt('event_write_delay',
+                 default=1.0,
+                 help=_('Maximum time in seconds that an event is buffered '
+                        'before it is written to the database.')),
+    cfg.FloatOpt('signal_metadata_refresh_delay',
+                 default=0.0,
+                 help=_('Time in seconds to wait, after an asynchronous '
+                        'resource signal, before refreshing the metadata of '
+                        'the resources that refer to the signalled resource. '
+                        'Signals to the same stack that arrive within this '
+                        'time share a single refresh. Set to 0 to refresh '
+                        'the metadata after each signal.')),
+    cfg.StrOpt('event_properties_storage',
+               choices=['copy', 'reference'],
+               default='copy',
+               help=_('How the resource properties shown in events are '
+                      'stored. copy resolves the properties and stores a '
+                      'copy of them in every event. reference stores each '
+                      'distinct set of stored resource properties data only '
+                      'once, identified by a hash of its content, and '
+                      'events refer to it.')),
     cfg.IntOpt('stack_action_timeout',
                default=3600,
                help=_('Timeout in seconds for stack action (ie. create or'
@@ -155,6 +184,74 @@ engine_opts = [
                 help=_('Enables engine with convergence architecture. All '
                        'stacks with this option will be created using '
                        'convergence engine .')),
+    cfg.IntOpt('max_cached_traversals',
+               default=100,
+               help=_('Maximum number of parsed stack templates, with their '
+                      'convergence dependency graphs, that each convergence '
+                      'worker caches for the traversals it is processing.')),
+    cfg.IntOpt('max_concurrent_attribute_lookups',
+               default=10,
+               help=_('Maximum number of resources whose attributes are '
+                      'looked up concurrently, in separate green threads, '
+                      'when resolving stack outputs. Only resource types '
+                      'that look up attributes solely through remote API '
+                      'calls are resolved concurrently.')),
+    cfg.IntOpt('max_concurrent_validations',
+               default=10,
+               help=_('Maximum number of resources in a stack that are '
+                      'validated concurrently, in separate green threads. '
+                      'Identical custom constraint lookups made while a '
+                      'stack is validated are performed only once.')),
+    cfg.IntOpt('max_cached_templates',
+               default=200,
+               help=_('Maximum number of stored templates for which each '
+                      'engine process caches the parsed state that depends '
+                      'only on the template content, such as its version '
+                      'and translated sections.')),
+    cfg.IntOpt('stored_context_cache_ttl',
+               default=0,
+               help=_('Time in seconds for which each engine process caches '
+                      'the stored credentials of a stack, such as those used '
+                      'to handle resource signals, after reading and '
+                      'decrypting them. Set to 0 to read them from the '
+                      'database each time they are used.')),
+    cfg.BoolOpt('batch_resource_signals',
+                default=False,
+                help=_('Queue asynchronous signals that arrive for a resource '
+                       'while an earlier signal to it is being handled, and '
+                       'handle them all with the stack that is already '
+                       'loaded, followed by a single metadata refresh.')),
+    cfg.StrOpt('sync_point_storage',
+               choices=['single_row', 'append_only'],
+               default='single_row',
+               help=_('How the convergence engine records the input from '
+                      'predecessors at each sync point. single_row merges '
+                      'all input into one row using an atomic '
+                      'compare-and-swap update, retrying on conflict. '
+                      'append_only inserts one row per predecessor and '
+                      'decides readiness with a count query, which avoids '
+                      'retries when many predecessors finish at once.')),
+    cfg.MultiStrOpt('check_complete_poll_policy',
+                    default=[],
+                    help=_('Polling policy for checking whether an action on '
+                           'resources of a particular type is complete, in '
+                           'the format "<resource type>=<initial interval>,'
+                           '<maximum interval>,<jitter>". The resource type '
+                           'may contain wildcards. The interval between '
+                           'checks starts at the initial interval and '
+                           'doubles after each check, up to the maximum, '
+                           'with up to the jitter in seconds added at '
+                           'random. Resources with no matching policy are '
+                           'checked on every scheduler step. This option '
+                           'may be specified more than once, and the first '
+                           'matching policy is used.')),
+    cfg.IntOpt('server_status_poll_interval',
+               default=0,
+               help=_('Interval in seconds between requests to Nova for the '
+                      'status of all of the servers in a tenant that the '
+                      'engine is waiting to become active. Set to 0 to '
+                      'request the status of each server individually every '
+                      'time it is checked.')),
     cfg.StrOpt('default_software_config_transport',
                choices=['POLL_SERVER_CFN',
                         'POLL_SERVER_HEAT',
@@ -59,7 +59,8 @@ class RequestContext(context.RequestContext):
                                              is_admin=is_admin,
                                              read_only=read_only,
                                              show_deleted=show_deleted,
-                                             request_id=request_id)
+                                             request_id=request_id,
+                                             overwrite=overwrite)
 
         self.username = username
         self.user_id = user_id
@@ -30,17 +30,60 @@ def get_size(group, include_failed=False):
         return 0
 
 
+class MemberIndex(object):
+    """An index of the members of a group's nested stack.
+
+    The members are sorted once, first by created_time then by name, and
+    can then be looked up by position without sorting the nested stack
+    again.
+    """
+
+    def __init__(self, nested):
+        self.nested = nested
+        self.members = sorted((r for r in six.itervalues(nested)
+                               if r.status != r.FAILED),
+                              key=lambda r: (r.created_time, r.name))
+        self._refids = None
+
+    @property
+    def names(self):
+        return [r.name for r in self.members]
+
+    @property
+    def refids(self):
+        if self._refids is None:
+            self._refids = [r.FnGetRefId() for r in self.members]
+        return self._refids
+
+
+def get_member_index(group):
+    """Get the index of member resources managed by the specified group.
+
+    The index is kept on the group and dropped when the group's nested stack
+    is replaced, which happens whenever an action on the nested stack, and so
+    on its members, finishes. Returns None if the group has no nested stack.
+    """
+    nested = group.nested()
+    if not nested:
+        return None
+
+    index = getattr(group, '_member_index', None)
+    if not isinstance(index, MemberIndex) or index.nested is not nested:
+        index = MemberIndex(nested)
+        group._member_index = index
+    return index
+
+
 def get_members(group):
     """Get a list of member resources managed by the specified group.
 
     Sort the list of instances first by created_time then by name.
     """
-    resources = []
-    if group.nested():
-        resources = [r for r in six.itervalues(group.nested())
-                     if r.status != r.FAILED]
+    index = get_member_index(group)
+    if index is None:
+        return []
 
-    return sorted(resources, key=lambda r: (r.created_time, r.name))
+    return list(index.members)
 
 
 def get_member_refids(group, exclude=None):
@@ -48,21 +91,24 @@ def get_member_refids(group, exclude=None):
 
     The list of resources is sorted first by created_time then by name.
     """
-    members = get_members(group)
-    if len(members) == 0:
+    index = get_member_index(group)
+    if index is None:
         return []
 
     if exclude is None:
         exclude = []
-    return [r.FnGetRefId() for r in members
-            if r.FnGetRefId() not in exclude]
+    return [refid for refid in index.refids if refid not in exclude]
 
 
 def get_member_names(group):
     """Get a list of resource names of the resources in the specified group.
     Failed resources will be ignored.
     """
-    return [r.name for r in get_members(group)]
+    index = get_member_index(group)
+    if index is None:
+        return []
+
+    return index.names
 
 
 def get_resource(stack, resource_name, use_indices, key):
@@ -71,7 +117,7 @@ def get_resource(stack, resource_name, use_indices, key):
         return None
     try:
         if use_indices:
-            return get_members(stack)[int(resource_name)]
+            return get_member_index(stack).members[int(resource_name)]
         else:
             return nested_stack[resource_name]
     except (IndexError, KeyError):
@@ -0,0 +1,81 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""A simple in-process cache with least recently used eviction.
+
+The cache is not shared between processes, so it must only be used to hold
+data that can be rebuilt from the database at any time.
+"""
+
+import collections
+
+
+class LRUCache(object):
+    """A mapping of bounded size that evicts the least recently used items.
+
+    Counts of cache hits and misses are kept so that the effectiveness of
+    the cache can be reported.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = collections.OrderedDict()
+
+    def get(self, key, default=None):
+        """Return the item for a key, marking it as recently used."""
+        try:
+            value = self._items.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self._items[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store an item, evicting the oldest items if the cache is full."""
+        self._items.pop(key, None)
+        self._items[key] = value
+        while len(self._items) > max(self.maxsize, 0):
+            self._items.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Remove an item from the cache and return it."""
+        return self._items.pop(key, default)
+
+    def evict(self, predicate):
+        """Remove every item whose key matches the given predicate."""
+        for key in [k for k in self._items if predicate(k)]:
+            del self._items[key]
+
+    def values(self):
+        """Return a list of the cached items, least recently used first."""
+        return list(self._items.values())
+
+    def items(self):
+        """Return a list of the cached (key, item) pairs, least recently used
+        first.
+        """
+        return list(self._items.items())
+
+    def clear(self):
+        self._items.clear()
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
@@ -39,6 +39,10 @@ def get_engine():
     return IMPL.get_engine()
 
 
+def transaction(context):
+    return IMPL.transaction(context)
+
+
 def get_session():
     return IMPL.get_session()
 
@@ -47,6 +51,10 @@ def raw_template_get(context, template_id):
     return IMPL.raw_template_get(context, template_id)
 
 
+def raw_template_get_templates(context, template_ids):
+    return IMPL.raw_template_get_templates(context, template_ids)
+
+
 def raw_template_create(context, values):
     return IMPL.raw_template_create(context, values)
 
@@ -114,6 +122,10 @@ def resource_exchange_stacks(context, resource_id1, resource_id2):
     return IMPL.resource_exchange_stacks(context, resource_id1, resource_id2)
 
 
+def resource_get_all_by_stack_ids(context, stack_ids):
+    return IMPL.resource_get_all_by_stack_ids(context, stack_ids)
+
+
 def resource_get_all_by_stack(context, stack_id, key_id=False):
     return IMPL.resource_get_all_by_stack(context, stack_id, key_id)
 
@@ -135,6 +147,13 @@ def stack_get(context, stack_id, show_deleted=False, tenant_safe=True,
                           eager_load=eager_load)
 
 
+def stack_get_status(context, stack_id, show_deleted=False,
+                     tenant_safe=True):
+    return IMPL.stack_get_status(context, stack_id,
+                                 show_deleted=show_deleted,
+                                 tenant_safe=tenant_safe)
+
+
 def stack_get_by_name_and_owner_id(context, stack_name, owner_id):
     return IMPL.stack_get_by_name_and_owner_id(context, stack_name,
                                                owner_id=owner_id)
@@ -148,11 +167,12 @@ def stack_get_all(context, limit=None, sort_keys=None, marker=None,
                   sort_dir=None, filters=None, tenant_safe=True,
                   show_deleted=False, show_nested=False, show_hidden=False,
                   tags=None, tags_any=None, not_tags=None,
-                  not_tags_any=None):
+                  not_tags_any=None, summary=False):
     return IMPL.stack_get_all(context, limit, sort_keys,
                               marker, sort_dir, filters, tenant_safe,
                               show_deleted, show_nested, show_hidden,
-                              tags, tags_any, not_tags, not_tags_any)
+                              tags, tags_any, not_tags, not_tags_any,
+                              summary)
 
 
 def stack_get_all_by_owner_id(context, owner_id):
@@ -206,6 +226,14 @@ def stack_get_root_id(context, stack_id):
     return IMPL.stack_get_root_id(context, stack_id)
 
 
+def stack_get_nested_ids(context, stack_id):
+    return IMPL.stack_get_nested_ids(context, stack_id)
+
+
+def stack_get_all_nested(context, stack_id, nested_depth):
+    return IMPL.stack_get_all_nested(context, stack_id, nested_depth)
+
+
 def stack_count_total_resources(context, stack_id):
     return IMPL.stack_count_total_resources(context, stack_id)
 
@@ -258,6 +286,22 @@ def event_create(context, values):
     return IMPL.event_create(context, values)
 
 
+def event_create_many(context, values_list):
+    return IMPL.event_create_many(context, values_list)
+
+
+def event_prune_by_stack(context, stack_id, limit):
+    return IMPL.event_prune_by_stack(context, stack_id, limit)
+
+
+def resource_prop_data_create(context, values):
+    return IMPL.resource_prop_data_create(context, values)
+
+
+def resource_prop_data_get_all(context, prop_data_ids):
+    return IMPL.resource_prop_data_get_all(context, prop_data_ids)
+
+
 def watch_rule_get(context, watch_rule_id):
     return IMPL.watch_rule_get(context, watch_rule_id)
 
@@ -266,8 +310,8 @@ def watch_rule_get_by_name(context, watch_rule_name):
     return IMPL.watch_rule_get_by_name(context, watch_rule_name)
 
 
-def watch_rule_get_all(context):
-    return IMPL.watch_rule_get_all(context)
+def watch_rule_get_all(context, exclude_states=None):
+    return IMPL.watch_rule_get_all(context, exclude_states=exclude_states)
 
 
 def watch_rule_get_all_by_stack(context, stack_id):
@@ -282,6 +326,10 @@ def watch_rule_update(context, watch_id, values):
     return IMPL.watch_rule_update(context, watch_id, values)
 
 
+def watch_rule_update_all(context, values):
+    return IMPL.watch_rule_update_all(context, values)
+
+
 def watch_rule_delete(context, watch_id):
     return IMPL.watch_rule_delete(context, watch_id)
 
@@ -298,6 +346,15 @@ def watch_data_get_all_by_watch_rule_id(context, watch_rule_id):
     return IMPL.watch_data_get_all_by_watch_rule_id(context, watch_rule_id)
 
 
+def watch_data_get_by_rule_since(context, watch_rule_id, since):
+    return IMPL.watch_data_get_by_rule_since(context, watch_rule_id, since)
+
+
+def watch_data_delete_by_rule_before(context, watch_rule_id, before):
+    return IMPL.watch_data_delete_by_rule_before(context, watch_rule_id,
+                                                 before)
+
+
 def software_config_create(context, values):
     return IMPL.software_config_create(context, values)
 
@@ -397,10 +454,28 @@ def sync_point_create(context, values):
     return IMPL.sync_point_create(context, values)
 
 
+def sync_point_create_many(context, values_list):
+    return IMPL.sync_point_create_many(context, values_list)
+
+
 def sync_point_get(context, entity_id, traversal_id, is_update):
     return IMPL.sync_point_get(context, entity_id, traversal_id, is_update)
 
 
+def sync_point_input_create(context, values):
+    return IMPL.sync_point_input_create(context, values)
+
+
+def sync_point_input_count(context, entity_id, traversal_id, is_update):
+    return IMPL.sync_point_input_count(context, entity_id, traversal_id,
+                                       is_update)
+
+
+def sync_point_input_get_all(context, entity_id, traversal_id, is_update):
+    return IMPL.sync_point_input_get_all(context, entity_id, traversal_id,
+                                         is_update)
+
+
 def sync_point_update_input_data(context, entity_id,
                                  traversal_id, is_update, atomic_key,
                                  input_data):
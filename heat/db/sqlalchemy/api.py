@@ -12,10 +12,16 @@
 #    under the License.
 
 '''Implementation of SQLAlchemy backend.'''
+import collections
+import contextlib
 import datetime
+import hashlib
+import itertools
 import sys
+import zlib
 
 from oslo_config import cfg
+from oslo_db import exception as db_exception
 from oslo_db.sqlalchemy import session as db_session
 from oslo_db.sqlalchemy import utils
 from oslo_serialization import jsonutils
@@ -30,6 +36,7 @@ from sqlalchemy.orm import session as orm_session
 from heat.common import crypt
 from heat.common import exception
 from heat.common.i18n import _
+from heat.common import lru_cache
 from heat.db.sqlalchemy import filters as db_filters
 from heat.db.sqlalchemy import migration
 from heat.db.sqlalchemy import models
@@ -89,20 +96,135 @@ def _session(context):
     return (context and context.session) or get_session()
 
 
+# The raw template columns whose content is stored in raw_template_blob
+RAW_TEMPLATE_BLOB_FIELDS = ('template', 'files', 'environment')
+
+# The maximum number of template blobs whose content is cached
+MAX_CACHED_TEMPLATE_BLOBS = 100
+
+# Blobs are never changed once stored, so their content is cached by digest
+_template_blob_cache = lru_cache.LRUCache(MAX_CACHED_TEMPLATE_BLOBS)
+
+# A reused blob is only marked as used again once it has not been used for
+# this long, and purge_deleted keeps any blob used within twice this long
+TEMPLATE_BLOB_REUSE_INTERVAL = datetime.timedelta(hours=1)
+
+
+@contextlib.contextmanager
+def transaction(context):
+    """Group all of the DB API calls made using a context into one transaction.
+
+    Calls made using the same context within the block join the transaction
+    instead of committing their changes individually.
+    """
+    session = _session(context)
+    with session.begin(subtransactions=True):
+        yield session
+
+
+def _template_blob_store(context, data):
+    content = jsonutils.dumps(data, sort_keys=True)
+    blob_id = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    blob = model_query(context, models.RawTemplateBlob.created_at,
+                       models.RawTemplateBlob.updated_at).filter_by(
+        id=blob_id).first()
+    if blob is not None:
+        # Blobs are shared by many raw templates, so only mark one as used
+        # again when it has not been used for a while. Until then,
+        # purge_deleted does not remove it before the raw template that
+        # refers to it is stored.
+        now = timeutils.utcnow()
+        used_at = blob.updated_at or blob.created_at
+        if used_at < now - TEMPLATE_BLOB_REUSE_INTERVAL:
+            if not model_query(context, models.RawTemplateBlob).filter_by(
+                    id=blob_id).update({'updated_at': now},
+                                       synchronize_session=False):
+                # It has just been removed, so store it again
+                blob = None
+    if blob is None:
+        blob_ref = models.RawTemplateBlob()
+        blob_ref.update({'id': blob_id,
+                         'data': zlib.compress(content.encode('utf-8'))})
+        try:
+            blob_ref.save(_session(context))
+        except db_exception.DBDuplicateEntry:
+            # The same content has just been stored for another template
+            pass
+    _template_blob_cache.put(blob_id, content)
+    return blob_id
+
+
+def _template_blob_get(context, blob_id):
+    content = _template_blob_cache.get(blob_id)
+    if content is None:
+        blob = model_query(context, models.RawTemplateBlob).get(blob_id)
+        if blob is None:
+            raise exception.NotFound(_('raw template blob %s not found') %
+                                     blob_id)
+        content = zlib.decompress(blob.data).decode('utf-8')
+        _template_blob_cache.put(blob_id, content)
+    return jsonutils.loads(content)
+
+
+def _raw_template_blob_values(context, values):
+    """Move the content of a raw template into blobs."""
+    values = dict(values)
+    for field in RAW_TEMPLATE_BLOB_FIELDS:
+        if field in values:
+            blob_id = None
+            if values[field] is not None:
+                blob_id = _template_blob_store(context, values[field])
+            values['%s_blob_id' % field] = blob_id
+            values[field] = None
+    return values
+
+
+def _raw_template_load_blobs(context, raw_template_ref):
+    """Fill in the content of a raw template that is stored in blobs."""
+    for field in RAW_TEMPLATE_BLOB_FIELDS:
+        blob_id = getattr(raw_template_ref, '%s_blob_id' % field)
+        if blob_id is not None:
+            orm.attributes.set_committed_value(
+                raw_template_ref, field, _template_blob_get(context, blob_id))
+    return raw_template_ref
+
+
 def raw_template_get(context, template_id):
     result = model_query(context, models.RawTemplate).get(template_id)
 
     if not result:
         raise exception.NotFound(_('raw template with id %s not found') %
                                  template_id)
-    return result
+    return _raw_template_load_blobs(context, result)
+
+
+def raw_template_get_templates(context, template_ids):
+    """Return the templates of the given raw templates, keyed by ID.
+
+    Only the template of each raw template is loaded, not its files or its
+    environment. Raw templates that share a template share the same content.
+    """
+    results = model_query(context, models.RawTemplate).options(
+        orm.load_only('id', 'template', 'template_blob_id')).filter(
+            models.RawTemplate.id.in_(template_ids))
+    templates = {}
+    blobs = {}
+    for raw_template_ref in results:
+        blob_id = raw_template_ref.template_blob_id
+        if blob_id is None:
+            templates[raw_template_ref.id] = raw_template_ref.template
+            continue
+        if blob_id not in blobs:
+            blobs[blob_id] = _template_blob_get(context, blob_id)
+        templates[raw_template_ref.id] = blobs[blob_id]
+    return templates
 
 
 def raw_template_create(context, values):
     raw_template_ref = models.RawTemplate()
-    raw_template_ref.update(values)
+    raw_template_ref.update(_raw_template_blob_values(context, values))
     raw_template_ref.save(_session(context))
-    return raw_template_ref
+    return _raw_template_load_blobs(context, raw_template_ref)
 
 
 def raw_template_update(context, template_id, values):
@@ -112,7 +234,9 @@ def raw_template_update(context, template_id, values):
                   if getattr(raw_template_ref, k) != v)
 
     if values:
-        raw_template_ref.update_and_save(values)
+        raw_template_ref.update_and_save(
+            _raw_template_blob_values(context, values))
+        _raw_template_load_blobs(context, raw_template_ref)
 
     return raw_template_ref
 
@@ -165,7 +289,7 @@ def resource_get_all(context):
 def resource_update(context, resource_id, values, atomic_key,
                     expected_engine_id=None):
     session = _session(context)
-    with session.begin():
+    with session.begin(subtransactions=True):
         if atomic_key is None:
             values['atomic_key'] = 1
         else:
@@ -298,6 +422,20 @@ def resource_create(context, values):
     return resource_ref
 
 
+def resource_get_all_by_stack_ids(context, stack_ids):
+    """Return the resources of several stacks, keyed by stack and name."""
+    results = model_query(
+        context, models.Resource
+    ).filter(
+        models.Resource.stack_id.in_(stack_ids)
+    ).options(orm.joinedload("data")).all()
+
+    resources = collections.defaultdict(dict)
+    for res in results:
+        resources[res.stack_id][res.name] = res
+    return dict(resources)
+
+
 def resource_get_all_by_stack(context, stack_id, key_id=False):
     results = model_query(
         context, models.Resource
@@ -351,9 +489,37 @@ def stack_get(context, stack_id, show_deleted=False, tenant_safe=True,
         context.tenant_id not in (result.tenant,
                                   result.stack_user_project_id)):
         return None
+
+    if eager_load:
+        _raw_template_load_blobs(context, result.raw_template)
     return result
 
 
+def stack_get_status(context, stack_id, show_deleted=False,
+                     tenant_safe=True):
+    """Return the (action, status, status_reason, updated_at) of a stack.
+
+    Only the columns needed are selected, so the stack is always read afresh
+    from the database and nothing else about it is loaded.
+    """
+    result = model_query(context, models.Stack).with_entities(
+        models.Stack.action, models.Stack.status,
+        models.Stack.status_reason, models.Stack.updated_at,
+        models.Stack.deleted_at, models.Stack.tenant,
+        models.Stack.stack_user_project_id).filter_by(id=stack_id).first()
+
+    deleted_ok = show_deleted or context.show_deleted
+    if result is None or result.deleted_at is not None and not deleted_ok:
+        return None
+
+    if (tenant_safe and context is not None and
+        context.tenant_id not in (result.tenant,
+                                  result.stack_user_project_id)):
+        return None
+    return (result.action, result.status, result.status_reason,
+            result.updated_at)
+
+
 def stack_get_all_by_owner_id(context, owner_id):
     results = soft_delete_aware_query(
         context, models.Stack).filter_by(owner_id=owner_id).all()
@@ -429,7 +595,7 @@ def _query_stack_get_all(context, tenant_safe=True, show_deleted=False,
             tag_alias = orm_aliased(models.StackTag)
             subquery = subquery.join(tag_alias, models.Stack.tags)
             subquery = subquery.filter(tag_alias.tag == tag)
-        not_stack_ids = [s.id for s in subquery.all()]
+        not_stack_ids = subquery.with_entities(models.Stack.id).subquery()
         query = query.filter(models.Stack.id.notin_(not_stack_ids))
 
     if not_tags_any:
@@ -445,17 +611,29 @@ def _query_stack_get_all(context, tenant_safe=True, show_deleted=False,
     return query
 
 
+# The stack columns that are needed to list stacks
+STACK_SUMMARY_COLUMNS = ('id', 'name', 'raw_template_id', 'tenant',
+                         'username', 'owner_id', 'stack_user_project_id',
+                         'action', 'status', 'status_reason', 'created_at',
+                         'updated_at', 'deleted_at')
+
+
 def stack_get_all(context, limit=None, sort_keys=None, marker=None,
                   sort_dir=None, filters=None, tenant_safe=True,
                   show_deleted=False, show_nested=False, show_hidden=False,
                   tags=None, tags_any=None, not_tags=None,
-                  not_tags_any=None):
+                  not_tags_any=None, summary=False):
     query = _query_stack_get_all(context, tenant_safe,
                                  show_deleted=show_deleted,
                                  show_nested=show_nested,
                                  show_hidden=show_hidden, tags=tags,
                                  tags_any=tags_any, not_tags=not_tags,
                                  not_tags_any=not_tags_any)
+    if summary:
+        # Load only the columns needed to list the stacks, and their tags in
+        # the same query.
+        query = query.options(orm.load_only(*STACK_SUMMARY_COLUMNS),
+                              orm.joinedload(models.Stack.tags))
     return _filter_and_page_query(context, query, limit, sort_keys,
                                   marker, sort_dir, filters).all()
 
@@ -492,6 +670,9 @@ def stack_count_all(context, filters=None, tenant_safe=True,
 
 def stack_create(context, values):
     stack_ref = models.Stack()
+    if values.get('owner_id') and not values.get('root_stack_id'):
+        root_stack_id = _stack_root_id(context, values['owner_id'])
+        values = dict(values, root_stack_id=root_stack_id)
     stack_ref.update(values)
     stack_ref.save(_session(context))
     return stack_ref
@@ -572,11 +753,84 @@ def stack_lock_release(stack_id, engine_id):
         return True
 
 
+def _stack_root_id(context, stack_id):
+    """Return the ID of the root stack of the tree a stack belongs to."""
+    seen = set()
+    while stack_id not in seen:
+        seen.add(stack_id)
+        result = model_query(context, models.Stack).with_entities(
+            models.Stack.owner_id,
+            models.Stack.root_stack_id).filter_by(id=stack_id).first()
+        if result is None or result.owner_id is None:
+            break
+        if result.root_stack_id is not None:
+            return result.root_stack_id
+        # Stacks stored before root_stack_id existed must be walked
+        stack_id = result.owner_id
+    return stack_id
+
+
 def stack_get_root_id(context, stack_id):
     s = stack_get(context, stack_id)
-    while s.owner_id:
-        s = stack_get(context, s.owner_id)
-    return s.id
+    if s.owner_id is None:
+        return s.id
+    return s.root_stack_id or _stack_root_id(context, s.owner_id)
+
+
+def _stack_nested_levels(context, stack_id):
+    """Generate the IDs of a stack and the stacks nested below it, by level.
+
+    Every stack in a tree records the root of the tree, so the whole tree is
+    read with a single query. If the stack has no root_stack_id recorded,
+    the tree is instead read one level at a time.
+    """
+    result = model_query(context, models.Stack).with_entities(
+        models.Stack.owner_id,
+        models.Stack.root_stack_id).filter_by(id=stack_id).first()
+    if result is None:
+        return
+
+    query = soft_delete_aware_query(context, models.Stack).with_entities(
+        models.Stack.id, models.Stack.owner_id)
+    if result.owner_id is None or result.root_stack_id is not None:
+        root_id = result.root_stack_id or stack_id
+        children = collections.defaultdict(list)
+        for child_id, owner_id in query.filter_by(root_stack_id=root_id):
+            children[owner_id].append(child_id)
+
+        def get_children(level):
+            return [c for sid in level for c in children[sid]]
+    else:
+        def get_children(level):
+            return [child_id for child_id, owner_id in
+                    query.filter(models.Stack.owner_id.in_(level))]
+
+    level = [stack_id]
+    while level:
+        yield level
+        level = get_children(level)
+
+
+def stack_get_nested_ids(context, stack_id):
+    """Return the IDs of a stack and of all the stacks nested below it."""
+    return list(itertools.chain.from_iterable(
+        _stack_nested_levels(context, stack_id)))
+
+
+def stack_get_all_nested(context, stack_id, nested_depth):
+    """Return the stacks nested below a stack, up to the given depth."""
+    levels = itertools.islice(_stack_nested_levels(context, stack_id),
+                              1, nested_depth + 1)
+    stack_ids = list(itertools.chain.from_iterable(levels))
+    if not stack_ids:
+        return []
+
+    stacks = soft_delete_aware_query(context, models.Stack).filter(
+        models.Stack.id.in_(stack_ids)).options(
+            orm.joinedload("raw_template")).all()
+    for stack in stacks:
+        _raw_template_load_blobs(context, stack.raw_template)
+    return stacks
 
 
 def stack_count_total_resources(context, stack_id):
@@ -585,13 +839,7 @@ def stack_count_total_resources(context, stack_id):
     if stack_id is None or stack_get(context, stack_id) is None:
         return 0
 
-    def nested_stack_ids(sid):
-        yield sid
-        for child in stack_get_all_by_owner_id(context, sid):
-            for stack in nested_stack_ids(child.id):
-                yield stack
-
-    stack_ids = list(nested_stack_ids(stack_id))
+    stack_ids = stack_get_nested_ids(context, stack_id)
 
     # count all resources which belong to the stacks
     results = model_query(
@@ -775,6 +1023,44 @@ def event_create(context, values):
     return event_ref
 
 
+def event_create_many(context, values_list):
+    session = _session(context)
+    event_refs = []
+    with session.begin():
+        for values in values_list:
+            event_ref = models.Event()
+            event_ref.update(values)
+            session.add(event_ref)
+            event_refs.append(event_ref)
+    return event_refs
+
+
+def event_prune_by_stack(context, stack_id, limit):
+    return _delete_event_rows(context, stack_id, limit)
+
+
+def resource_prop_data_create(context, values):
+    if model_query(context, models.ResourcePropertiesData).get(
+            values['id']) is not None:
+        return False
+    prop_data_ref = models.ResourcePropertiesData()
+    prop_data_ref.update(values)
+    try:
+        prop_data_ref.save(_session(context))
+    except db_exception.DBDuplicateEntry:
+        # Another event with the same properties data has stored it since
+        # we checked, and the content is identical.
+        return False
+    return True
+
+
+def resource_prop_data_get_all(context, prop_data_ids):
+    if not prop_data_ids:
+        return []
+    return model_query(context, models.ResourcePropertiesData).filter(
+        models.ResourcePropertiesData.id.in_(prop_data_ids)).all()
+
+
 def watch_rule_get(context, watch_rule_id):
     result = model_query(context, models.WatchRule).get(watch_rule_id)
     return result
@@ -786,8 +1072,11 @@ def watch_rule_get_by_name(context, watch_rule_name):
     return result
 
 
-def watch_rule_get_all(context):
-    results = model_query(context, models.WatchRule).all()
+def watch_rule_get_all(context, exclude_states=None):
+    query = model_query(context, models.WatchRule)
+    if exclude_states:
+        query = query.filter(~models.WatchRule.state.in_(exclude_states))
+    results = query.all()
     return results
 
 
@@ -816,6 +1105,14 @@ def watch_rule_update(context, watch_id, values):
     wr.save(_session(context))
 
 
+def watch_rule_update_all(context, values):
+    """Update every watch rule, returning the number of rules updated."""
+    session = _session(context)
+    with session.begin(subtransactions=True):
+        return session.query(models.WatchRule).update(
+            values, synchronize_session=False)
+
+
 def watch_rule_delete(context, watch_id):
     wr = watch_rule_get(context, watch_id)
     if not wr:
@@ -850,6 +1147,28 @@ def watch_data_get_all_by_watch_rule_id(context, watch_rule_id):
     return results
 
 
+def watch_data_get_by_rule_since(context, watch_rule_id, since):
+    """Return the watch data for a rule created no earlier than `since`."""
+    results = model_query(context, models.WatchData).filter(
+        models.WatchData.watch_rule_id == watch_rule_id,
+        models.WatchData.created_at >= since).order_by(
+            models.WatchData.created_at).all()
+    return results
+
+
+def watch_data_delete_by_rule_before(context, watch_rule_id, before):
+    """Delete the watch data for a rule created earlier than `before`.
+
+    Returns the number of rows deleted.
+    """
+    session = _session(context)
+    with session.begin(subtransactions=True):
+        return session.query(models.WatchData).filter(
+            models.WatchData.watch_rule_id == watch_rule_id,
+            models.WatchData.created_at < before).delete(
+                synchronize_session=False)
+
+
 def software_config_create(context, values):
     obj_ref = models.SoftwareConfig()
     obj_ref.update(values)
@@ -1052,10 +1371,16 @@ def purge_deleted(age, granularity='days'):
     resource = sqlalchemy.Table('resource', meta, autoload=True)
     resource_data = sqlalchemy.Table('resource_data', meta, autoload=True)
     event = sqlalchemy.Table('event', meta, autoload=True)
+    rsrc_prop_data = sqlalchemy.Table('resource_properties_data', meta,
+                                      autoload=True)
     raw_template = sqlalchemy.Table('raw_template', meta, autoload=True)
+    raw_template_blob = sqlalchemy.Table('raw_template_blob', meta,
+                                         autoload=True)
     user_creds = sqlalchemy.Table('user_creds', meta, autoload=True)
     service = sqlalchemy.Table('service', meta, autoload=True)
     syncpoint = sqlalchemy.Table('sync_point', meta, autoload=True)
+    syncpoint_input = sqlalchemy.Table('sync_point_input', meta,
+                                       autoload=True)
 
     # find the soft-deleted stacks that are past their expiry
     stack_where = sqlalchemy.select([stack.c.id]).where(
@@ -1076,9 +1401,21 @@ def purge_deleted(age, granularity='days'):
     # delete events
     event_del = event.delete().where(event.c.stack_id.in_(stack_where))
     engine.execute(event_del)
+    # delete resource properties data that no event refers to any more
+    event_prop_data_sel = sqlalchemy.select(
+        [event.c.rsrc_prop_data_id]).where(
+            event.c.rsrc_prop_data_id.isnot(None))
+    prop_data_del = rsrc_prop_data.delete().where(
+        sqlalchemy.and_(
+            rsrc_prop_data.c.created_at < time_line,
+            sqlalchemy.not_(rsrc_prop_data.c.id.in_(event_prop_data_sel))))
+    engine.execute(prop_data_del)
     # clean up any sync_points that may have lingered
     sync_del = syncpoint.delete().where(syncpoint.c.stack_id.in_(stack_where))
     engine.execute(sync_del)
+    sync_input_del = syncpoint_input.delete().where(
+        syncpoint_input.c.stack_id.in_(stack_where))
+    engine.execute(sync_input_del)
     # delete the stacks
     stack_del = stack.delete().where(stack.c.deleted_at < time_line)
     engine.execute(stack_del)
@@ -1087,6 +1424,19 @@ def purge_deleted(age, granularity='days'):
     raw_templ_sel = sqlalchemy.not_(raw_template.c.id.in_(stack_templ_sel))
     raw_templ_del = raw_template.delete().where(raw_templ_sel)
     engine.execute(raw_templ_del)
+    # delete template blobs that no raw template refers to any more
+    blob_sels = [sqlalchemy.not_(raw_template_blob.c.id.in_(
+        sqlalchemy.select([blob_id]).where(blob_id.isnot(None))))
+        for blob_id in (raw_template.c.template_blob_id,
+                        raw_template.c.files_blob_id,
+                        raw_template.c.environment_blob_id)]
+    blob_used_at = sqlalchemy.func.coalesce(raw_template_blob.c.updated_at,
+                                            raw_template_blob.c.created_at)
+    blob_time_line = min(time_line, datetime.datetime.now() -
+                         2 * TEMPLATE_BLOB_REUSE_INTERVAL)
+    raw_templ_blob_del = raw_template_blob.delete().where(
+        sqlalchemy.and_(blob_used_at < blob_time_line, *blob_sels))
+    engine.execute(raw_templ_blob_del)
     # purge any user creds that are no longer referenced
     stack_creds_sel = sqlalchemy.select([stack.c.user_creds_id])
     user_creds_sel = sqlalchemy.not_(user_creds.c.id.in_(stack_creds_sel))
@@ -1099,6 +1449,8 @@ def purge_deleted(age, granularity='days'):
 
 def sync_point_delete_all_by_stack_and_traversal(context, stack_id,
                                                  traversal_id):
+    model_query(context, models.SyncPointInput).filter_by(
+        stack_id=stack_id, traversal_id=traversal_id).delete()
     rows_deleted = model_query(context, models.SyncPoint).filter_by(
         stack_id=stack_id, traversal_id=traversal_id).delete()
     return rows_deleted
@@ -1112,6 +1464,20 @@ def sync_point_create(context, values):
     return sync_point_ref
 
 
+def sync_point_create_many(context, values_list):
+    rows = []
+    for values in values_list:
+        row = dict(values)
+        row['entity_id'] = str(row['entity_id'])
+        rows.append(row)
+    if not rows:
+        return
+
+    session = _session(context)
+    with session.begin():
+        session.execute(models.SyncPoint.__table__.insert(), rows)
+
+
 def sync_point_get(context, entity_id, traversal_id, is_update):
     entity_id = str(entity_id)
     return model_query(context, models.SyncPoint).get(
@@ -1132,6 +1498,37 @@ def sync_point_update_input_data(context, entity_id,
     return rows_updated
 
 
+def sync_point_input_create(context, values):
+    values['entity_id'] = str(values['entity_id'])
+    sync_point_input_ref = models.SyncPointInput()
+    sync_point_input_ref.update(values)
+    try:
+        sync_point_input_ref.save(_session(context))
+    except db_exception.DBDuplicateEntry:
+        # The same predecessor has already reported in, e.g. because its
+        # check was retriggered, so there is nothing more to record.
+        return False
+    return True
+
+
+def sync_point_input_count(context, entity_id, traversal_id, is_update):
+    entity_id = str(entity_id)
+    return model_query(context, models.SyncPointInput).filter_by(
+        entity_id=entity_id,
+        traversal_id=traversal_id,
+        is_update=is_update
+    ).count()
+
+
+def sync_point_input_get_all(context, entity_id, traversal_id, is_update):
+    entity_id = str(entity_id)
+    return model_query(context, models.SyncPointInput).filter_by(
+        entity_id=entity_id,
+        traversal_id=traversal_id,
+        is_update=is_update
+    ).all()
+
+
 def db_sync(engine, version=None):
     """Migrate the database to `version` or the most recent version."""
     if version is not None and int(version) < db_version(engine):
@@ -1162,6 +1559,7 @@ def db_encrypt_parameters_and_properties(ctxt, encryption_key, batch_size=50):
         for raw_template in _get_batch(
                 session=session, ctxt=ctxt, query=query,
                 model=models.RawTemplate, batch_size=batch_size):
+            _raw_template_load_blobs(ctxt, raw_template)
             tmpl = template.Template.load(ctxt, raw_template.id, raw_template)
             env = raw_template.environment
 
@@ -1224,6 +1622,7 @@ def db_decrypt_parameters_and_properties(ctxt, encryption_key, batch_size=50):
         for raw_template in _get_batch(
                 session=session, ctxt=ctxt, query=query,
                 model=models.RawTemplate, batch_size=batch_size):
+            _raw_template_load_blobs(ctxt, raw_template)
             parameters = raw_template.environment['parameters']
             encrypted_params = raw_template.environment[
                 'encrypted_param_names']
@@ -0,0 +1,39 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import sqlalchemy
+
+from heat.db.sqlalchemy import types as heat_db_types
+
+
+def upgrade(migrate_engine):
+    meta = sqlalchemy.MetaData()
+    meta.bind = migrate_engine
+
+    raw_template_blob = sqlalchemy.Table(
+        'raw_template_blob', meta,
+        sqlalchemy.Column('id', sqlalchemy.String(64),
+                          primary_key=True, nullable=False),
+        sqlalchemy.Column('data', heat_db_types.LongBinary),
+        sqlalchemy.Column('created_at', sqlalchemy.DateTime),
+        sqlalchemy.Column('updated_at', sqlalchemy.DateTime),
+        mysql_engine='InnoDB',
+        mysql_charset='utf8'
+    )
+    raw_template_blob.create()
+
+    raw_template = sqlalchemy.Table('raw_template', meta, autoload=True)
+    for name in ('template_blob_id', 'files_blob_id', 'environment_blob_id'):
+        blob_id = sqlalchemy.Column(name, sqlalchemy.String(64),
+                                    nullable=True)
+        blob_id.create(raw_template)
@@ -91,6 +91,14 @@ class StateAware(object):
     status_reason = sqlalchemy.Column('status_reason', sqlalchemy.Text)
 
 
+class RawTemplateBlob(BASE, HeatBase):
+    """Represents compressed JSON content, keyed by a digest of it."""
+
+    __tablename__ = 'raw_template_blob'
+    id = sqlalchemy.Column(sqlalchemy.String(64), primary_key=True)
+    data = sqlalchemy.Column(types.LongBinary)
+
+
 class RawTemplate(BASE, HeatBase):
     """Represents an unparsed template which should be in JSON format."""
 
@@ -99,6 +107,9 @@ class RawTemplate(BASE, HeatBase):
     template = sqlalchemy.Column(types.Json)
     files = sqlalchemy.Column(types.Json)
     environment = sqlalchemy.Column('environment', types.Json)
+    template_blob_id = sqlalchemy.Column(sqlalchemy.String(64))
+    files_blob_id = sqlalchemy.Column(sqlalchemy.String(64))
+    environment_blob_id = sqlalchemy.Column(sqlalchemy.String(64))
 
 
 class StackTag(BASE, HeatBase):
@@ -137,6 +148,26 @@ class SyncPoint(BASE, HeatBase):
     input_data = sqlalchemy.Column(types.Json)
 
 
+class SyncPointInput(BASE, HeatBase):
+    """Represents the input from one predecessor to a syncpoint."""
+    __tablename__ = 'sync_point_input'
+    __table_args__ = (
+        sqlalchemy.PrimaryKeyConstraint('entity_id',
+                                        'traversal_id',
+                                        'is_update',
+                                        'sender'),
+        sqlalchemy.ForeignKeyConstraint(['stack_id'], ['stack.id'])
+    )
+
+    entity_id = sqlalchemy.Column(sqlalchemy.String(36))
+    traversal_id = sqlalchemy.Column(sqlalchemy.String(36))
+    is_update = sqlalchemy.Column(sqlalchemy.Boolean)
+    sender = sqlalchemy.Column(sqlalchemy.String(64))
+    stack_id = sqlalchemy.Column(sqlalchemy.String(36),
+                                 nullable=False)
+    input_data = sqlalchemy.Column(types.Json)
+
+
 class Stack(BASE, HeatBase, SoftDelete, StateAware):
     """Represents a stack created by the heat engine."""
 
@@ -144,6 +175,7 @@ class Stack(BASE, HeatBase, SoftDelete, StateAware):
     __table_args__ = (
         sqlalchemy.Index('ix_stack_name', 'name', mysql_length=255),
         sqlalchemy.Index('ix_stack_tenant', 'tenant', mysql_length=255),
+        sqlalchemy.Index('ix_stack_root_stack_id', 'root_stack_id'),
     )
 
     id = sqlalchemy.Column(sqlalchemy.String(36), primary_key=True,
@@ -167,6 +199,7 @@ class Stack(BASE, HeatBase, SoftDelete, StateAware):
         sqlalchemy.Integer,
         sqlalchemy.ForeignKey('user_creds.id'))
     owner_id = sqlalchemy.Column(sqlalchemy.String(36))
+    root_stack_id = sqlalchemy.Column(sqlalchemy.String(36))
     parent_resource_name = sqlalchemy.Column(sqlalchemy.String(255))
     timeout = sqlalchemy.Column(sqlalchemy.Integer)
     disable_rollback = sqlalchemy.Column(sqlalchemy.Boolean, nullable=False)
@@ -218,6 +251,16 @@ class UserCreds(BASE, HeatBase):
     stack = relationship(Stack, backref=backref('user_creds'))
 
 
+class ResourcePropertiesData(BASE, HeatBase):
+    """Represents a set of stored resource properties, keyed by its hash."""
+
+    __tablename__ = 'resource_properties_data'
+
+    id = sqlalchemy.Column(sqlalchemy.String(64), primary_key=True)
+    data = sqlalchemy.Column(types.Json)
+    encrypted = sqlalchemy.Column(sqlalchemy.Boolean)
+
+
 class Event(BASE, HeatBase):
     """Represents an event generated by the heat engine."""
 
@@ -240,6 +283,8 @@ class Event(BASE, HeatBase):
         'resource_status_reason', sqlalchemy.String(255))
     resource_type = sqlalchemy.Column(sqlalchemy.String(255))
     resource_properties = sqlalchemy.Column(sqlalchemy.PickleType)
+    rsrc_prop_data_id = sqlalchemy.Column(sqlalchemy.String(64),
+                                          nullable=True)
 
     @property
     def resource_status_reason(self):
@@ -335,6 +380,9 @@ class WatchData(BASE, HeatBase):
     """Represents a watch_data created by the heat engine."""
 
     __tablename__ = 'watch_data'
+    __table_args__ = (
+        sqlalchemy.Index('ix_watch_data_watch_rule_id_created_at',
+                         'watch_rule_id', 'created_at'),)
 
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
     data = sqlalchemy.Column('data', types.Json)
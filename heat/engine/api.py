@@ -19,6 +19,7 @@ import six
 
 from heat.common.i18n import _
 from heat.common.i18n import _LE
+from heat.common import identifier
 from heat.common import param_utils
 from heat.common import template_format
 from heat.engine import constraints as constr
@@ -101,6 +102,7 @@ def format_stack_outputs(stack, outputs):
             output.update({rpc_api.OUTPUT_ERROR: outputs[k].get('error_msg')})
         return output
 
+    stack.prefetch_output_attributes(list(outputs))
     return [format_stack_output(key) for key in outputs]
 
 
@@ -145,6 +147,37 @@ def format_stack(stack, preview=False):
     return info
 
 
+def format_stack_summary(stack, description):
+    '''
+    Return a summary representation of the given stack database object for
+    a stack listing, without loading the stack's template.
+
+    The description of the stack's template is passed in separately.
+    '''
+    updated_time = stack.updated_at and stack.updated_at.isoformat()
+    created_time = stack.created_at or timeutils.utcnow()
+    tags = None
+    if stack.tags:
+        tags = [t.tag for t in stack.tags]
+    info = {
+        rpc_api.STACK_NAME: stack.name,
+        rpc_api.STACK_ID: dict(identifier.HeatIdentifier(stack.tenant,
+                                                         stack.name,
+                                                         stack.id)),
+        rpc_api.STACK_CREATION_TIME: created_time.isoformat(),
+        rpc_api.STACK_UPDATED_TIME: updated_time,
+        rpc_api.STACK_DESCRIPTION: description,
+        rpc_api.STACK_ACTION: stack.action or '',
+        rpc_api.STACK_STATUS: stack.status or '',
+        rpc_api.STACK_STATUS_DATA: stack.status_reason,
+        rpc_api.STACK_OWNER: stack.username,
+        rpc_api.STACK_PARENT: stack.owner_id,
+        rpc_api.STACK_USER_PROJECT_ID: stack.stack_user_project_id,
+        rpc_api.STACK_TAGS: tags,
+    }
+    return info
+
+
 def format_resource_attributes(resource, with_attr=None):
     resolver = resource.attributes
     if not with_attr:
@@ -323,7 +356,7 @@ def format_watch(watch):
     return result
 
 
-def format_watch_data(wd):
+def format_watch_data(wd, rule_names):
 
     # Demangle DB format data into something more easily used in the API
     # We are expecting a dict with exactly two items, Namespace and
@@ -337,7 +370,7 @@ def format_watch_data(wd):
         return
 
     result = {
-        rpc_api.WATCH_DATA_ALARM: wd.watch_rule.name,
+        rpc_api.WATCH_DATA_ALARM: rule_names.get(wd.watch_rule_id),
         rpc_api.WATCH_DATA_METRIC: metric_name,
         rpc_api.WATCH_DATA_TIME: wd.created_at.isoformat(),
         rpc_api.WATCH_DATA_NAMESPACE: namespace,
@@ -182,6 +182,7 @@ class CfnTemplate(template.Template):
         if len(cfn_tmpl.get(RES_DEPENDS_ON, [])) == 1:
             cfn_tmpl[RES_DEPENDS_ON] = cfn_tmpl[RES_DEPENDS_ON][0]
 
+        self._parsed = None
         if self.t.get(self.RESOURCES) is None:
             self.t[self.RESOURCES] = {}
         self.t[self.RESOURCES][name] = cfn_tmpl
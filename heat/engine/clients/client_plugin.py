@@ -12,18 +12,70 @@
 #    under the License.
 
 import abc
+import contextlib
+import functools
 
+from eventlet import corolocal
 from keystoneclient import auth
 from keystoneclient.auth.identity import v2
 from keystoneclient.auth.identity import v3
 from keystoneclient import exceptions
 from keystoneclient import session
+from oslo_cache import core
 from oslo_config import cfg
 import six
 
+from heat.common import cache
 from heat.common import context
 from heat.common.i18n import _
 
+# decorator that allows to cache the value
+# of the function based on input arguments
+MEMOIZE = core.get_memoization_decorator(conf=cfg.CONF,
+                                         region=cache.get_cache_region(),
+                                         group="client_lookup_cache")
+
+
+def cached_lookup(lookup):
+    """Decorator for client plugin methods that look up an ID by name.
+
+    The result of each lookup is remembered by the client plugin, and so
+    shared by everything that uses the same request context. It is also
+    stored in the client lookup cache, when that is enabled. Lookups that
+    raise an exception are not remembered, so that an entity that is not
+    found is looked up again the next time it is requested.
+
+    Inside an uncached_lookups() block, the lookup is always made, and its
+    result is neither taken from nor stored in either place.
+    """
+    @functools.wraps(lookup)
+    def wrapper(plugin, *args):
+        if getattr(_uncached, 'active', False):
+            return lookup(plugin, *args)
+        return plugin._cached_lookup(lookup, *args)
+
+    return wrapper
+
+
+# whether lookups are made without remembered results, per green thread
+_uncached = corolocal.local()
+
+
+@contextlib.contextmanager
+def uncached_lookups():
+    """Make the cached lookups in a block without using remembered results.
+
+    Custom constraints use this, because they check whether an entity exists
+    now and have their own cache. Only lookups made by the current green
+    thread are affected.
+    """
+    active = getattr(_uncached, 'active', False)
+    _uncached.active = True
+    try:
+        yield
+    finally:
+        _uncached.active = active
+
 
 @six.add_metaclass(abc.ABCMeta)
 class ClientPlugin(object):
@@ -41,6 +93,7 @@ class ClientPlugin(object):
         self.clients = context.clients
         self._client = None
         self._keystone_session_obj = None
+        self._lookups = {}
 
     @property
     def _keystone_session(self):
@@ -63,6 +116,37 @@ class ClientPlugin(object):
             self._client = self._create()
         return self._client
 
+    def _cached_lookup(self, lookup, *args):
+        key = (lookup.__name__,) + args
+        try:
+            return self._lookups[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # The arguments are not hashable, so the result is not shared
+            return lookup(self, *args)
+
+        @MEMOIZE
+        def check_cache_or_lookup(cache_key_prefix, *lookup_args):
+            """Check if the result is stored in cache or look it up.
+
+            :param cache_key_prefix: cache prefix that used to distinguish
+                                     the lookup in heat cache, so that
+                                     results are not shared between client
+                                     plugins, lookups, tenants and regions.
+            :param lookup_args: the arguments of the lookup
+            :return: the result of the lookup
+            """
+            return lookup(self, *lookup_args)
+
+        cache_key_prefix = "{0}:{1}:{2}:{3}".format(
+            self.__class__.__name__, lookup.__name__,
+            six.text_type(self.context.tenant_id),
+            six.text_type(self.context.region_name))
+        result = check_cache_or_lookup(cache_key_prefix, *args)
+        self._lookups[key] = result
+        return result
+
     @abc.abstractmethod
     def _create(self):
         '''Return a newly created client.'''
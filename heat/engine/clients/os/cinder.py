@@ -116,6 +116,7 @@ class CinderClientPlugin(client_plugin.ClientPlugin):
             raise exception.EntityNotFound(entity='Volume backup',
                                            name=backup)
 
+    @client_plugin.cached_lookup
     def get_volume_type(self, volume_type):
         vt_id = None
         volume_type_list = self.client().volume_types.list()
@@ -60,6 +60,7 @@ class GlanceClientPlugin(client_plugin.ClientPlugin):
     def is_conflict(self, ex):
         return isinstance(ex, exc.HTTPConflict)
 
+    @client_plugin.cached_lookup
     def get_image_id(self, image_identifier):
         '''
         Return an id for the specified image name or identifier.
@@ -78,6 +79,7 @@ class GlanceClientPlugin(client_plugin.ClientPlugin):
             image_id = self.get_image_id_by_name(image_identifier)
         return image_id
 
+    @client_plugin.cached_lookup
     def get_image_id_by_name(self, image_identifier):
         '''
         Return an id for the specified image name.
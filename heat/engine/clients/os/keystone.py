@@ -37,6 +37,7 @@ class KeystoneClientPlugin(client_plugin.ClientPlugin):
     def is_conflict(self, ex):
         return isinstance(ex, exceptions.Conflict)
 
+    @client_plugin.cached_lookup
     def get_role_id(self, role):
         try:
             role_obj = self.client().client.roles.get(role)
@@ -49,6 +50,7 @@ class KeystoneClientPlugin(client_plugin.ClientPlugin):
 
         raise exception.EntityNotFound(entity='KeystoneRole', name=role)
 
+    @client_plugin.cached_lookup
     def get_project_id(self, project):
         try:
             project_obj = self.client().client.projects.get(project)
@@ -62,6 +64,7 @@ class KeystoneClientPlugin(client_plugin.ClientPlugin):
         raise exception.EntityNotFound(entity='KeystoneProject',
                                        name=project)
 
+    @client_plugin.cached_lookup
     def get_domain_id(self, domain):
         try:
             domain_obj = self.client().client.domains.get(domain)
@@ -74,6 +77,7 @@ class KeystoneClientPlugin(client_plugin.ClientPlugin):
 
         raise exception.EntityNotFound(entity='KeystoneDomain', name=domain)
 
+    @client_plugin.cached_lookup
     def get_group_id(self, group):
         try:
             group_obj = self.client().client.groups.get(group)
@@ -86,6 +90,7 @@ class KeystoneClientPlugin(client_plugin.ClientPlugin):
 
         raise exception.EntityNotFound(entity='KeystoneGroup', name=group)
 
+    @client_plugin.cached_lookup
     def get_service_id(self, service):
         try:
             service_obj = self.client().client.services.get(service)
@@ -101,6 +106,7 @@ class KeystoneClientPlugin(client_plugin.ClientPlugin):
                 raise exception.EntityNotFound(entity='KeystoneService',
                                                name=service)
 
+    @client_plugin.cached_lookup
     def get_user_id(self, user):
         try:
             user_obj = self.client().client.users.get(user)
@@ -69,8 +69,12 @@ class NeutronClientPlugin(client_plugin.ClientPlugin):
         return isinstance(ex, exceptions.NeutronClientNoUniqueMatch)
 
     def find_neutron_resource(self, props, key, key_type):
+        return self.find_resourceid_by_name_or_id(key_type, props.get(key))
+
+    @client_plugin.cached_lookup
+    def find_resourceid_by_name_or_id(self, resource_name, name_or_id):
         return neutronV20.find_resourceid_by_name_or_id(
-            self.client(), key_type, props.get(key))
+            self.client(), resource_name, name_or_id)
 
     def _resolve(self, props, key, id_key, key_type):
         if props.get(key):
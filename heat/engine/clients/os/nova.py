@@ -32,15 +32,123 @@ from heat.common import exception
 from heat.common.i18n import _
 from heat.common.i18n import _LI
 from heat.common.i18n import _LW
+from heat.common import lru_cache
+from heat.common import timeutils
 from heat.engine.clients import client_plugin
 from heat.engine import constraints
 from heat.engine import resource
 
 LOG = logging.getLogger(__name__)
 
+cfg.CONF.import_opt('server_status_poll_interval', 'heat.common.config')
+
 
 NOVACLIENT_VERSION = "2"
 
+# The maximum number of servers per tenant whose status is polled in batches
+MAX_POLLED_SERVERS = 1000
+
+# The maximum number of tenants whose servers' status is polled in batches
+MAX_SERVER_POLLERS = 100
+
+# The number of poll intervals after which a server whose status has not been
+# requested is no longer polled
+POLLED_SERVER_EXPIRY_INTERVALS = 3
+
+
+class ServerStatusPoller(object):
+    '''
+    Polls for the status of all of the servers that the engine is waiting on
+    in a tenant at once.
+
+    Each server is fetched individually the first time it is checked. After
+    that, a single request for the list of servers that have changed is made
+    at most once per interval, and its results are shared by all of the
+    servers being waited on. A server stops being polled when it reaches a
+    final status, or when its status has not been requested for a few
+    intervals, e.g. because the resource waiting on it was deleted.
+    '''
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._servers = lru_cache.LRUCache(MAX_POLLED_SERVERS)
+        self._next_poll = None
+
+    def get(self, plugin, server_id):
+        '''
+        Return a recent server object for the given server ID, or None if it
+        could not be fetched because of a non-critical API error.
+        '''
+        expiry = timeutils.Duration(self.interval *
+                                    POLLED_SERVER_EXPIRY_INTERVALS)
+        polled = self._servers.get(server_id)
+        if polled is None:
+            server = plugin.fetch_server(server_id)
+            if server is not None:
+                self._servers.put(server_id, (server, expiry))
+            if self._next_poll is None:
+                self._next_poll = timeutils.Duration(self.interval)
+            return server
+
+        self._servers.put(server_id, (polled[0], expiry))
+        if self._next_poll is None or self._next_poll.expired():
+            self._next_poll = timeutils.Duration(self.interval)
+            self._expire()
+            self._poll(plugin)
+        polled = self._servers.get(server_id)
+        return polled[0] if polled is not None else None
+
+    def forget(self, server_id):
+        '''Stop polling for the status of a server.'''
+        self._servers.pop(server_id)
+
+    def _expire(self):
+        '''Stop polling for the servers whose status is no longer requested.'''
+        for server_id, (server, expiry) in self._servers.items():
+            if expiry.expired():
+                self._servers.pop(server_id)
+
+    def _changes_since(self):
+        '''
+        Return the time reported by Nova of the least recent update to any of
+        the servers being polled, or None if it is not known.
+        '''
+        updated = [getattr(s, 'updated', None)
+                   for s, expiry in self._servers.values()]
+        if not updated or None in updated:
+            return None
+        return min(updated)
+
+    def _poll(self, plugin):
+        search_opts = {}
+        changes_since = self._changes_since()
+        if changes_since is not None:
+            search_opts['changes-since'] = changes_since
+
+        try:
+            servers = plugin.client().servers.list(search_opts=search_opts)
+        except exceptions.OverLimit as exc:
+            LOG.warn(_LW("Received an OverLimit response when "
+                         "listing servers: %s"), exc)
+            return
+        except exceptions.ClientException as exc:
+            if ((getattr(exc, 'http_status', getattr(exc, 'code', None)) in
+                 (500, 503))):
+                LOG.warn(_LW("Received the following exception when "
+                             "listing servers: %s"), exc)
+                return
+            raise
+
+        for server in servers:
+            server_id = six.text_type(server.id)
+            polled = self._servers.pop(server_id)
+            if polled is not None:
+                self._servers.put(server_id, (server, polled[1]))
+
+
+# Server status pollers for each tenant, shared by all stacks in the engine
+_server_pollers = lru_cache.LRUCache(MAX_SERVER_POLLERS)
+
 
 class NovaClientPlugin(client_plugin.ClientPlugin):
 
@@ -144,6 +252,22 @@ class NovaClientPlugin(client_plugin.ClientPlugin):
                 raise
         return server
 
+    def _server_poller(self):
+        '''
+        Return the poller shared by all checks of server status in the tenant,
+        or None if server status is not polled in batches.
+        '''
+        interval = cfg.CONF.server_status_poll_interval
+        if interval <= 0:
+            return None
+
+        tenant_id = self.context.tenant_id
+        poller = _server_pollers.get(tenant_id)
+        if poller is None or poller.interval != interval:
+            poller = ServerStatusPoller(interval)
+            _server_pollers.put(tenant_id, poller)
+        return poller
+
     def refresh_server(self, server):
         '''
         Refresh server's attributes and log warnings for non-critical
@@ -198,11 +322,19 @@ class NovaClientPlugin(client_plugin.ClientPlugin):
         """
         # not checking with is_uuid_like as most tests use strings e.g. '1234'
         if isinstance(server, six.string_types):
-            server = self.fetch_server(server)
+            server_id = server
+            poller = self._server_poller()
+            if poller is None:
+                server = self.fetch_server(server_id)
+            else:
+                server = poller.get(self, server_id)
             if server is None:
                 return False
             else:
                 status = self.get_status(server)
+                if (poller is not None and
+                        status not in self.deferred_server_statuses):
+                    poller.forget(server_id)
         else:
             status = self.get_status(server)
             if status != 'ACTIVE':
@@ -226,6 +358,7 @@ class NovaClientPlugin(client_plugin.ClientPlugin):
                 resource_status=server.status,
                 result=_('%s is not active') % res_name)
 
+    @client_plugin.cached_lookup
     def get_flavor_id(self, flavor):
         '''
         Get the id for the specified flavor name.
@@ -588,6 +721,7 @@ echo -e '%s\tALL=(ALL)\tNOPASSWD: ALL' >> /etc/sudoers
             raise exception.PhysicalResourceNameAmbiguity(name=label)
         return net_id
 
+    @client_plugin.cached_lookup
     def get_nova_network_id(self, net_identifier):
         if uuidutils.is_uuid_like(net_identifier):
             try:
@@ -12,9 +12,13 @@
 #    under the License.
 
 import collections
+import contextlib
 import numbers
 import re
 import warnings
+import weakref
+
+import eventlet
 
 from oslo_cache import core
 from oslo_config import cfg
@@ -24,6 +28,7 @@ import six
 from heat.common import cache
 from heat.common import exception
 from heat.common.i18n import _
+from heat.engine.clients import client_plugin
 from heat.engine import resources
 
 # decorator that allows to cache the value
@@ -32,6 +37,30 @@ MEMOIZE = core.get_memoization_decorator(conf=cfg.CONF,
                                          region=cache.get_cache_region(),
                                          group="constraint_validation_cache")
 
+# results of custom constraint lookups for each context that is in a
+# validation pass, keyed by constraint class, tenant and value
+_validation_passes = weakref.WeakKeyDictionary()
+
+
+@contextlib.contextmanager
+def validation_pass(context):
+    """Share the results of custom constraint lookups within a block.
+
+    While the block runs, each lookup of a value by a custom constraint with
+    the given context is made only once, even if it is not cached in the
+    constraint validation cache and even if it is requested concurrently.
+    Nested validation passes share the results of the outermost one.
+    """
+    if context in _validation_passes:
+        yield
+        return
+
+    _validation_passes[context] = {}
+    try:
+        yield
+    finally:
+        _validation_passes.pop(context, None)
+
 
 class Schema(collections.Mapping):
     """
@@ -591,6 +620,33 @@ class BaseCustomConstraint(object):
             "value": value, "message": self._error_message}
 
     def validate(self, value, context):
+        results = _validation_passes.get(context)
+        if results is not None:
+            key = (type(self), six.text_type(context.tenant_id), value)
+            try:
+                pending = results.get(key)
+            except TypeError:
+                # The value is not hashable, so its lookup is not shared
+                results = None
+
+        if results is None:
+            return self._validate_value(value, context)
+
+        if pending is not None:
+            valid, self._error_message = pending.wait()
+            return valid
+
+        results[key] = pending = eventlet.event.Event()
+        try:
+            valid = self._validate_value(value, context)
+        except Exception as ex:
+            del results[key]
+            pending.send_exception(ex)
+            raise
+        pending.send((valid, self._error_message))
+        return valid
+
+    def _validate_value(self, value, context):
 
         @MEMOIZE
         def check_cache_or_validate_value(cache_value_prefix,
@@ -610,7 +666,9 @@ class BaseCustomConstraint(object):
             :return: True if value is valid otherwise False
             """
             try:
-                self.validate_with_client(context.clients, value_to_validate)
+                with client_plugin.uncached_lookups():
+                    self.validate_with_client(context.clients,
+                                              value_to_validate)
             except self.expected_exceptions as e:
                 self._error_message = str(e)
                 return False
@@ -91,6 +91,10 @@ class Node(object):
         '''Iterate over the keys required by this node.'''
         return iter(self.require)
 
+    def __contains__(self, target):
+        '''Return True if this node requires the specified key.'''
+        return target in self.require
+
     def __str__(self):
         '''Return a human-readable string representation of the node.'''
         text = '{%s}' % ', '.join(str(n) for n in self)
@@ -158,16 +162,21 @@ class Graph(collections.defaultdict):
 
         This is a destructive operation for the graph.
         '''
-        for iteration in six.moves.xrange(len(graph)):
-            for key, node in six.iteritems(graph):
-                if not node:
-                    yield key
-                    del graph[key]
-                    break
-            else:
-                # There are nodes remaining, but none without
-                # dependencies: a cycle
-                raise CircularDependencyException(cycle=six.text_type(graph))
+        leaves = collections.deque(key for key, node in six.iteritems(graph)
+                                   if not node)
+        while leaves:
+            key = leaves.popleft()
+            requirers = list(graph[key].required_by())
+            yield key
+            del graph[key]
+            for rqr in requirers:
+                if not graph[rqr]:
+                    leaves.append(rqr)
+
+        if graph:
+            # There are nodes remaining, but none without
+            # dependencies: a cycle
+            raise CircularDependencyException(cycle=six.text_type(graph))
 
 
 @six.python_2_unicode_compatible
@@ -11,12 +11,135 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import eventlet
+from oslo_config import cfg
+from oslo_log import log as logging
 import six
 
+from heat.common import context as common_context
 from heat.common import exception
 from heat.common.i18n import _
+from heat.common.i18n import _LE
 from heat.common import identifier
+from heat.common import lru_cache
 from heat.objects import event as event_object
+from heat.objects import resource_properties_data as rpd_objects
+
+cfg.CONF.import_opt('event_purge_batch_size', 'heat.common.config')
+cfg.CONF.import_opt('max_events_per_stack', 'heat.common.config')
+cfg.CONF.import_opt('event_write_batch_size', 'heat.common.config')
+cfg.CONF.import_opt('event_write_delay', 'heat.common.config')
+
+LOG = logging.getLogger(__name__)
+
+# The maximum number of stacks for which event counts are kept
+MAX_COUNTED_STACKS = 1000
+
+
+class EventWriter(object):
+    '''
+    Writes events to the database, optionally buffering them so that the
+    events for a stack can be written together in a single transaction.
+
+    Events are written using the context of the request that writes them.
+    Only buffered events that are flushed later, from a thread of their own,
+    are written using an admin context.
+
+    A count of the events for each stack is kept, so that the database only
+    needs to be queried for it when the stack's events are pruned, or once
+    every event_purge_batch_size events to pick up the events written by
+    other engines.
+    '''
+
+    def __init__(self):
+        self._buffers = {}
+        self._counts = lru_cache.LRUCache(MAX_COUNTED_STACKS)
+
+    def add(self, context, values):
+        '''
+        Buffer an event to be written to the database later.
+
+        The event is written immediately, using the given context, if the
+        buffer for its stack is full or events are not being batched.
+        '''
+        if cfg.CONF.event_write_batch_size <= 1:
+            self.write(context, values)
+            return
+
+        stack_id = values['stack_id']
+        if stack_id not in self._buffers:
+            self._buffers[stack_id] = []
+            eventlet.spawn_after(cfg.CONF.event_write_delay,
+                                 self._flush_later, stack_id)
+
+        buffered = self._buffers[stack_id]
+        buffered.append(values)
+        if len(buffered) >= cfg.CONF.event_write_batch_size:
+            self.flush(stack_id, context)
+
+    def write(self, context, values):
+        '''
+        Write an event to the database immediately, after any buffered events
+        for the same stack, and return the stored event.
+        '''
+        stack_id = values['stack_id']
+        self.flush(stack_id, context)
+        return self._write(context, stack_id, [values])[0]
+
+    def flush(self, stack_id, context=None):
+        '''
+        Write any buffered events for a stack to the database.
+
+        The events are written using the given context, which must belong to
+        the calling thread, or else a new admin context. The admin context
+        does not replace the calling thread's current context.
+        '''
+        values_list = self._buffers.pop(stack_id, [])
+        if values_list:
+            if context is None:
+                context = common_context.RequestContext(is_admin=True,
+                                                        overwrite=False)
+            self._write(context, stack_id, values_list)
+
+    def flush_all(self):
+        '''Write all buffered events to the database.'''
+        for stack_id in list(self._buffers):
+            self.flush(stack_id)
+
+    def _flush_later(self, stack_id):
+        try:
+            self.flush(stack_id)
+        except Exception:
+            LOG.exception(_LE('Failed to write events for stack %s'),
+                          stack_id)
+
+    def _write(self, context, stack_id, values_list):
+        max_events = cfg.CONF.max_events_per_stack
+        if max_events:
+            count, uncounted = self._counts.get(stack_id) or (None, 0)
+            # Other engines may be writing events for the same stack, so
+            # count again before pruning, and after every batch of events
+            # written since the last count
+            if (count is None or count + len(values_list) > max_events or
+                    uncounted + len(values_list) >
+                    cfg.CONF.event_purge_batch_size):
+                count = event_object.Event.count_all_by_stack(context,
+                                                              stack_id)
+                uncounted = 0
+            excess = count + len(values_list) - max_events
+            if excess > 0:
+                count -= event_object.Event.prune_by_stack(
+                    context, stack_id,
+                    max(excess, cfg.CONF.event_purge_batch_size))
+
+        events = event_object.Event.create_many(context, values_list)
+        if max_events:
+            self._counts.put(stack_id, (count + len(events),
+                                        uncounted + len(events)))
+        return events
+
+
+writer = EventWriter()
 
 
 class Event(object):
@@ -24,11 +147,16 @@ class Event(object):
 
     def __init__(self, context, stack, action, status, reason,
                  physical_resource_id, resource_properties, resource_name,
-                 resource_type, uuid=None, timestamp=None, id=None):
+                 resource_type, uuid=None, timestamp=None, id=None,
+                 rsrc_prop_data_id=None):
         '''
         Initialise from a context, stack, and event information. The timestamp
         and database ID may also be initialised if the event is already in the
         database.
+
+        Instead of the resource properties, the ID of stored resource
+        properties data may be supplied, in which case the properties are
+        only retrieved from the database when they are needed.
         '''
         self.context = context
         self.stack = stack
@@ -38,17 +166,38 @@ class Event(object):
         self.physical_resource_id = physical_resource_id
         self.resource_name = resource_name
         self.resource_type = resource_type
-        try:
-            self.resource_properties = dict(resource_properties)
-        except ValueError as ex:
-            self.resource_properties = {'Error': six.text_type(ex)}
+        self.rsrc_prop_data_id = rsrc_prop_data_id
+        if resource_properties is None and rsrc_prop_data_id is not None:
+            self._resource_properties = None
+        else:
+            try:
+                self._resource_properties = dict(resource_properties or {})
+            except ValueError as ex:
+                self._resource_properties = {'Error': six.text_type(ex)}
         self.uuid = uuid
         self.timestamp = timestamp
         self.id = id
 
+    @property
+    def resource_properties(self):
+        if self._resource_properties is None:
+            prop_data = rpd_objects.ResourcePropertiesData.get_all(
+                self.context, [self.rsrc_prop_data_id])
+            self._set_prop_data(prop_data)
+        return self._resource_properties
+
+    def _set_prop_data(self, prop_data):
+        stored = prop_data.get(self.rsrc_prop_data_id)
+        self._resource_properties = dict(stored.data or {}) if stored else {}
+
     @classmethod
-    def load(cls, context, event_id, event=None, stack=None):
-        '''Retrieve an Event from the database.'''
+    def load(cls, context, event_id, event=None, stack=None, prop_data=None):
+        '''
+        Retrieve an Event from the database.
+
+        Stored resource properties data that has already been retrieved may
+        be passed as prop_data, a dict keyed by ID.
+        '''
         from heat.engine import stack as parser
 
         ev = (event if event is not None else
@@ -60,13 +209,23 @@ class Event(object):
         st = (stack if stack is not None else
               parser.Stack.load(context, ev.stack_id))
 
-        return cls(context, st, ev.resource_action, ev.resource_status,
-                   ev.resource_status_reason, ev.physical_resource_id,
-                   ev.resource_properties, ev.resource_name,
-                   ev.resource_type, ev.uuid, ev.created_at, ev.id)
+        loaded = cls(context, st, ev.resource_action, ev.resource_status,
+                     ev.resource_status_reason, ev.physical_resource_id,
+                     ev.resource_properties, ev.resource_name,
+                     ev.resource_type, ev.uuid, ev.created_at, ev.id,
+                     ev.rsrc_prop_data_id)
+        if prop_data is not None and loaded._resource_properties is None:
+            loaded._set_prop_data(prop_data)
+        return loaded
+
+    def store(self, defer=False):
+        '''
+        Store the Event in the database.
 
-    def store(self):
-        '''Store the Event in the database.'''
+        If defer is True, the Event may instead be buffered and written to the
+        database later together with other events for the same stack, in which
+        case its database ID is not set.
+        '''
         ev = {
             'resource_name': self.resource_name,
             'physical_resource_id': self.physical_resource_id,
@@ -75,16 +234,24 @@ class Event(object):
             'resource_status': self.status,
             'resource_status_reason': self.reason,
             'resource_type': self.resource_type,
-            'resource_properties': self.resource_properties,
         }
 
+        if self.rsrc_prop_data_id is not None:
+            ev['rsrc_prop_data_id'] = self.rsrc_prop_data_id
+        else:
+            ev['resource_properties'] = self.resource_properties
+
         if self.uuid is not None:
             ev['uuid'] = self.uuid
 
         if self.timestamp is not None:
             ev['created_at'] = self.timestamp
 
-        new_ev = event_object.Event.create(self.context, ev)
+        if defer:
+            writer.add(self.context, ev)
+            return None
+
+        new_ev = writer.write(self.context, ev)
         self.id = new_ev.id
         return self.id
 
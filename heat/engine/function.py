@@ -73,6 +73,9 @@ class Function(object):
     def dep_attrs(self, resource_name):
         return dep_attrs(self.args, resource_name)
 
+    def all_dep_attrs(self):
+        return all_dep_attrs(self.args)
+
     def __reduce__(self):
         """
         Return a representation of the function suitable for pickling.
@@ -206,3 +209,26 @@ def dep_attrs(snippet, resource_name):
         attrs = (dep_attrs(value, resource_name) for value in snippet)
         return itertools.chain.from_iterable(attrs)
     return []
+
+
+def all_dep_attrs(snippet):
+    """
+    Return an iterator over (resource_name, attribute) pairs for all of the
+    dependent attributes in a template snippet.
+
+    This walks the snippet only once, so it is cheaper than calling
+    dep_attrs() for every resource in turn. The snippet should be already
+    parsed to insert Function objects where appropriate.
+    """
+
+    if isinstance(snippet, Function):
+        return snippet.all_dep_attrs()
+
+    elif isinstance(snippet, collections.Mapping):
+        attrs = (all_dep_attrs(value) for value in snippet.items())
+        return itertools.chain.from_iterable(attrs)
+    elif (not isinstance(snippet, six.string_types) and
+          isinstance(snippet, collections.Iterable)):
+        attrs = (all_dep_attrs(value) for value in snippet)
+        return itertools.chain.from_iterable(attrs)
+    return []
@@ -105,21 +105,21 @@ class HOTemplate20130523(template.Template):
         else:
             default = {}
 
-        # if a section is None (empty yaml section) return {}
-        # to be consistent with an empty json section.
-        the_section = self.t.get(section) or default
-
         # In some cases (e.g. parameters), also translate each entry of
         # a section into CFN format (case, naming, etc) so the rest of the
         # engine can cope with it.
         # This is a shortcut for now and might be changed in the future.
         if section == self.RESOURCES:
-            return self._translate_resources(the_section)
+            return self._parsed_section(
+                section, lambda s: self._translate_resources(s or {}))
 
         if section == self.OUTPUTS:
-            return self._translate_outputs(the_section)
+            return self._parsed_section(
+                section, lambda s: self._translate_outputs(s or {}))
 
-        return the_section
+        # if a section is None (empty yaml section) return {}
+        # to be consistent with an empty json section.
+        return self.t.get(section) or default
 
     @staticmethod
     def _translate(value, mapping, err_msg=None):
@@ -272,6 +272,7 @@ class HOTemplate20130523(template.Template):
         if name is None:
             name = definition.name
 
+        self._parsed = None
         if self.t.get(self.RESOURCES) is None:
             self.t[self.RESOURCES] = {}
         self.t[self.RESOURCES][name] = definition.render_hot()
@@ -12,8 +12,11 @@
 #    under the License.
 
 import base64
+import collections
 import contextlib
 import datetime as dt
+import fnmatch
+import random
 import weakref
 
 from oslo_config import cfg
@@ -44,19 +47,74 @@ from heat.engine import support
 from heat.engine import template
 from heat.objects import resource as resource_objects
 from heat.objects import resource_data as resource_data_objects
+from heat.objects import resource_properties_data as rpd_objects
+from heat.objects import stack as stack_objects
 from heat.rpc import client as rpc_client
 
 cfg.CONF.import_opt('action_retry_limit', 'heat.common.config')
+cfg.CONF.import_opt('check_complete_poll_policy', 'heat.common.config')
+cfg.CONF.import_opt('event_properties_storage', 'heat.common.config')
 
 LOG = logging.getLogger(__name__)
 
 datetime = dt.datetime
 
+# Count of calls to check_<action>_complete() methods, by resource type
+check_complete_calls = collections.Counter()
+
+# Number of polls after which the check interval stops doubling
+_MAX_BACKOFF_ATTEMPT = 32
+
 
 def _register_class(resource_type, resource_class):
     resources.global_env().register_class(resource_type, resource_class)
 
 
+def _check_poll_policy(resource_type):
+    '''
+    Return the configured policy for polling resources of the given type for
+    completion, as a tuple of (initial interval, maximum interval, jitter).
+
+    Returns None if resources of this type should be polled on every step.
+    '''
+    for policy in cfg.CONF.check_complete_poll_policy:
+        pattern, sep, values = policy.rpartition('=')
+        if not fnmatch.fnmatchcase(resource_type, pattern):
+            continue
+        try:
+            values = [float(v) for v in values.split(',')]
+            if len(values) > 3:
+                raise ValueError(policy)
+        except ValueError:
+            LOG.warn(_LW('Ignoring invalid check_complete_poll_policy '
+                         '"%s"'), policy)
+            continue
+        initial, maximum, jitter = values + [None, 0.0][len(values) - 1:]
+        return initial, maximum, jitter
+    return None
+
+
+def _next_check(poll_policy, attempt):
+    '''
+    Return a Duration that expires when the next check for completion is due
+    under the given polling policy, or None if a check is due on every step.
+    '''
+    if poll_policy is None:
+        return None
+
+    initial, maximum, jitter = poll_policy
+    # Stop doubling well before 2 ** attempt overflows a float
+    delay = timeutils.retry_backoff_delay(min(attempt, _MAX_BACKOFF_ATTEMPT),
+                                          scale_factor=initial)
+    if maximum is not None:
+        delay = min(delay, maximum)
+    # Add the jitter after capping the delay, so that resources that have
+    # all reached the maximum do not go back to polling in lockstep
+    if jitter:
+        delay += random.random() * jitter
+    return timeutils.Duration(delay)
+
+
 class UpdateReplace(Exception):
     '''Raised when resource update requires replacement.'''
     def __init__(self, resource_name='Unknown'):
@@ -139,6 +197,16 @@ class Resource(object):
     # throughout its lifecycle
     requires_deferred_auth = False
 
+    # If True, the attributes of this resource may be looked up in a green
+    # thread of their own. Only resource types that look up attributes solely
+    # through remote API calls, never through the database, may set this.
+    concurrent_attribute_lookups = False
+
+    # If True, this resource may be validated in a green thread of its own.
+    # Only resource types whose validation makes remote API calls, but never
+    # uses the database, may set this.
+    concurrent_validation = False
+
     # Limit to apply to physical_resource_name() size reduction algorithm.
     # If set to None no limit will be applied.
     physical_resource_name_limit = 255
@@ -231,6 +299,7 @@ class Resource(object):
         self._data = {}
         self._rsrc_metadata = None
         self._stored_properties_data = None
+        self._stored_properties_data_id = (None, None)
         self.created_time = stack.created_time
         self.updated_time = stack.updated_time
         self._rpc_client = None
@@ -285,14 +354,30 @@ class Resource(object):
         self._stackref = weakref.ref(stack)
 
     @classmethod
-    def load(cls, context, resource_id, is_update, data):
+    def load(cls, context, resource_id, is_update, data,
+             traversal_cache=None):
         from heat.engine import stack as stack_mod
         db_res = resource_objects.Resource.get_obj(context, resource_id)
+        db_stack = stack_objects.Stack.get_by_id(context, db_res.stack_id,
+                                                 show_deleted=True,
+                                                 eager_load=True)
+        if db_stack is None:
+            message = _('No stack exists with id "%s"') % db_res.stack_id
+            raise exception.NotFound(message)
+
+        def load_template(template_id, t=None):
+            if traversal_cache is None:
+                return template.Template.load(context, template_id, t)
+            return traversal_cache.load_template(context, db_stack.id,
+                                                 db_stack.current_traversal,
+                                                 template_id, t)
 
         @contextlib.contextmanager
         def special_stack(tmpl, swap_template):
-            # TODO(sirushtim): Load stack from cache
-            stk = stack_mod.Stack.load(context, db_res.stack_id)
+            stk = stack_mod.Stack.load(
+                context, stack=db_stack,
+                template=load_template(db_stack.raw_template_id,
+                                       db_stack.raw_template))
             # NOTE(sirushtim): Because on delete/cleanup operations, we simply
             # update with another template, the stack object won't have the
             # template of the previous stack-run.
@@ -304,7 +389,7 @@ class Resource(object):
             if swap_template:
                 stk.t = prev_tmpl
 
-        tmpl = template.Template.load(context, db_res.current_template_id)
+        tmpl = load_template(db_res.current_template_id)
         with special_stack(tmpl, not is_update) as stack:
             stack_res = tmpl.resource_definitions(stack)[db_res.name]
             resource = cls(db_res.name, stack_res, stack)
@@ -541,6 +626,9 @@ class Resource(object):
     def dep_attrs(self, resource_name):
         return self.t.dep_attrs(resource_name)
 
+    def all_dep_attrs(self):
+        return self.t.all_dep_attrs()
+
     def add_dependencies(self, deps):
         for dep in self.t.dependencies(self.stack):
             deps += (self, dep)
@@ -666,6 +754,10 @@ class Resource(object):
 
         If a prefix is supplied, the handler method handle_<PREFIX>_<ACTION>()
         is called instead.
+
+        If a check_complete_poll_policy is configured for the resource type,
+        steps are skipped without calling check_<ACTION>_complete() until the
+        next check is due.
         '''
         handler_action = action.lower()
         check = getattr(self, 'check_%s_complete' % handler_action, None)
@@ -678,7 +770,16 @@ class Resource(object):
             handler_data = handler(*args)
             yield
             if callable(check):
-                while not check(handler_data):
+                poll_policy = _check_poll_policy(self.type())
+                attempt = 0
+                next_check = _next_check(poll_policy, attempt)
+                while True:
+                    if next_check is None or next_check.expired():
+                        check_complete_calls[self.type()] += 1
+                        if check(handler_data):
+                            break
+                        attempt += 1
+                        next_check = _next_check(poll_policy, attempt)
                     yield
 
     @scheduler.wrappertask
@@ -1263,11 +1364,34 @@ class Resource(object):
 
     def _add_event(self, action, status, reason):
         '''Add a state change event to the database.'''
-        ev = event.Event(self.context, self.stack, action, status, reason,
-                         self.resource_id, self.properties,
-                         self.name, self.type())
+        if (cfg.CONF.event_properties_storage == 'reference' and
+                self._stored_properties_data is not None):
+            ev = event.Event(self.context, self.stack, action, status, reason,
+                             self.resource_id, None,
+                             self.name, self.type(),
+                             rsrc_prop_data_id=self._store_properties_data())
+        else:
+            ev = event.Event(self.context, self.stack, action, status, reason,
+                             self.resource_id, self.properties,
+                             self.name, self.type())
 
-        ev.store()
+        ev.store(defer=True)
+
+    def _store_properties_data(self):
+        '''
+        Store the stored properties data for events to refer to, and return
+        its ID.
+
+        The ID is a digest of the data. The data is only stored, and the
+        digest recalculated, when the stored properties data changes.
+        '''
+        data, prop_data_id = self._stored_properties_data_id
+        if data is not self._stored_properties_data:
+            data = self._stored_properties_data
+            prop_data_id = rpd_objects.ResourcePropertiesData.store(
+                self.context, data)
+            self._stored_properties_data_id = (data, prop_data_id)
+        return prop_data_id
 
     def _store_or_update(self, action, status, reason):
         prev_action = self.action
@@ -1488,6 +1612,25 @@ class Resource(object):
 
         return attributes.select_from_attribute(attribute, path)
 
+    def resolve_attributes(self, attr_names):
+        '''
+        Look up a number of attributes at once, caching their values.
+
+        This allows subsequent calls to FnGetAtt() for the attributes to be
+        answered without further lookups. Any error is ignored here, since it
+        is raised again when the attribute itself is requested.
+
+        :param attr_names: the attribute keys to look up.
+        '''
+        for attr_name in attr_names:
+            try:
+                self.attributes[attr_name]
+            except Exception as ex:
+                LOG.debug('Unable to look up attribute %(attr)s of '
+                          '%(res)s in advance: %(ex)s',
+                          {'attr': attr_name, 'res': self.name,
+                           'ex': six.text_type(ex)})
+
     def FnBase64(self, data):
         '''
         For the instrinsic function Fn::Base64.
@@ -415,6 +415,24 @@ class ResourceGroup(stack_resource.StackResource):
         return [grouputils.get_rsrc_attr(self, key, False, n, *path)
                 for n in names]
 
+    def resolve_attributes(self, attr_names):
+        # The attributes of a group come from its members, so look up the
+        # members' attributes in one batch.
+        nested = self.nested()
+        if nested is None:
+            return
+
+        names = self._resource_names()
+        dep_attrs = []
+        for key in attr_names:
+            if key.startswith("resource."):
+                path = key.split(".", 2)[1:]
+                if len(path) > 1:
+                    dep_attrs.append(tuple(path))
+            elif key not in (self.REFS, self.ATTR_ATTRIBUTES):
+                dep_attrs.extend((n, key) for n in names)
+        nested.prefetch_attributes(dep_attrs)
+
     def _build_resource_definition(self, include_all=False):
         res_def = self.properties[self.RESOURCE_DEF]
         if res_def[self.RESOURCE_DEF_PROPERTIES] is None:
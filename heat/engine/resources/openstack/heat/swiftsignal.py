@@ -31,8 +31,9 @@ LOG = logging.getLogger(__name__)
 
 
 class SwiftSignalFailure(exception.Error):
-    def __init__(self, wait_cond):
-        reasons = wait_cond.get_status_reason(wait_cond.STATUS_FAILURE)
+    def __init__(self, wait_cond, signals=None):
+        reasons = wait_cond.get_status_reason(wait_cond.STATUS_FAILURE,
+                                              signals)
         super(SwiftSignalFailure, self).__init__(';'.join(reasons))
 
 
@@ -200,6 +201,9 @@ class SwiftSignal(resource.Resource):
         super(SwiftSignal, self).__init__(name, json_snippet, stack)
         self._obj_name = None
         self._url = None
+        # The parsed body of each signal object fetched from Swift, by
+        # object name, along with the hash of the object content
+        self._fetched = {}
 
     @property
     def url(self):
@@ -239,6 +243,7 @@ class SwiftSignal(resource.Resource):
 
         index = container[1]
         if not index:  # Swift objects were deleted by user
+            self._fetched = {}
             return None
 
         # Remove objects in that are for other handle resources, since
@@ -246,26 +251,27 @@ class SwiftSignal(resource.Resource):
         # a container
         filtered = [obj for obj in index if self.obj_name in obj['name']]
 
-        # Fetch objects from Swift and filter results
+        # Fetch objects from Swift and filter results. Objects that were
+        # already fetched are only fetched again if their content changed.
         obj_bodies = []
+        fetched = {}
         for obj in filtered:
-            try:
-                signal = self.client().get_object(self.stack.id, obj['name'])
-            except Exception as exc:
-                self.client_plugin().ignore_not_found(exc)
-                continue
-
-            body = signal[1]
-            if body == swift.IN_PROGRESS:  # Ignore the initial object
-                continue
-            if body == "":
-                obj_bodies.append({})
-                continue
-            try:
-                obj_bodies.append(jsonutils.loads(body))
-            except ValueError:
-                raise exception.Error(_("Failed to parse JSON data: %s") %
-                                      body)
+            name = obj['name']
+            cached = self._fetched.get(name)
+            if cached is not None and cached[0] == obj.get('hash'):
+                body = cached[1]
+            else:
+                try:
+                    signal = self.client().get_object(self.stack.id, name)
+                except Exception as exc:
+                    self.client_plugin().ignore_not_found(exc)
+                    continue
+                body = self._parse_signal(signal[1])
+            fetched[name] = (obj.get('hash'), body)
+
+            if body is not None:  # Ignore the initial object
+                obj_bodies.append(dict(body))
+        self._fetched = fetched
 
         # Set default values on each signal
         signals = []
@@ -291,16 +297,32 @@ class SwiftSignal(resource.Resource):
 
         return signals
 
-    def get_status(self):
-        return [s[self.STATUS] for s in self.get_signals()]
-
-    def get_status_reason(self, status):
+    def _parse_signal(self, body):
+        '''Return the parsed body of a signal, or None for the initial one.'''
+        if body == swift.IN_PROGRESS:
+            return None
+        if body == "":
+            return {}
+        try:
+            return jsonutils.loads(body)
+        except ValueError:
+            raise exception.Error(_("Failed to parse JSON data: %s") % body)
+
+    def get_status(self, signals=None):
+        if signals is None:
+            signals = self.get_signals()
+        return [s[self.STATUS] for s in signals]
+
+    def get_status_reason(self, status, signals=None):
+        if signals is None:
+            signals = self.get_signals()
         return [s[self.REASON]
-                for s in self.get_signals()
+                for s in signals
                 if s[self.STATUS] == status]
 
-    def get_data(self):
-        signals = self.get_signals()
+    def get_data(self, signals=None):
+        if signals is None:
+            signals = self.get_signals()
         if not signals:
             return None
         data = {}
@@ -312,11 +334,13 @@ class SwiftSignal(resource.Resource):
         if timeutils.is_older_than(*create_data):
             raise SwiftSignalTimeout(self)
 
-        statuses = self.get_status()
+        # Fetch the signals once, and use them for everything in this poll
+        signals = self.get_signals() or []
+        statuses = self.get_status(signals)
 
         for status in statuses:
             if status == self.STATUS_FAILURE:
-                failure = SwiftSignalFailure(self)
+                failure = SwiftSignalFailure(self, signals)
                 LOG.info(_LI('%(name)s Failed (%(failure)s)'),
                          {'name': str(self), 'failure': str(failure)})
                 raise failure
@@ -25,6 +25,10 @@ class NeutronResource(resource.Resource):
 
     default_client_name = 'neutron'
 
+    concurrent_attribute_lookups = True
+
+    concurrent_validation = True
+
     def validate(self):
         '''
         Validate any of the provided params
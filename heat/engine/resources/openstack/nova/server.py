@@ -517,6 +517,10 @@ class Server(stack_user.StackUser, sh.SchedulerHintsMixin,
 
     entity = 'servers'
 
+    concurrent_attribute_lookups = True
+
+    concurrent_validation = True
+
     def translation_rules(self):
         return [properties.TranslationRule(
             self.properties,
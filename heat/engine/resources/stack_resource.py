@@ -32,6 +32,7 @@ from heat.engine import resource
 from heat.engine import scheduler
 from heat.engine import stack as parser
 from heat.engine import template
+from heat.objects import stack as stack_object
 from heat.rpc import api as rpc_api
 
 LOG = logging.getLogger(__name__)
@@ -134,6 +135,9 @@ class StackResource(resource.Resource):
         '''
         if force_reload:
             self._nested = None
+        elif self._nested is None and self.resource_id is not None:
+            self._nested = self.stack.pop_loaded_nested_stack(
+                self.resource_id)
 
         if self._nested is None and self.resource_id is not None:
             try:
@@ -333,15 +337,21 @@ class StackResource(resource.Resource):
 
     def _check_status_complete(self, action, show_deleted=False,
                                cookie=None):
-        nested = self.nested(force_reload=True, show_deleted=show_deleted)
-        if nested is None:
+        # Only the state of the nested stack is needed here, so read just
+        # that rather than reloading the whole stack on every poll.
+        nested_state = None
+        if self.resource_id is not None:
+            nested_state = stack_object.Stack.get_status(
+                self.context, self.resource_id, show_deleted=show_deleted)
+        if nested_state is None:
             if action == resource.Resource.DELETE:
                 return True
             # It's possible the engine handling the create hasn't persisted
             # the stack to the DB when we first start polling for state
             return False
 
-        if nested.action != action:
+        nested_action, nested_status, status_reason, updated_at = nested_state
+        if nested_action != action:
             return False
 
         # Has the action really started?
@@ -360,21 +370,25 @@ class StackResource(resource.Resource):
         if cookie is not None:
             prev_state = cookie['previous']['state']
             prev_updated_at = cookie['previous']['updated_at']
-            if (prev_updated_at == nested.updated_time and
-                    prev_state == nested.state):
+            if (prev_updated_at == updated_at and
+                    tuple(prev_state) == (nested_action, nested_status)):
                 return False
 
-        if nested.status == resource.Resource.IN_PROGRESS:
+        if nested_status == resource.Resource.IN_PROGRESS:
             return False
-        elif nested.status == resource.Resource.COMPLETE:
+
+        # The action has finished, so any cached copy of the nested stack is
+        # out of date.
+        self._nested = None
+        if nested_status == resource.Resource.COMPLETE:
             return True
-        elif nested.status == resource.Resource.FAILED:
-            raise exception.ResourceFailure(nested.status_reason, self,
+        elif nested_status == resource.Resource.FAILED:
+            raise exception.ResourceFailure(status_reason, self,
                                             action=action)
         else:
             raise resource.ResourceUnknownStatus(
-                resource_status=nested.status,
-                status_reason=nested.status_reason,
+                resource_status=nested_status,
+                status_reason=status_reason,
                 result=_('Stack unknown status'))
 
     def check_adopt_complete(self, cookie=None):
@@ -536,6 +550,14 @@ class StackResource(resource.Resource):
     def _resolve_attribute(self, name):
         return self.get_output(name)
 
+    def resolve_attributes(self, attr_names):
+        # Look up everything the requested outputs of the nested stack need
+        # in one batch, before resolving the outputs themselves.
+        stack = self.nested()
+        if stack is not None:
+            stack.prefetch_output_attributes(attr_names)
+        super(StackResource, self).resolve_attributes(attr_names)
+
     def implementation_signature(self):
         schema_names = ([prop for prop in self.properties_schema] +
                         [at for at in self.attributes_schema])
@@ -152,6 +152,14 @@ class ResourceDefinitionCore(object):
                                function.dep_attrs(self._metadata,
                                                   resource_name))
 
+    def all_dep_attrs(self):
+        """
+        Return an iterator over (resource_name, attribute) pairs for all
+        dependent attributes in resources' properties and metadata fields.
+        """
+        return itertools.chain(function.all_dep_attrs(self._properties),
+                               function.all_dep_attrs(self._metadata))
+
     def dependencies(self, stack):
         """
         Return the Resource objects in the given stack on which this depends.
@@ -176,6 +184,14 @@ class ResourceDefinitionCore(object):
                                strict_func_deps(self._metadata,
                                                 path(METADATA)))
 
+    def metadata_dependencies(self):
+        """
+        Return an iterator over the Resource objects to which this resource's
+        metadata refers.
+        """
+        return function.dependencies(self._metadata,
+                                     '.'.join([self.name, METADATA]))
+
     def properties(self, schema, context=None):
         """
         Return a Properties object representing the resource properties.
@@ -11,6 +11,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import sys
 import types
 
@@ -164,7 +165,7 @@ class TaskRunner(object):
     def _sleep(self, wait_time):
         """Sleep for the specified number of seconds."""
         if ENABLE_SLEEP and wait_time is not None:
-            LOG.debug('%s sleeping' % six.text_type(self))
+            LOG.debug('%s sleeping', self)
             eventlet.sleep(wait_time)
 
     def __call__(self, wait_time=1, timeout=None):
@@ -192,7 +193,7 @@ class TaskRunner(object):
         assert self._runner is None, "Task already started"
         assert not self._done, "Task already cancelled"
 
-        LOG.debug('%s starting' % six.text_type(self))
+        LOG.debug('%s starting', self)
 
         if timeout is not None:
             self._timeout = Timeout(self, timeout)
@@ -204,7 +205,7 @@ class TaskRunner(object):
         else:
             self._runner = False
             self._done = True
-            LOG.debug('%s done (not resumable)' % six.text_type(self))
+            LOG.debug('%s done (not resumable)', self)
 
     def step(self):
         """
@@ -220,13 +221,13 @@ class TaskRunner(object):
 
                 self._timeout.trigger(self._runner)
             else:
-                LOG.debug('%s running' % six.text_type(self))
+                LOG.debug('%s running', self)
 
                 try:
                     next(self._runner)
                 except StopIteration:
                     self._done = True
-                    LOG.debug('%s complete' % six.text_type(self))
+                    LOG.debug('%s complete', self)
 
         return self._done
 
@@ -246,7 +247,7 @@ class TaskRunner(object):
             return
 
         if not self.started() or grace_period is None:
-            LOG.debug('%s cancelled' % six.text_type(self))
+            LOG.debug('%s cancelled', self)
             self._done = True
             if self.started():
                 self._runner.close()
@@ -364,6 +365,15 @@ class DependencyTaskGroup(object):
         self.error_wait_time = error_wait_time
         self.aggregate_exceptions = aggregate_exceptions
 
+        # The scheduler state is updated incrementally as subtasks complete,
+        # so that each step only visits the subtasks that are ready to start
+        # or already running, rather than every subtask in the group.
+        self._ready_keys = collections.deque(k for k, n in
+                                             six.iteritems(self._graph)
+                                             if not n)
+        self._running_keys = collections.OrderedDict()
+        self._pending = collections.deque(six.itervalues(self._runners))
+
         if name is None:
             name = '(%s) %s' % (getattr(task, '__name__',
                                         task_description(task)),
@@ -378,16 +388,17 @@ class DependencyTaskGroup(object):
     def __call__(self):
         """Return a co-routine which runs the task group."""
         raised_exceptions = []
-        while any(six.itervalues(self._runners)):
+        while self._any_pending():
             try:
                 for k, r in self._ready():
+                    self._running_keys[k] = r
                     r.start()
 
                 yield
 
                 for k, r in self._running():
                     if r.step():
-                        del self._graph[k]
+                        self._complete(k)
             except Exception:
                 exc_info = sys.exc_info()
                 if self.aggregate_exceptions:
@@ -418,22 +429,40 @@ class DependencyTaskGroup(object):
             self._cancel_recursively(dependent_node, node_runner)
 
         del self._graph[key]
+        self._running_keys.pop(key, None)
+
+    def _complete(self, key):
+        """
+        Remove a completed subtask from the graph and queue any subtasks that
+        were waiting only on it to be started.
+        """
+        del self._running_keys[key]
+        requirers = list(self._graph[key].required_by())
+        del self._graph[key]
+        for rqr in requirers:
+            if not self._graph[rqr]:
+                self._ready_keys.append(rqr)
+
+    def _any_pending(self):
+        """Return True if any of the subtasks have not yet completed."""
+        while self._pending and not self._pending[0]:
+            self._pending.popleft()
+        return bool(self._pending)
 
     def _ready(self):
         """
         Iterate over all subtasks that are ready to start - i.e. all their
         dependencies have been satisfied but they have not yet been started.
         """
-        for k, n in six.iteritems(self._graph):
-            if not n:
-                runner = self._runners[k]
-                if runner and not runner.started():
-                    yield k, runner
+        while self._ready_keys:
+            k = self._ready_keys.popleft()
+            runner = self._runners[k]
+            if runner and not runner.started():
+                yield k, runner
 
     def _running(self):
         """
         Iterate over all subtasks that are currently running - i.e. they have
         been started but have not yet completed.
         """
-        running = lambda k_r: k_r[0] in self._graph and k_r[1].started()
-        return six.moves.filter(running, six.iteritems(self._runners))
+        return list(six.iteritems(self._running_keys))
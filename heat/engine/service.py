@@ -61,7 +61,9 @@ from heat.engine import update
 from heat.engine import watchrule
 from heat.engine import worker
 from heat.objects import event as event_object
+from heat.objects import raw_template as raw_template_object
 from heat.objects import resource as resource_objects
+from heat.objects import resource_properties_data as rpd_objects
 from heat.objects import service as service_objects
 from heat.objects import snapshot as snapshot_object
 from heat.objects import stack as stack_object
@@ -76,6 +78,9 @@ cfg.CONF.import_opt('max_stacks_per_tenant', 'heat.common.config')
 cfg.CONF.import_opt('enable_stack_abandon', 'heat.common.config')
 cfg.CONF.import_opt('enable_stack_adopt', 'heat.common.config')
 cfg.CONF.import_opt('convergence_engine', 'heat.common.config')
+cfg.CONF.import_opt('signal_metadata_refresh_delay', 'heat.common.config')
+cfg.CONF.import_opt('batch_resource_signals', 'heat.common.config')
+cfg.CONF.import_opt('enable_cloud_watch_lite', 'heat.common.config')
 
 LOG = logging.getLogger(__name__)
 
@@ -273,7 +278,7 @@ class EngineService(service.Service):
     by the RPC caller.
     """
 
-    RPC_API_VERSION = '1.15'
+    RPC_API_VERSION = '1.16'
 
     def __init__(self, host, topic):
         super(EngineService, self).__init__()
@@ -296,6 +301,12 @@ class EngineService(service.Service):
         self._rpc_server = None
         self.software_config = service_software_config.SoftwareConfigService()
         self.resource_enforcer = policy.ResourceEnforcer()
+        # names of the resources, by stack ID, whose metadata is waiting to
+        # be refreshed after a resource signal
+        self._pending_metadata_refreshes = {}
+        # details of the signals, by stack ID and resource name, that are
+        # waiting to be handled when batch_resource_signals is set
+        self._queued_signals = {}
 
         if cfg.CONF.trusts_delegated_roles:
             warnings.warn('The default value of "trusts_delegated_roles" '
@@ -307,21 +318,16 @@ class EngineService(service.Service):
 
     def create_periodic_tasks(self):
         LOG.debug("Starting periodic watch tasks pid=%s" % os.getpid())
-        # Note with multiple workers, the parent process hasn't called start()
-        # so we need to create a ThreadGroupManager here for the periodic tasks
         if self.thread_group_mgr is None:
             self.thread_group_mgr = ThreadGroupManager()
+        # Every worker evaluates the watch rules of its own share of the
+        # stacks, which is decided by its engine_id
         self.stack_watch = service_stack_watch.StackWatch(
-            self.thread_group_mgr)
+            self.thread_group_mgr, self.engine_id)
 
-        # Create a periodic_watcher_task per-stack
+        # Create a single periodic_watcher_task for every stack
         admin_context = context.get_admin_context()
-        stacks = stack_object.Stack.get_all(
-            admin_context,
-            tenant_safe=False,
-            show_hidden=True)
-        for s in stacks:
-            self.stack_watch.start_watch_task(s.id, admin_context)
+        self.stack_watch.start_watch_tasks(admin_context)
 
     def start(self):
         self.engine_id = stack_lock.StackLock.generate_engine_id()
@@ -340,6 +346,9 @@ class EngineService(service.Service):
             )
             self.worker_service.start()
 
+        if cfg.CONF.enable_cloud_watch_lite:
+            self.create_periodic_tasks()
+
         target = messaging.Target(
             version=self.RPC_API_VERSION, server=self.host,
             topic=self.topic)
@@ -387,6 +396,7 @@ class EngineService(service.Service):
             LOG.info(_LI("Stack %s processing was finished"), stack_id)
 
         self.manage_thread_grp.stop()
+        evt.writer.flush_all()
         ctxt = context.get_admin_context()
         service_objects.Service.delete(ctxt, self.service_id)
         LOG.info(_LI('Service %s is deleted'), self.service_id)
@@ -472,7 +482,7 @@ class EngineService(service.Service):
                     sort_dir=None, filters=None, tenant_safe=True,
                     show_deleted=False, show_nested=False, show_hidden=False,
                     tags=None, tags_any=None, not_tags=None,
-                    not_tags_any=None):
+                    not_tags_any=None, summary=False):
         """
         The list_stacks method returns attributes of all stacks.  It supports
         pagination (``limit`` and ``marker``), sorting (``sort_keys`` and
@@ -496,8 +506,27 @@ class EngineService(service.Service):
             multiple tags using the boolean AND expression
         :param not_tags_any: show stacks not containing these tags, combine
             multiple tags using the boolean OR expression
+        :param summary: if true, return only the attributes needed to list
+            stacks, reading only the template of each stack, and that once
+            for stacks that share a template
         :returns: a list of formatted stacks
         """
+        if summary:
+            stacks = stack_object.Stack.get_all(
+                cnxt, limit=limit, sort_keys=sort_keys, marker=marker,
+                sort_dir=sort_dir, filters=filters, tenant_safe=tenant_safe,
+                show_deleted=show_deleted, show_nested=show_nested,
+                show_hidden=show_hidden, tags=tags, tags_any=tags_any,
+                not_tags=not_tags, not_tags_any=not_tags_any, summary=True)
+            templates = raw_template_object.RawTemplate.get_templates(
+                cnxt, set(stack.raw_template_id for stack in stacks))
+            descriptions = dict(
+                (tmpl_id, templatem.get_description(tmpl))
+                for tmpl_id, tmpl in six.iteritems(templates))
+            return [api.format_stack_summary(
+                stack, descriptions.get(stack.raw_template_id))
+                for stack in stacks]
+
         stacks = parser.Stack.load_all(cnxt, limit, marker, sort_keys,
                                        sort_dir, filters, tenant_safe,
                                        show_deleted, resolve_data=False,
@@ -692,7 +721,7 @@ class EngineService(service.Service):
             if (stack.action in (stack.CREATE, stack.ADOPT)
                     and stack.status == stack.COMPLETE):
                 if self.stack_watch:
-                    # Schedule a periodic watcher task for this stack
+                    # Reset the watch rules for the periodic watcher task
                     self.stack_watch.start_watch_task(stack.id, cnxt)
             else:
                 LOG.info(_LI("Stack create failed, status %s"), stack.status)
@@ -1250,9 +1279,14 @@ class EngineService(service.Service):
                 stacks[stack_id] = parser.Stack.load(cnxt, stack_id)
             return stacks[stack_id]
 
+        prop_data = rpd_objects.ResourcePropertiesData.get_all(
+            cnxt, [e.rsrc_prop_data_id for e in events
+                   if e.rsrc_prop_data_id is not None])
+
         return [api.format_event(evt.Event.load(cnxt,
                                                 e.id, e,
-                                                get_stack(e.stack_id)))
+                                                get_stack(e.stack_id),
+                                                prop_data))
                 for e in events]
 
     def _authorize_stack_user(self, cnxt, stack, resource_name):
@@ -1278,11 +1312,11 @@ class EngineService(service.Service):
         return stack.access_allowed(access_key, resource_name)
 
     def _verify_stack_resource(self, stack, resource_name):
-        if resource_name not in stack:
+        resource = stack.resource_get(resource_name)
+        if resource is None:
             raise exception.ResourceNotFound(resource_name=resource_name,
                                              stack_name=stack.name)
 
-        resource = stack[resource_name]
         if resource.id is None:
             raise exception.ResourceNotAvailable(resource_name=resource_name)
 
@@ -1313,39 +1347,130 @@ class EngineService(service.Service):
                           implementation.
         '''
 
+        def _refresh_dependent_metadata(stack, rsrc):
+            if not rsrc.signal_needs_metadata_updates:
+                return
+
+            # Refresh the metadata for the resources that refer to the
+            # signalled resource, or to resources that depend on it, since
+            # signals can update metadata which is used by other resources,
+            # e.g when signalling a WaitConditionHandle resource, and other
+            # resources may refer to WaitCondition Fn::GetAtt Data
+            names = [r.name for r in stack.metadata_dependents(rsrc.name)]
+            if not names:
+                return
+            if sync_call or cfg.CONF.signal_metadata_refresh_delay <= 0:
+                self._refresh_metadata(stack, names)
+            else:
+                self._refresh_metadata_later(cnxt, stack.id, names)
+
         def _resource_signal(stack, rsrc, details):
             LOG.debug("signaling resource %s:%s" % (stack.name, rsrc.name))
             rsrc.signal(details)
+            _refresh_dependent_metadata(stack, rsrc)
+
+        def _release_queued_signals(signal_key, queued):
+            # Only drop the queue that this request reserved, in case another
+            # request has since reserved a new one
+            if self._queued_signals.get(signal_key) is queued:
+                del self._queued_signals[signal_key]
+
+        def _resource_queued_signals(stack, rsrc, queued):
+            # Handle the signals that are queued for the resource, including
+            # any that arrive while the metadata is being refreshed, with the
+            # stack that is already loaded.
+            try:
+                while queued:
+                    while queued:
+                        details = queued.pop(0)
+                        LOG.debug("signaling resource %s:%s" % (stack.name,
+                                                                rsrc.name))
+                        try:
+                            rsrc.signal(details)
+                        except Exception as ex:
+                            LOG.error(_LE("Error signaling resource "
+                                          "%(name)s: %(err)s"),
+                                      {'name': rsrc.name, 'err': ex})
+                    _refresh_dependent_metadata(stack, rsrc)
+            finally:
+                _release_queued_signals((stack.id, rsrc.name), queued)
 
-            if not rsrc.signal_needs_metadata_updates:
+        s = self._get_stack(cnxt, stack_identity)
+
+        signal_key = (s.id, resource_name)
+        queued = None
+        if not sync_call and cfg.CONF.batch_resource_signals:
+            # Reserve the queue before the stack is loaded, so that signals
+            # which arrive while it is loading are queued behind this one
+            reserved = [details]
+            queued = self._queued_signals.setdefault(signal_key, reserved)
+            if queued is not reserved:
+                # The resource is already handling queued signals, and will
+                # handle this one too
+                queued.append(details)
                 return
 
-            # Refresh the metadata for all other resources, since signals can
-            # update metadata which is used by other resources, e.g
-            # when signalling a WaitConditionHandle resource, and other
-            # resources may refer to WaitCondition Fn::GetAtt Data
-            for r in stack.dependencies:
-                if (r.name != rsrc.name and r.id is not None and
-                        r.action != r.INIT):
-                    r.metadata_update()
+        handled = False
+        try:
+            # This is not "nice" converting to the stored context here,
+            # but this happens because the keystone user associated with the
+            # signal doesn't have permission to read the secret key of
+            # the user associated with the cfn-credentials file
+            stack = parser.Stack.load(cnxt, stack=s, use_stored_context=True)
+            self._verify_stack_resource(stack, resource_name)
+
+            # Only the signalled resource is loaded, unless handling the
+            # signal needs the other resources of the stack too
+            rsrc = stack.resource_get(resource_name)
+            if callable(rsrc.signal):
+                if sync_call:
+                    _resource_signal(stack, rsrc, details)
+                    return rsrc.metadata_get()
+                elif queued is not None:
+                    self.thread_group_mgr.start(stack.id,
+                                                _resource_queued_signals,
+                                                stack, rsrc, queued)
+                    handled = True
+                else:
+                    self.thread_group_mgr.start(stack.id, _resource_signal,
+                                                stack, rsrc, details)
+        finally:
+            if queued is not None and not handled:
+                _release_queued_signals(signal_key, queued)
+
+    @staticmethod
+    def _refresh_metadata(stack, names):
+        for r in stack.dependencies:
+            if (r.name in names and r.id is not None and
+                    r.action != r.INIT):
+                r.metadata_update()
+
+    def _refresh_metadata_later(self, cnxt, stack_id, names):
+        '''
+        Refresh the metadata of the named resources after a short delay.
 
-        s = self._get_stack(cnxt, stack_identity)
+        Refreshes that are requested for the same stack during the delay are
+        combined, so that the metadata of each resource is refreshed only
+        once for a burst of signals.
+        '''
+        pending = self._pending_metadata_refreshes.get(stack_id)
+        if pending is not None:
+            pending.update(names)
+            return
+        self._pending_metadata_refreshes[stack_id] = set(names)
 
-        # This is not "nice" converting to the stored context here,
-        # but this happens because the keystone user associated with the
-        # signal doesn't have permission to read the secret key of
-        # the user associated with the cfn-credentials file
-        stack = parser.Stack.load(cnxt, stack=s, use_stored_context=True)
-        self._verify_stack_resource(stack, resource_name)
-
-        rsrc = stack[resource_name]
-        if callable(rsrc.signal):
-            if sync_call:
-                _resource_signal(stack, rsrc, details)
-                return rsrc.metadata_get()
-            else:
-                self.thread_group_mgr.start(stack.id, _resource_signal,
-                                            stack, rsrc, details)
+        def refresh():
+            try:
+                eventlet.sleep(cfg.CONF.signal_metadata_refresh_delay)
+            finally:
+                refresh_names = self._pending_metadata_refreshes.pop(stack_id)
+            # Reload the stack, so that the refresh sees the effect of every
+            # signal that arrived during the delay
+            stack = parser.Stack.load(cnxt, stack_id=stack_id,
+                                      use_stored_context=True)
+            self._refresh_metadata(stack, refresh_names)
+
+        self.thread_group_mgr.start(stack_id, refresh)
 
     @context.request_context
     def find_physical_resource(self, cnxt, physical_resource_id):
@@ -1587,11 +1712,13 @@ class EngineService(service.Service):
 
         try:
             wds = watch_data.WatchData.get_all(cnxt)
+            rule_names = dict((wr.id, wr.name)
+                              for wr in watch_rule.WatchRule.get_all(cnxt))
         except Exception as ex:
             LOG.warn(_LW('show_metric (all) db error %s'), ex)
             return
 
-        result = [api.format_watch_data(w) for w in wds]
+        result = [api.format_watch_data(w, rule_names) for w in wds]
         return result
 
     @context.request_context
@@ -11,6 +11,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
+
+from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import timeutils
 import six
@@ -18,97 +21,120 @@ import six
 from heat.common import context
 from heat.common.i18n import _LE
 from heat.common.i18n import _LW
-from heat.engine import stack
+from heat.common import service_utils
 from heat.engine import watchrule
+from heat.objects import service as service_objects
 from heat.objects import stack as stack_object
 from heat.objects import watch_rule as watch_rule_object
 from heat.rpc import api as rpc_api
 
+cfg.CONF.import_opt('periodic_interval', 'heat.common.config')
+
 LOG = logging.getLogger(__name__)
 
 
 class StackWatch(object):
-    def __init__(self, thread_group_mgr):
+    def __init__(self, thread_group_mgr, engine_id):
         self.thread_group_mgr = thread_group_mgr
+        self.engine_id = engine_id
 
     def start_watch_task(self, stack_id, cnxt):
-
-        def stack_has_a_watchrule(sid):
-            wrs = watch_rule_object.WatchRule.get_all_by_stack(cnxt, sid)
-
-            now = timeutils.utcnow()
-            start_watch_thread = False
-            for wr in wrs:
-                # reset the last_evaluated so we don't fire off alarms when
-                # the engine has not been running.
+        '''
+        Reset the watch rules of a stack and of the stacks nested below it, so
+        that they are next evaluated one period from now.
+
+        The rules are evaluated by the periodic watcher task, which is shared
+        by every stack.
+        '''
+        now = timeutils.utcnow()
+        # Every stack in the tree must be visited to reset its watch rules
+        for sid in stack_object.Stack.get_nested_ids(cnxt, stack_id):
+            for wr in watch_rule_object.WatchRule.get_all_by_stack(cnxt, sid):
                 watch_rule_object.WatchRule.update_by_id(
                     cnxt, wr.id,
                     {'last_evaluated': now})
 
-                if wr.state != rpc_api.WATCH_STATE_CEILOMETER_CONTROLLED:
-                    start_watch_thread = True
-
-            children = stack_object.Stack.get_all_by_owner_id(cnxt, sid)
-            for child in children:
-                if stack_has_a_watchrule(child.id):
-                    start_watch_thread = True
-
-            return start_watch_thread
-
-        if stack_has_a_watchrule(stack_id):
-            self.thread_group_mgr.add_timer(
-                stack_id,
-                self.periodic_watcher_task,
-                sid=stack_id)
-
-    def check_stack_watches(self, sid):
-        # Retrieve the stored credentials & create context
-        # Require tenant_safe=False to the stack_get to defeat tenant
-        # scoping otherwise we fail to retrieve the stack
-        LOG.debug("Periodic watcher task for stack %s" % sid)
+    def start_watch_tasks(self, cnxt):
+        '''
+        Reset the watch rules of every stack and start the periodic watcher
+        task.
+        '''
+        # reset the last_evaluated so we don't fire off alarms when
+        # the engine has not been running.
+        watch_rule_object.WatchRule.update_all(
+            cnxt, {'last_evaluated': timeutils.utcnow()})
+        # The task runs alongside the engine's service task, rather than in
+        # the thread group of any stack
+        self.thread_group_mgr.add_timer(cfg.CONF.periodic_interval,
+                                        self.periodic_watcher_task)
+
+    def _engine_ids(self, cnxt):
+        '''Return the sorted IDs of the engine workers that are running.'''
+        engine_ids = set([self.engine_id])
+        for srv in service_objects.Service.get_all(cnxt):
+            status = service_utils.format_service(srv)[
+                service_utils.SERVICE_STATUS]
+            if srv.binary == 'heat-engine' and status == 'up':
+                engine_ids.add(srv.engine_id)
+        return sorted(engine_ids)
+
+    @staticmethod
+    def _partition(stack_id, count):
+        '''Return the index of the engine that evaluates a stack's rules.'''
+        digest = hashlib.md5(six.text_type(stack_id).encode('utf-8'))
+        return int(digest.hexdigest(), 16) % count
+
+    def check_watches(self):
+        '''
+        Evaluate the watch rules that are due, for the stacks handled by this
+        engine.
+
+        The rules of every stack are read at once, and each engine worker only
+        evaluates those of its share of the stacks. A stack is only loaded
+        when an alarm action needs to be run for it.
+        '''
+        LOG.debug("Periodic watcher task")
         admin_context = context.get_admin_context()
-        db_stack = stack_object.Stack.get_by_id(admin_context,
-                                                sid,
-                                                tenant_safe=False,
-                                                eager_load=True)
-        if not db_stack:
-            LOG.error(_LE("Unable to retrieve stack %s for periodic task"),
-                      sid)
-            return
-        stk = stack.Stack.load(admin_context, stack=db_stack,
-                               use_stored_context=True)
-
-        # recurse into any nested stacks.
-        children = stack_object.Stack.get_all_by_owner_id(admin_context, sid)
-        for child in children:
-            self.check_stack_watches(child.id)
-
-        # Get all watchrules for this stack and evaluate them
         try:
-            wrs = watch_rule_object.WatchRule.get_all_by_stack(admin_context,
-                                                               sid)
+            wrs = watch_rule_object.WatchRule.get_all(
+                admin_context,
+                exclude_states=[rpc_api.WATCH_STATE_CEILOMETER_CONTROLLED,
+                                rpc_api.WATCH_STATE_SUSPENDED])
+            engine_ids = self._engine_ids(admin_context)
         except Exception as ex:
-            LOG.warn(_LW('periodic_task db error watch rule removed? %(ex)s'),
-                     ex)
+            LOG.warn(_LW('periodic_task db error %(ex)s'), {'ex': ex})
             return
 
-        def run_alarm_action(stk, actions, details):
-            for action in actions:
-                action(details=details)
-            for res in six.itervalues(stk):
-                res.metadata_update()
-
+        index = engine_ids.index(self.engine_id)
         for wr in wrs:
-            rule = watchrule.WatchRule.load(stk.context, watch=wr)
-            actions = rule.evaluate()
+            if self._partition(wr.stack_id, len(engine_ids)) != index:
+                continue
+
+            rule = watchrule.WatchRule.load(admin_context, watch=wr)
+            try:
+                actions = rule.evaluate(use_stored_context=True)
+            except Exception:
+                LOG.exception(_LE("Unable to evaluate watch %(name)s for "
+                                  "stack %(stack)s"),
+                              {'name': wr.name, 'stack': wr.stack_id})
+                continue
             if actions:
-                self.thread_group_mgr.start(sid, run_alarm_action, stk,
+                self.thread_group_mgr.start(wr.stack_id,
+                                            self._run_alarm_actions,
                                             actions, rule.get_details())
 
-    def periodic_watcher_task(self, sid):
+    @staticmethod
+    def _run_alarm_actions(actions, details):
+        for action in actions:
+            action(details=details)
+        # All of the actions signal resources in the same stack
+        stk = six.get_method_self(actions[0]).stack
+        for res in six.itervalues(stk):
+            res.metadata_update()
+
+    def periodic_watcher_task(self):
         """
-        Periodic task, created for each stack, triggers watch-rule
-        evaluation for all rules defined for the stack
-        sid = stack ID
+        Periodic task, shared by every stack, that triggers watch-rule
+        evaluation for all rules that are due
         """
-        self.check_stack_watches(sid)
+        self.check_watches()
@@ -16,7 +16,9 @@ import copy
 import datetime
 import itertools
 import re
+import sys
 
+import eventlet
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import encodeutils
@@ -33,6 +35,9 @@ from heat.common.i18n import _LI
 from heat.common.i18n import _LW
 from heat.common import identifier
 from heat.common import lifecycle_plugin_utils
+from heat.common import lru_cache
+from heat.db import api as db_api
+from heat.engine import constraints
 from heat.engine import dependencies
 from heat.engine import environment
 from heat.engine import event
@@ -55,9 +60,50 @@ from heat.rpc import api as rpc_api
 from heat.rpc import worker_client as rpc_worker_client
 
 cfg.CONF.import_opt('error_wait_time', 'heat.common.config')
+cfg.CONF.import_opt('max_concurrent_attribute_lookups', 'heat.common.config')
+cfg.CONF.import_opt('max_concurrent_validations', 'heat.common.config')
+cfg.CONF.import_opt('stored_context_cache_ttl', 'heat.common.config')
 
 LOG = logging.getLogger(__name__)
 
+# The maximum number of stored credentials that are cached by each engine
+# process when stored_context_cache_ttl is set
+STORED_CREDS_CACHE_SIZE = 1000
+
+_stored_creds = None
+
+
+def stored_creds_cache():
+    '''Return the cache of stored credentials shared by this process.'''
+    global _stored_creds
+
+    if _stored_creds is None:
+        _stored_creds = lru_cache.LRUCache(STORED_CREDS_CACHE_SIZE)
+    return _stored_creds
+
+
+def _get_stored_creds(user_creds_id):
+    '''
+    Return the decrypted stored credentials with the given ID.
+
+    When stored_context_cache_ttl is set, the credentials are cached for that
+    many seconds, so that frequent operations with the stored context, such
+    as handling resource signals, do not read and decrypt them every time.
+    '''
+    ttl = cfg.CONF.stored_context_cache_ttl
+    now = datetime.datetime.utcnow()
+    if ttl > 0:
+        cached = stored_creds_cache().get(user_creds_id)
+        if cached is not None and cached[0] > now:
+            return dict(cached[1])
+
+    creds_obj = ucreds_object.UserCreds.get_by_id(user_creds_id)
+    creds = creds_obj.obj_to_primitive()["versioned_object.data"]
+    if ttl > 0:
+        expiry = now + datetime.timedelta(seconds=ttl)
+        stored_creds_cache().put(user_creds_id, (expiry, dict(creds)))
+    return creds
+
 
 class ForcedCancel(BaseException):
     """Exception raised to cancel task execution."""
@@ -131,9 +177,11 @@ class Stack(collections.Mapping):
         self.parent_resource_name = parent_resource
         self._parent_stack = None
         self._resources = None
+        self._single_resources = None
         self._dependencies = None
         self._access_allowed_handlers = {}
         self._db_resources = None
+        self._loaded_nested_stacks = None
         self.adopt_stack_data = adopt_stack_data
         self.stack_user_project_id = stack_user_project_id
         self.created_time = created_time
@@ -149,6 +197,7 @@ class Stack(collections.Mapping):
         self.cache_data = cache_data
         self._worker_client = None
         self._convg_deps = None
+        self._dep_attrs = None
 
         if use_stored_context:
             self.context = self.stored_context()
@@ -206,11 +255,10 @@ class Stack(collections.Mapping):
 
     def stored_context(self):
         if self.user_creds_id:
-            creds_obj = ucreds_object.UserCreds.get_by_id(self.user_creds_id)
+            creds = _get_stored_creds(self.user_creds_id)
             # Maintain request_id from self.context so we retain traceability
             # in situations where servicing a request requires switching from
             # the request context to the stored context
-            creds = creds_obj.obj_to_primitive()["versioned_object.data"]
             creds['request_id'] = self.context.request_id
             # We don't store roles in the user_creds table, so disable the
             # policy check for admin by setting is_admin=False.
@@ -223,19 +271,52 @@ class Stack(collections.Mapping):
     @property
     def resources(self):
         if self._resources is None:
-            self._resources = dict((name, resource.Resource(name, data, self))
+            loaded = self._single_resources or {}
+            self._resources = dict((name,
+                                    loaded.get(name) or
+                                    resource.Resource(name, data, self))
                                    for (name, data) in
                                    self.t.resource_definitions(self).items())
+            self._single_resources = None
             # There is no need to continue storing the db resources
             # after resource creation
             self._db_resources = None
         return self._resources
 
+    def resource_get(self, resource_name):
+        '''
+        Return the resource with the specified name, or None if there is no
+        such resource.
+
+        If the resources of the stack have not been loaded yet, only the
+        requested resource is loaded. It is reused if all of the resources
+        are loaded later on.
+        '''
+        if self._resources is not None:
+            return self._resources.get(resource_name)
+        if resource_name not in self:
+            return None
+
+        if self._single_resources is None:
+            self._single_resources = {}
+        res = self._single_resources.get(resource_name)
+        if res is None:
+            definition = self.t.resource_definitions(self)[resource_name]
+            res = resource.Resource(resource_name, definition, self)
+            self._single_resources[resource_name] = res
+        return res
+
     def iter_resources(self, nested_depth=0):
         '''
         Iterates over all the resources in a stack, including nested stacks up
         to `nested_depth` levels below.
         '''
+        if (nested_depth and self.id is not None and
+                self._loaded_nested_stacks is None):
+            self._load_nested_stacks(nested_depth)
+        return self._iter_resources(nested_depth)
+
+    def _iter_resources(self, nested_depth):
         for res in six.itervalues(self):
             yield res
 
@@ -246,6 +327,42 @@ class Stack(collections.Mapping):
             for nested_res in nested_stack.iter_resources(nested_depth - 1):
                 yield nested_res
 
+    def _load_nested_stacks(self, nested_depth):
+        '''
+        Load the stacks nested below this one, up to `nested_depth` levels
+        below, together with their resources.
+
+        Rather than each nested stack being loaded separately, all of them
+        and all of their resources are read from the database at once. The
+        loaded stacks are handed to the resources that own them by
+        pop_loaded_nested_stack().
+        '''
+        stacks = dict((db_stack.id, Stack.load(self.context, stack=db_stack))
+                      for db_stack in stack_object.Stack.get_all_nested(
+                          self.context, self.id, nested_depth)
+                      if not db_stack.backup)
+        resources = resource_objects.Resource.get_all_by_stack_ids(
+            self.context, list(stacks))
+
+        self._loaded_nested_stacks = {}
+        for stack in six.itervalues(stacks):
+            stack._db_resources = resources.get(stack.id, {})
+            stack._loaded_nested_stacks = {}
+        for stack in six.itervalues(stacks):
+            owner = self if stack.owner_id == self.id else stacks.get(
+                stack.owner_id)
+            if owner is not None:
+                owner._loaded_nested_stacks[stack.id] = stack
+
+    def pop_loaded_nested_stack(self, stack_id):
+        '''
+        Return the nested stack with the given ID if it has already been
+        loaded along with this stack, or None otherwise.
+        '''
+        if not self._loaded_nested_stacks:
+            return None
+        return self._loaded_nested_stacks.pop(stack_id, None)
+
     def _db_resources_get(self, key_id=False):
         try:
             return resource_objects.Resource.get_all_by_stack(
@@ -270,6 +387,7 @@ class Stack(collections.Mapping):
 
     def reset_dependencies(self):
         self._dependencies = None
+        self._dep_attrs = None
 
     def root_stack_id(self):
         if not self.owner_id:
@@ -325,12 +443,67 @@ class Stack(collections.Mapping):
         Return the set of dependent attributes for specified resource name by
         inspecting all resources and outputs in template.
         '''
-        attr_lists = itertools.chain((res.dep_attrs(resource_name)
+        dep_attrs = Stack._get_dep_attrs_index(resources, outputs)
+        return dep_attrs.get(resource_name, set())
+
+    @staticmethod
+    def _get_dep_attrs_index(resources, outputs):
+        '''
+        Return a dict mapping each resource name to the set of its attributes
+        referenced by any of the given resources and outputs.
+        '''
+        attr_lists = itertools.chain((res.all_dep_attrs()
                                       for res in resources),
-                                     (function.dep_attrs(out.get('Value', ''),
-                                                         resource_name)
+                                     (function.all_dep_attrs(out.get('Value',
+                                                                     ''))
                                       for out in six.itervalues(outputs)))
-        return set(itertools.chain.from_iterable(attr_lists))
+        dep_attrs = collections.defaultdict(set)
+        for res_name, attr in itertools.chain.from_iterable(attr_lists):
+            dep_attrs[res_name].add(attr)
+        return dict(dep_attrs)
+
+    def dependent_attrs_index(self):
+        '''
+        Return a dict mapping each resource name to the set of its attributes
+        that are referenced anywhere in the stack's resources and outputs.
+
+        The index is calculated in a single pass over the template the first
+        time it is needed, and reused until the resources of the stack change.
+        '''
+        if self._dep_attrs is None:
+            self._dep_attrs = self._get_dep_attrs_index(
+                six.itervalues(self.resources), self.outputs)
+        return self._dep_attrs
+
+    def dependent_attrs(self, resource_name):
+        '''
+        Return the set of attributes of the specified resource that are
+        referenced anywhere in the stack's resources and outputs.
+        '''
+        return self.dependent_attrs_index().get(resource_name, set())
+
+    def metadata_dependents(self, resource_name):
+        '''
+        Return the resources whose metadata may change when the specified
+        resource changes, in dependency order.
+
+        These are the resources whose metadata refers to the resource itself,
+        or to any resource that depends on it directly or indirectly. For
+        example, metadata that gets the Data attribute of a WaitCondition
+        depends on the WaitConditionHandle that is signalled.
+        '''
+        affected = set()
+        unvisited = [self[resource_name]]
+        while unvisited:
+            rsrc = unvisited.pop()
+            if rsrc.name not in affected:
+                affected.add(rsrc.name)
+                unvisited.extend(self.dependencies.required_by(rsrc))
+
+        return [res for res in self.dependencies
+                if res.name != resource_name and
+                any(dep.name in affected
+                    for dep in res.t.metadata_dependencies())]
 
     @staticmethod
     def _get_dependencies(resources):
@@ -343,8 +516,14 @@ class Stack(collections.Mapping):
 
     @classmethod
     def load(cls, context, stack_id=None, stack=None, show_deleted=True,
-             use_stored_context=False, force_reload=False, cache_data=None):
-        '''Retrieve a Stack from the database.'''
+             use_stored_context=False, force_reload=False, cache_data=None,
+             template=None):
+        '''
+        Retrieve a Stack from the database.
+
+        If the stack's Template has already been loaded it may be passed as
+        template, in which case it is not loaded from the database again.
+        '''
         if stack is None:
             stack = stack_object.Stack.get_by_id(
                 context,
@@ -360,7 +539,7 @@ class Stack(collections.Mapping):
 
         return cls._from_db(context, stack,
                             use_stored_context=use_stored_context,
-                            cache_data=cache_data)
+                            cache_data=cache_data, template=template)
 
     @classmethod
     def load_all(cls, context, limit=None, marker=None, sort_keys=None,
@@ -388,9 +567,10 @@ class Stack(collections.Mapping):
 
     @classmethod
     def _from_db(cls, context, stack, resolve_data=True,
-                 use_stored_context=False, cache_data=None):
-        template = tmpl.Template.load(
-            context, stack.raw_template_id, stack.raw_template)
+                 use_stored_context=False, cache_data=None, template=None):
+        if template is None:
+            template = tmpl.Template.load(
+                context, stack.raw_template_id, stack.raw_template)
         tags = None
         if stack.tags:
             tags = [t.tag for t in stack.tags]
@@ -530,6 +710,7 @@ class Stack(collections.Mapping):
         resource.t = definition
         resource.reparse()
         self.resources[resource.name] = resource
+        self._dep_attrs = None
         self.t.add_resource(definition)
         if self.t.id is not None:
             self.t.store(self.context)
@@ -539,6 +720,7 @@ class Stack(collections.Mapping):
     def remove_resource(self, resource_name):
         '''Remove the resource with the specified name.'''
         del self.resources[resource_name]
+        self._dep_attrs = None
         self.t.remove_resource(resource_name)
         if self.t.id is not None:
             self.t.store(self.context)
@@ -631,9 +813,32 @@ class Stack(collections.Mapping):
             raise exception.StackValidationFailed(
                 message=_("Duplicate names %s") % dup_names)
 
-        for res in self.dependencies:
+        # Validate the resources that allow it concurrently, but report the
+        # first error in dependency order so that the result does not depend
+        # on timing.
+        ordered = list(self.dependencies)
+        results = {}
+
+        def validate_resource(res):
+            try:
+                results[res.name] = (res.validate(), None)
+            except Exception:
+                results[res.name] = (None, sys.exc_info())
+
+        with constraints.validation_pass(self.context):
+            pool = eventlet.GreenPool(cfg.CONF.max_concurrent_validations)
+            for res in ordered:
+                if res.concurrent_validation:
+                    pool.spawn_n(validate_resource, res)
+                else:
+                    validate_resource(res)
+            pool.waitall()
+
+        for res in ordered:
+            result, exc_info = results[res.name]
             try:
-                result = res.validate()
+                if exc_info is not None:
+                    six.reraise(*exc_info)
             except exception.HeatException as ex:
                 LOG.debug('%s', ex)
                 raise ex
@@ -688,7 +893,7 @@ class Stack(collections.Mapping):
                          self.id, {},
                          self.name, 'OS::Heat::Stack')
 
-        ev.store()
+        ev.store(defer=True)
 
     @profiler.trace('Stack.state_set', hide_args=False)
     def state_set(self, action, status, reason):
@@ -710,6 +915,10 @@ class Stack(collections.Mapping):
         if stack is not None:
             notification.send(self)
             self._add_event(action, status, reason)
+            if status != self.IN_PROGRESS:
+                # Make sure all of the events for the action are visible
+                # before it is reported as finished
+                event.writer.flush(self.id, self.context)
             LOG.info(_LI('Stack %(action)s %(status)s (%(name)s): '
                          '%(reason)s'),
                      {'action': action,
@@ -948,6 +1157,7 @@ class Stack(collections.Mapping):
             self.prev_raw_template_id = getattr(self.t, 'id', None)
 
         self.t = template
+        self._dep_attrs = None
         previous_traversal = self.current_traversal
         self.current_traversal = uuidutils.generate_uuid()
         self.updated_time = datetime.datetime.utcnow()
@@ -986,14 +1196,11 @@ class Stack(collections.Mapping):
         LOG.info(_LI('convergence_dependencies: %s'),
                  self.convergence_dependencies)
 
-        # create sync_points for resources in DB
-        for rsrc_id, is_update in self.convergence_dependencies:
-            sync_point.create(self.context, rsrc_id,
-                              self.current_traversal, is_update,
-                              self.id)
-        # create sync_point entry for stack
-        sync_point.create(
-            self.context, self.id, self.current_traversal, True, self.id)
+        # create sync_points for resources in DB, plus an entry for the stack
+        entities = list(self.convergence_dependencies)
+        entities.append((self.id, True))
+        sync_point.create_many(self.context, self.current_traversal,
+                               self.id, entities)
 
         leaves = set(self.convergence_dependencies.leaves())
         if not any(leaves):
@@ -1021,24 +1228,34 @@ class Stack(collections.Mapping):
 
         self.converge_stack(rollback_tmpl, action=self.ROLLBACK)
 
-    def _get_best_existing_rsrc_db(self, rsrc_name):
-        candidate = None
+    def _get_best_existing_rsrcs_db(self):
+        '''
+        Return a dict mapping resource names to the best existing resource in
+        the database to use for each of them, indexing all of the existing
+        resources in a single pass.
+        '''
+        candidates = {}
         if self.ext_rsrcs_db:
+            current = set()
             for id, ext_rsrc in self.ext_rsrcs_db.items():
-                if ext_rsrc.name != rsrc_name:
+                if ext_rsrc.name in current:
                     continue
                 if ext_rsrc.current_template_id == self.t.id:
                     # Rollback where the previous resource still exists
-                    candidate = ext_rsrc
-                    break
+                    candidates[ext_rsrc.name] = ext_rsrc
+                    current.add(ext_rsrc.name)
                 elif (ext_rsrc.current_template_id ==
                         self.prev_raw_template_id):
                     # Current resource is otherwise a good candidate
-                    candidate = ext_rsrc
-        return candidate
+                    candidates[ext_rsrc.name] = ext_rsrc
+        return candidates
+
+    def _get_best_existing_rsrc_db(self, rsrc_name):
+        return self._get_best_existing_rsrcs_db().get(rsrc_name)
 
     def _update_or_store_resources(self):
         self.ext_rsrcs_db = self._db_resources_get(key_id=True)
+        best_existing_rsrcs_db = self._get_best_existing_rsrcs_db()
 
         curr_name_translated_dep = self.dependencies.translate(lambda res:
                                                                res.name)
@@ -1053,19 +1270,22 @@ class Stack(collections.Mapping):
             needed_by = old_requirers | new_requirers
             res.needed_by = list(needed_by)
 
-        for rsrc in reversed(self.dependencies):
-            existing_rsrc_db = self._get_best_existing_rsrc_db(rsrc.name)
-            if existing_rsrc_db is None:
-                update_needed_by(rsrc)
-                rsrc.current_template_id = self.t.id
-                rsrc._store()
-                rsrcs[rsrc.name] = rsrc
-            else:
-                update_needed_by(existing_rsrc_db)
-                resource.Resource.set_needed_by(
-                    existing_rsrc_db, existing_rsrc_db.needed_by
-                )
-                rsrcs[existing_rsrc_db.name] = existing_rsrc_db
+        # Store all of the resources in a single transaction, rather than
+        # committing once per resource.
+        with db_api.transaction(self.context):
+            for rsrc in reversed(self.dependencies):
+                existing_rsrc_db = best_existing_rsrcs_db.get(rsrc.name)
+                if existing_rsrc_db is None:
+                    update_needed_by(rsrc)
+                    rsrc.current_template_id = self.t.id
+                    rsrc._store()
+                    rsrcs[rsrc.name] = rsrc
+                else:
+                    update_needed_by(existing_rsrc_db)
+                    resource.Resource.set_needed_by(
+                        existing_rsrc_db, existing_rsrc_db.needed_by
+                    )
+                    rsrcs[existing_rsrc_db.name] = existing_rsrc_db
         return rsrcs
 
     def _compute_convg_dependencies(self, existing_resources,
@@ -1189,6 +1409,7 @@ class Stack(collections.Mapping):
             self.t = newstack.t
             template_outputs = self.t[self.t.OUTPUTS]
             self.outputs = self.resolve_static_data(template_outputs)
+            self._dep_attrs = None
 
         # Don't use state_set to do only one update query and avoid race
         # condition with the COMPLETE status
@@ -1312,6 +1533,7 @@ class Stack(collections.Mapping):
                                   six.text_type(ex))
 
             # Delete the stored credentials
+            stored_creds_cache().pop(self.user_creds_id)
             try:
                 ucreds_object.UserCreds.delete(self.context,
                                                self.user_creds_id)
@@ -1527,6 +1749,52 @@ class Stack(collections.Mapping):
                                        action=self.RESTORE)
         updater()
 
+    def prefetch_attributes(self, dep_attrs):
+        '''
+        Resolve a number of resource attributes in bulk.
+
+        dep_attrs is an iterable of (resource name, attribute name) pairs. The
+        attributes of each resource are resolved together, and resources that
+        allow it are resolved concurrently, so that later lookups of the
+        attributes are answered from the values cached on each resource.
+        '''
+        rsrc_attrs = collections.defaultdict(set)
+        for res_name, attr_name in dep_attrs:
+            if res_name in self and not self.has_cache_data(res_name):
+                rsrc_attrs[res_name].add(attr_name)
+
+        pool = None
+        for res_name, attr_names in six.iteritems(rsrc_attrs):
+            res = self[res_name]
+            if res.concurrent_attribute_lookups:
+                if pool is None:
+                    pool = eventlet.GreenPool(
+                        cfg.CONF.max_concurrent_attribute_lookups)
+                pool.spawn_n(res.resolve_attributes, attr_names)
+            else:
+                res.resolve_attributes(attr_names)
+
+        if pool is not None:
+            pool.waitall()
+
+    def prefetch_output_attributes(self, keys=None):
+        '''
+        Resolve in bulk the resource attributes referred to by the specified
+        stack outputs, or by all of the outputs if none are specified.
+        '''
+        dep_attrs = []
+        for key in (self.outputs if keys is None else keys):
+            if key not in self.outputs:
+                continue
+            try:
+                dep_attrs.extend(function.all_dep_attrs(
+                    self.outputs[key].get('Value')))
+            except Exception:
+                # Any error is reported when the output itself is resolved
+                continue
+
+        self.prefetch_attributes(dep_attrs)
+
     @profiler.trace('Stack.output', hide_args=False)
     def output(self, key):
         '''
@@ -1615,11 +1883,12 @@ class Stack(collections.Mapping):
 
     def reset_resource_attributes(self):
         # nothing is cached if no resources exist
-        if not self._resources:
+        loaded = self._resources or self._single_resources
+        if not loaded:
             return
         # a change in some resource may have side-effects in the attributes
         # of other resources, so ensure that attributes are re-calculated
-        for res in six.itervalues(self.resources):
+        for res in six.itervalues(loaded):
             res.attributes.reset_resolved_values()
 
     def has_cache_data(self, resource_name):
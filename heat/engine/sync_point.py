@@ -12,14 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+
+from oslo_config import cfg
 from oslo_log import log as logging
 import six
 
 from heat.common.i18n import _
 from heat.objects import sync_point as sync_point_object
 
+cfg.CONF.import_opt('sync_point_storage', 'heat.common.config')
+
 LOG = logging.getLogger(__name__)
 
+# Number of compare-and-swap retries when updating sync points in
+# single_row mode, and of claims lost to a concurrent predecessor in
+# append_only mode.
+stats = collections.Counter()
+
 
 KEY_SEPERATOR = ':'
 
@@ -43,6 +53,18 @@ def create(context, entity_id, traversal_id, is_update, stack_id):
     return sync_point_object.SyncPoint.create(context, values)
 
 
+def create_many(context, traversal_id, stack_id, entities):
+    """
+    Creates sync point entries in DB for all the given (entity_id, is_update)
+    pairs using a single transaction.
+    """
+    values_list = [{'entity_id': entity_id, 'traversal_id': traversal_id,
+                    'is_update': is_update, 'atomic_key': 0,
+                    'stack_id': stack_id, 'input_data': {}}
+                   for entity_id, is_update in entities]
+    sync_point_object.SyncPoint.create_many(context, values_list)
+
+
 def get(context, entity_id, traversal_id, is_update):
     """
     Retrieves a sync point entry from DB.
@@ -87,13 +109,40 @@ def serialize_input_data(input_data):
     return {'input_data': [[list(i), j] for i, j in six.iteritems(input_data)]}
 
 
-def sync(cnxt, entity_id, current_traversal, is_update, propagate,
-         predecessors, new_data):
+def add_input(context, entity_id, current_traversal, is_update, stack_id,
+              sender, data):
+    """
+    Records the input from a single predecessor in its own DB row.
+
+    Returns False if input from the same predecessor was already recorded.
+    """
+    values = {'entity_id': entity_id, 'traversal_id': current_traversal,
+              'is_update': is_update, 'stack_id': stack_id,
+              'sender': make_key(*sender),
+              'input_data': serialize_input_data({sender: data})}
+    return sync_point_object.SyncPoint.add_input(context, values)
+
+
+def get_inputs(context, entity_id, current_traversal, is_update):
+    """
+    Retrieves the input recorded by all predecessors of a sync point.
+    """
+    inputs = sync_point_object.SyncPoint.get_inputs(context, entity_id,
+                                                    current_traversal,
+                                                    is_update)
+    input_data = {}
+    for sp_input in inputs:
+        input_data.update(deserialize_input_data(sp_input.input_data))
+    return input_data
+
+
+def _sync_single_row(cnxt, entity_id, current_traversal, is_update,
+                     new_data):
     rows_updated = None
-    sync_point = None
     input_data = None
+    retries = -1
     while not rows_updated:
-        # TODO(sirushtim): Add a conf option to add no. of retries
+        retries += 1
         sync_point = get(cnxt, entity_id, current_traversal, is_update)
         input_data = dict(deserialize_input_data(sync_point.input_data))
         input_data.update(new_data)
@@ -101,8 +150,64 @@ def sync(cnxt, entity_id, current_traversal, is_update, propagate,
             cnxt, entity_id, current_traversal, is_update,
             sync_point.atomic_key, serialize_input_data(input_data))
 
-    waiting = predecessors - set(input_data)
+    if retries:
+        stats['retries'] += retries
+        LOG.debug('[%s] Updated sync point after %d retries',
+                  make_key(entity_id, current_traversal, is_update),
+                  retries)
+    return input_data
+
+
+def _sync_append_only(cnxt, entity_id, current_traversal, is_update,
+                      predecessors, new_data):
+    sync_point = get(cnxt, entity_id, current_traversal, is_update)
+    recorded = False
+    for sender, data in six.iteritems(new_data):
+        if add_input(cnxt, entity_id, current_traversal, is_update,
+                     sync_point.stack_id, sender, data):
+            recorded = True
+
+    if not recorded:
+        # A repeated notification. The call that first recorded the input
+        # is the one responsible for claiming the sync point.
+        return False, new_data
+
+    count = sync_point_object.SyncPoint.count_inputs(
+        cnxt, entity_id, current_traversal, is_update)
+    if count < len(predecessors):
+        return None, new_data
+
+    input_data = get_inputs(cnxt, entity_id, current_traversal, is_update)
+    if predecessors - set(input_data):
+        return None, input_data
+
+    # Every predecessor has reported in, but several of them may have seen
+    # that at the same time. Only the one that manages to update the sync
+    # point row from the value it originally read gets to propagate.
+    rows_updated = update_input_data(
+        cnxt, entity_id, current_traversal, is_update,
+        sync_point.atomic_key, serialize_input_data(input_data))
+    if not rows_updated:
+        stats['lost_claims'] += 1
+    return bool(rows_updated), input_data
+
+
+def sync(cnxt, entity_id, current_traversal, is_update, propagate,
+         predecessors, new_data):
     key = make_key(entity_id, current_traversal, is_update)
+    if cfg.CONF.sync_point_storage == 'append_only':
+        ready, input_data = _sync_append_only(cnxt, entity_id,
+                                              current_traversal, is_update,
+                                              predecessors, new_data)
+        if ready is False:
+            LOG.debug('[%s] Not propagating %s: already handled', key,
+                      entity_id)
+            return
+    else:
+        input_data = _sync_single_row(cnxt, entity_id, current_traversal,
+                                      is_update, new_data)
+
+    waiting = predecessors - set(input_data)
     if waiting:
         LOG.debug('[%s] Waiting %s: Got %s; still need %s',
                   key, entity_id, _dump_list(input_data), _dump_list(waiting))
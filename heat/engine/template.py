@@ -17,21 +17,26 @@ import copy
 import functools
 import hashlib
 
+from oslo_config import cfg
 from oslo_log import log as logging
 import six
 from stevedore import extension
 
 from heat.common import exception
 from heat.common.i18n import _
+from heat.common import lru_cache
 from heat.engine import environment
 from heat.objects import raw_template as template_object
 
+cfg.CONF.import_opt('max_cached_templates', 'heat.common.config')
+
 LOG = logging.getLogger(__name__)
 
 __all__ = ['Template']
 
 
 _template_classes = None
+_parsed_templates = None
 
 
 def get_version(template_data, available_versions):
@@ -67,6 +72,15 @@ class TemplatePluginNotRegistered(exception.HeatException):
     msg_fmt = _("Could not load %(name)s: %(error)s")
 
 
+def _load_template_classes():
+    global _template_classes
+
+    if _template_classes is None:
+        mgr = _get_template_extension_manager()
+        _template_classes = dict((tuple(name.split('.')), mgr[name].plugin)
+                                 for name in mgr.names())
+
+
 def get_template_class(template_data):
     available_versions = list(six.iterkeys(_template_classes))
     version = get_version(template_data, available_versions)
@@ -89,17 +103,44 @@ def get_template_class(template_data):
         raise exception.InvalidTemplateVersion(explanation=explanation)
 
 
+def get_description(template_data):
+    '''Return the description of a template without creating a Template.'''
+    _load_template_classes()
+    TemplateClass = get_template_class(template_data)
+    return template_data.get(TemplateClass.DESCRIPTION) or 'No description'
+
+
+def parsed_template_cache():
+    '''Return the cache of parsed templates shared by this engine process.'''
+    global _parsed_templates
+
+    if _parsed_templates is None:
+        _parsed_templates = lru_cache.LRUCache(cfg.CONF.max_cached_templates)
+    return _parsed_templates
+
+
+class ParsedTemplate(object):
+    '''
+    The parsed state of a template that depends only on its content.
+
+    A ParsedTemplate is shared by every Template loaded from stored content
+    with the same digest, so the data it holds must never be modified. It is
+    filled in lazily, the first time each piece of state is needed.
+    '''
+
+    def __init__(self, template_class, version):
+        self.template_class = template_class
+        self.version = version
+        self.sections = {}
+        self.validated = False
+
+
 class Template(collections.Mapping):
     '''A stack template.'''
 
     def __new__(cls, template, *args, **kwargs):
         '''Create a new Template of the appropriate class.'''
-        global _template_classes
-
-        if _template_classes is None:
-            mgr = _get_template_extension_manager()
-            _template_classes = dict((tuple(name.split('.')), mgr[name].plugin)
-                                     for name in mgr.names())
+        _load_template_classes()
 
         if cls != Template:
             TemplateClass = cls
@@ -121,6 +162,7 @@ class Template(collections.Mapping):
         self.version = get_version(self.t,
                                    list(six.iterkeys(_template_classes)))
         self.t_digest = None
+        self._parsed = None
 
     def __deepcopy__(self, memo):
         return Template(copy.deepcopy(self.t, memo), files=self.files,
@@ -132,7 +174,26 @@ class Template(collections.Mapping):
         if t is None:
             t = template_object.RawTemplate.get_by_id(context, template_id)
         env = environment.Environment(t.environment)
-        return cls(t.template, template_id=template_id, files=t.files, env=env)
+
+        # The blob ID is a digest of the template content, so the parsed
+        # state may be shared with every other template having that content.
+        digest = t.template_blob_id
+        if digest is None:
+            return cls(t.template, template_id=template_id, files=t.files,
+                       env=env)
+
+        cache = parsed_template_cache()
+        parsed = cache.get(digest)
+        if parsed is None or not issubclass(parsed.template_class, cls):
+            tmpl = cls(t.template, template_id=template_id, files=t.files,
+                       env=env)
+            parsed = ParsedTemplate(type(tmpl), tmpl.version)
+            cache.put(digest, parsed)
+        else:
+            tmpl = parsed.template_class(t.template, template_id=template_id,
+                                         files=t.files, env=env)
+        tmpl._parsed = parsed
+        return tmpl
 
     def store(self, context=None):
         '''Store the Template in the database and return its ID.'''
@@ -216,8 +277,27 @@ class Template(collections.Mapping):
 
     def remove_resource(self, name):
         '''Remove a resource from the template.'''
+        self._parsed = None
         self.t.get(self.RESOURCES, {}).pop(name)
 
+    def _parsed_section(self, section, translate):
+        '''
+        Return a section of the template, as translated by a function.
+
+        When the template content is unmodified since it was loaded, the
+        translation is shared with other templates having the same content.
+        It must therefore be treated as read-only by the caller.
+        '''
+        if self._parsed is None:
+            return translate(self.t.get(section))
+
+        try:
+            return self._parsed.sections[section]
+        except KeyError:
+            data = translate(copy.deepcopy(self.t.get(section)))
+            self._parsed.sections[section] = data
+            return data
+
     def parse(self, stack, snippet):
         return parse(self.functions, stack, snippet)
 
@@ -230,6 +310,9 @@ class Template(collections.Mapping):
         sections (e.g. parameters are check by parameters schema class).
 
         '''
+        if self._parsed is not None and self._parsed.validated:
+            return
+
         t_digest = hashlib.sha256(
             six.text_type(self.t).encode('utf-8')).hexdigest()
 
@@ -261,6 +344,8 @@ class Template(collections.Mapping):
                             'Found a [%s] instead') % type(res)
                 raise exception.StackValidationFailed(message=message)
         self.t_digest = t_digest
+        if self._parsed is not None:
+            self._parsed.validated = True
 
     @classmethod
     def create_empty_template(cls,
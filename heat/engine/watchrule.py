@@ -70,7 +70,9 @@ class WatchRule(object):
             period = int(rule['period'])
         self.timeperiod = datetime.timedelta(seconds=period)
         self.id = wid
-        self.watch_data = watch_data or []
+        # When no samples are supplied, those within the period are read from
+        # the database as the rule is evaluated
+        self.watch_data = watch_data
         self.last_evaluated = last_evaluated
 
     @classmethod
@@ -94,7 +96,6 @@ class WatchRule(object):
                        stack_id=watch.stack_id,
                        state=watch.state,
                        wid=watch.id,
-                       watch_data=watch.watch_data,
                        last_evaluated=watch.last_evaluated)
 
     def store(self):
@@ -137,124 +138,125 @@ class WatchRule(object):
         else:
             return False
 
-    def do_Maximum(self):
-        data = 0
-        have_data = False
-        for d in self.watch_data:
-            if d.created_at < self.now - self.timeperiod:
-                continue
-            if not have_data:
-                data = float(d.data[self.rule['MetricName']]['Value'])
-                have_data = True
-            if float(d.data[self.rule['MetricName']]['Value']) > data:
-                data = float(d.data[self.rule['MetricName']]['Value'])
+    def _window_values(self):
+        '''
+        Return an iterator over the metric values sampled within the period.
 
-        if not have_data:
-            return self.NODATA
+        Unless the samples were supplied when the rule was created, only those
+        within the period are read from the database.
+        '''
+        since = self.now - self.timeperiod
+        if self.watch_data is None:
+            samples = watch_data_objects.WatchData.get_by_rule_since(
+                self.context, self.id, since)
+        else:
+            samples = (d for d in self.watch_data if d.created_at >= since)
+        metric = self.rule['MetricName']
+        return (float(d.data[metric]['Value']) for d in samples)
 
+    def _cmp_state(self, data):
         if self.do_data_cmp(data,
                             float(self.rule['Threshold'])):
             return self.ALARM
         else:
             return self.NORMAL
 
+    def do_Maximum(self):
+        data = None
+        for value in self._window_values():
+            if data is None or value > data:
+                data = value
+
+        if data is None:
+            return self.NODATA
+
+        return self._cmp_state(data)
+
     def do_Minimum(self):
-        data = 0
-        have_data = False
-        for d in self.watch_data:
-            if d.created_at < self.now - self.timeperiod:
-                continue
-            if not have_data:
-                data = float(d.data[self.rule['MetricName']]['Value'])
-                have_data = True
-            elif float(d.data[self.rule['MetricName']]['Value']) < data:
-                data = float(d.data[self.rule['MetricName']]['Value'])
+        data = None
+        for value in self._window_values():
+            if data is None or value < data:
+                data = value
 
-        if not have_data:
+        if data is None:
             return self.NODATA
 
-        if self.do_data_cmp(data,
-                            float(self.rule['Threshold'])):
-            return self.ALARM
-        else:
-            return self.NORMAL
+        return self._cmp_state(data)
 
     def do_SampleCount(self):
         '''
         count all samples within the specified period
         '''
-        data = 0
-        for d in self.watch_data:
-            if d.created_at < self.now - self.timeperiod:
-                continue
-            data = data + 1
+        data = sum(1 for value in self._window_values())
 
-        if self.do_data_cmp(data,
-                            float(self.rule['Threshold'])):
-            return self.ALARM
-        else:
-            return self.NORMAL
+        return self._cmp_state(data)
 
     def do_Average(self):
         data = 0
         samples = 0
-        for d in self.watch_data:
-            if d.created_at < self.now - self.timeperiod:
-                continue
+        for value in self._window_values():
             samples = samples + 1
-            data = data + float(d.data[self.rule['MetricName']]['Value'])
+            data = data + value
 
         if samples == 0:
             return self.NODATA
 
         data = data / samples
-        if self.do_data_cmp(data,
-                            float(self.rule['Threshold'])):
-            return self.ALARM
-        else:
-            return self.NORMAL
+        return self._cmp_state(data)
 
     def do_Sum(self):
-        data = 0
-        for d in self.watch_data:
-            if d.created_at < self.now - self.timeperiod:
-                LOG.debug('ignoring %s' % str(d.data))
-                continue
-            data = data + float(d.data[self.rule['MetricName']]['Value'])
+        data = sum(self._window_values())
 
-        if self.do_data_cmp(data,
-                            float(self.rule['Threshold'])):
-            return self.ALARM
-        else:
-            return self.NORMAL
+        return self._cmp_state(data)
 
     def get_alarm_state(self):
         fn = getattr(self, 'do_%s' % self.rule['Statistic'])
         return fn()
 
-    def evaluate(self):
+    def evaluate(self, use_stored_context=False):
+        '''
+        Evaluate the rule if its period has elapsed, and return the actions
+        for any change of state.
+
+        If use_stored_context is set, the stack is loaded with its stored
+        context to find the actions. It is only loaded if there is an action
+        for the new state.
+        '''
         if self.state in [self.CEILOMETER_CONTROLLED, self.SUSPENDED]:
             return []
         # has enough time progressed to run the rule
         self.now = timeutils.utcnow()
         if self.now < (self.last_evaluated + self.timeperiod):
             return []
-        return self.run_rule()
+        return self.run_rule(use_stored_context)
 
     def get_details(self):
         return {'alarm': self.name,
                 'state': self.state}
 
-    def run_rule(self):
+    def run_rule(self, use_stored_context=False):
         new_state = self.get_alarm_state()
-        actions = self.rule_actions(new_state)
+        actions = self.rule_actions(new_state, use_stored_context)
         self.state = new_state
 
         self.last_evaluated = self.now
         self.store()
+        self.prune_watch_data()
         return actions
 
-    def rule_actions(self, new_state):
+    def prune_watch_data(self):
+        '''
+        Delete the stored samples that are too old to affect the rule.
+        '''
+        if self.id is None or not self.timeperiod:
+            return
+        pruned = watch_data_objects.WatchData.delete_by_rule_before(
+            self.context, self.id, self.now - self.timeperiod)
+        if pruned:
+            LOG.debug('Pruned %(count)s samples from watch %(name)s' %
+                      {'count': pruned, 'name': self.name})
+
+    def rule_actions(self, new_state, use_stored_context=False):
         LOG.info(_LI('WATCH: stack:%(stack)s, watch_name:%(watch_name)s, '
                      'new_state:%(new_state)s'), {'stack': self.stack_id,
                                                   'watch_name': self.name,
@@ -263,11 +265,15 @@ class WatchRule(object):
         if self.ACTION_MAP[new_state] not in self.rule:
             LOG.info(_LI('no action for new state %s'), new_state)
         else:
+            # Require tenant_safe=False when using the stored context, as
+            # the rule is then evaluated with an admin context
             s = stack_object.Stack.get_by_id(
                 self.context,
                 self.stack_id,
+                tenant_safe=not use_stored_context,
                 eager_load=True)
-            stk = stack.Stack.load(self.context, stack=s)
+            stk = stack.Stack.load(self.context, stack=s,
+                                   use_stored_context=use_stored_context)
             if (stk.action != stk.DELETE
                     and stk.status == stk.COMPLETE):
                 for refid in self.rule[self.ACTION_MAP[new_state]]:
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from oslo_config import cfg
 from oslo_log import log as logging
 import oslo_messaging
 from oslo_service import service
@@ -23,18 +24,85 @@ from heat.common import context
 from heat.common import exception
 from heat.common.i18n import _LE
 from heat.common.i18n import _LI
+from heat.common import lru_cache
 from heat.common import messaging as rpc_messaging
 from heat.engine import resource
 from heat.engine import scheduler
 from heat.engine import stack as parser
 from heat.engine import sync_point
+from heat.engine import template as templatem
 from heat.objects import resource as resource_objects
 from heat.rpc import listener_client
 from heat.rpc import worker_client as rpc_client
 
+cfg.CONF.import_opt('max_cached_traversals', 'heat.common.config')
+
 LOG = logging.getLogger(__name__)
 
 
+class TraversalState(object):
+    '''
+    Parsed state of a stack that does not change during a traversal.
+
+    The template is loaded from the database only once, and the convergence
+    dependency graph and the index of dependent attributes are calculated
+    the first time that they are needed.
+    '''
+
+    def __init__(self, template):
+        self.template = template
+        self._convg_deps = None
+        self._dep_attrs = None
+
+    def convergence_dependencies(self, stack):
+        if self._convg_deps is None:
+            self._convg_deps = stack.convergence_dependencies
+        return self._convg_deps
+
+    def dependent_attrs(self, stack, resource_name):
+        if self._dep_attrs is None:
+            self._dep_attrs = stack.dependent_attrs_index()
+        return self._dep_attrs.get(resource_name, set())
+
+
+class TraversalCache(object):
+    '''
+    A cache of the TraversalState of the stacks being processed by a worker.
+
+    Entries are keyed by (stack_id, traversal_id, template_id). The least
+    recently used entries are evicted once the cache is full, and all of the
+    entries for a stack are dropped as soon as a new traversal of it starts.
+    '''
+
+    def __init__(self, maxsize):
+        self._cache = lru_cache.LRUCache(maxsize)
+
+    def _get(self, stack_id, traversal_id, template_id, load):
+        key = (stack_id, traversal_id, template_id)
+        state = self._cache.get(key)
+        if state is None:
+            self._cache.evict(lambda k: (k[0] == stack_id and
+                                         k[1] != traversal_id))
+            state = TraversalState(load())
+            self._cache.put(key, state)
+        return state
+
+    def load_template(self, context, stack_id, traversal_id, template_id,
+                      t=None):
+        def load():
+            return templatem.Template.load(context, template_id, t)
+
+        return self._get(stack_id, traversal_id, template_id,
+                         load).template
+
+    def get_state(self, stack):
+        return self._get(stack.id, stack.current_traversal, stack.t.id,
+                         lambda: stack.t)
+
+    def invalidate(self, stack_id):
+        self._cache.evict(lambda k: k[0] == stack_id)
+
+
 @profiler.trace_cls("rpc")
 class WorkerService(service.Service):
     """
@@ -61,6 +129,7 @@ class WorkerService(service.Service):
         self._rpc_client = rpc_client.WorkerClient()
         self._rpc_server = None
         self.target = None
+        self._traversal_cache = TraversalCache(cfg.CONF.max_cached_traversals)
 
     def start(self):
         target = oslo_messaging.Target(
@@ -109,6 +178,7 @@ class WorkerService(service.Service):
         stack.rollback()
 
     def _handle_failure(self, cnxt, stack, failure_reason):
+        self._traversal_cache.invalidate(stack.id)
         stack.state_set(stack.action, stack.FAILED, failure_reason)
 
         if (not stack.disable_rollback and
@@ -142,7 +212,8 @@ class WorkerService(service.Service):
         rsrc, stack = None, None
         try:
             rsrc, stack = resource.Resource.load(cnxt, resource_id, is_update,
-                                                 cache_data)
+                                                 cache_data,
+                                                 self._traversal_cache)
         except (exception.ResourceNotFound, exception.NotFound):
             pass  # can be ignored
 
@@ -213,7 +284,8 @@ class WorkerService(service.Service):
     def _initiate_propagate_resource(self, cnxt, resource_id,
                                      current_traversal, is_update, rsrc,
                                      stack):
-        deps = stack.convergence_dependencies
+        state = self._traversal_cache.get_state(stack)
+        deps = state.convergence_dependencies(stack)
         graph = deps.graph()
         graph_key = (resource_id, is_update)
 
@@ -228,7 +300,8 @@ class WorkerService(service.Service):
 
         def _get_input_data(req, fwd):
             if fwd:
-                return construct_input_data(rsrc)
+                return construct_input_data(
+                    rsrc, state.dependent_attrs(stack, rsrc.name))
             else:
                 # Don't send data if initiating clean-up for self i.e.
                 # initiating delete of a replaced resource
@@ -307,11 +380,9 @@ class WorkerService(service.Service):
                                               rsrc, stack)
 
 
-def construct_input_data(rsrc):
-    attributes = rsrc.stack.get_dep_attrs(
-        six.itervalues(rsrc.stack.resources),
-        rsrc.stack.outputs,
-        rsrc.name)
+def construct_input_data(rsrc, attributes=None):
+    if attributes is None:
+        attributes = rsrc.stack.dependent_attrs(rsrc.name)
     resolved_attributes = {}
     for attr in attributes:
         try:
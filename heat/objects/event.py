@@ -35,6 +35,7 @@ class Event(base.VersionedObject, base.VersionedObjectDictCompat):
         'resource_status_reason': fields.StringField(nullable=True),
         'resource_type': fields.StringField(nullable=True),
         'resource_properties': heat_fields.JsonField(nullable=True),
+        'rsrc_prop_data_id': fields.StringField(nullable=True),
         'created_at': fields.DateTimeField(read_only=True),
         'updated_at': fields.DateTimeField(nullable=True),
     }
@@ -78,3 +79,13 @@ class Event(base.VersionedObject, base.VersionedObjectDictCompat):
     def create(cls, context, values):
         return cls._from_db_object(context, cls(),
                                    db_api.event_create(context, values))
+
+    @classmethod
+    def create_many(cls, context, values_list):
+        return [cls._from_db_object(context, cls(), db_event)
+                for db_event in db_api.event_create_many(context,
+                                                         values_list)]
+
+    @classmethod
+    def prune_by_stack(cls, context, stack_id, limit):
+        return db_api.event_prune_by_stack(context, stack_id, limit)
@@ -39,6 +39,7 @@ class RawTemplate(
         'files': heat_fields.JsonField(nullable=True),
         'template': heat_fields.JsonField(),
         'environment': heat_fields.JsonField(),
+        'template_blob_id': fields.StringField(nullable=True),
     }
 
     @staticmethod
@@ -69,6 +70,10 @@ class RawTemplate(
         raw_template_db = db_api.raw_template_get(context, template_id)
         return cls._from_db_object(context, cls(), raw_template_db)
 
+    @classmethod
+    def get_templates(cls, context, template_ids):
+        return db_api.raw_template_get_templates(context, template_ids)
+
     @classmethod
     def encrypt_hidden_parameters(cls, tmpl):
         if cfg.CONF.encrypt_parameters_and_properties:
@@ -128,6 +128,16 @@ class Resource(
             resource_id1,
             resource_id2)
 
+    @classmethod
+    def get_all_by_stack_ids(cls, context, stack_ids):
+        resources_db = db_api.resource_get_all_by_stack_ids(context,
+                                                            stack_ids)
+        return dict(
+            (stack_id, dict(
+                (name, cls._from_db_object(cls(context), context, res_db))
+                for name, res_db in six.iteritems(stack_resources)))
+            for stack_id, stack_resources in six.iteritems(resources_db))
+
     @classmethod
     def get_all_by_stack(cls, context, stack_id, key_id=False):
         resources_db = db_api.resource_get_all_by_stack(context,
@@ -0,0 +1,101 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+"""
+ResourcePropertiesData object
+"""
+
+import hashlib
+import hmac
+
+from oslo_config import cfg
+from oslo_serialization import jsonutils
+from oslo_versionedobjects import base
+from oslo_versionedobjects import fields
+
+from heat.common import crypt
+from heat.db import api as db_api
+from heat.objects import fields as heat_fields
+from heat.objects import resource
+
+cfg.CONF.import_opt('encrypt_parameters_and_properties', 'heat.common.config')
+
+
+class ResourcePropertiesData(
+    base.VersionedObject,
+    base.VersionedObjectDictCompat,
+    base.ComparableVersionedObject,
+):
+    fields = {
+        'id': fields.StringField(),
+        'data': heat_fields.JsonField(nullable=True),
+        'encrypted': fields.BooleanField(nullable=True),
+        'created_at': fields.DateTimeField(read_only=True),
+        'updated_at': fields.DateTimeField(nullable=True),
+    }
+
+    @staticmethod
+    def _from_db_object(context, prop_data, db_prop_data):
+        for field in prop_data.fields:
+            prop_data[field] = db_prop_data[field]
+
+        if prop_data.encrypted and prop_data.data:
+            data = {}
+            for prop_name, prop_value in prop_data.data.items():
+                method, value = prop_value
+                decrypted_value = crypt.decrypt(method, value)
+                data[prop_name] = jsonutils.loads(decrypted_value)
+            prop_data.data = data
+
+        prop_data._context = context
+        prop_data.obj_reset_changes()
+        return prop_data
+
+    @staticmethod
+    def digest(data):
+        '''
+        Return the ID under which a set of properties data is stored.
+
+        When properties are encrypted in the database, the digest is keyed so
+        that it does not reveal anything about the plain text.
+        '''
+        content = jsonutils.dumps(data, sort_keys=True).encode('utf-8')
+        if cfg.CONF.encrypt_parameters_and_properties:
+            key = cfg.CONF.auth_encryption_key.encode('utf-8')
+            return hmac.new(key, content, hashlib.sha256).hexdigest()
+        return hashlib.sha256(content).hexdigest()
+
+    @classmethod
+    def store(cls, context, data, prop_data_id=None):
+        '''
+        Store a set of properties data, unless identical data is already
+        stored, and return its ID.
+        '''
+        if prop_data_id is None:
+            prop_data_id = cls.digest(data)
+        encrypted, stored_data = \
+            resource.Resource.encrypt_properties_data(data)
+        db_api.resource_prop_data_create(context,
+                                         {'id': prop_data_id,
+                                          'data': stored_data,
+                                          'encrypted': encrypted})
+        return prop_data_id
+
+    @classmethod
+    def get_all(cls, context, prop_data_ids):
+        '''Return a dict of the stored properties data with the given IDs.'''
+        return dict((db_prop_data.id,
+                     cls._from_db_object(context, cls(), db_prop_data))
+                    for db_prop_data in db_api.resource_prop_data_get_all(
+                        context, list(set(prop_data_ids))))
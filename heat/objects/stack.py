@@ -63,14 +63,27 @@ class Stack(
     }
 
     @staticmethod
-    def _from_db_object(context, stack, db_stack):
+    def _from_db_object(context, stack, db_stack, summary=False):
         for field in stack.fields:
+            if summary and field not in db_stack.__dict__:
+                # Only the columns needed to list stacks have been loaded
+                continue
             if field == 'raw_template':
-                stack['raw_template'] = (
-                    raw_template.RawTemplate.get_by_id(
-                        context, db_stack['raw_template_id']))
+                if 'raw_template' in db_stack.__dict__:
+                    # The raw template was loaded along with the stack
+                    stack['raw_template'] = (
+                        raw_template.RawTemplate._from_db_object(
+                            context, raw_template.RawTemplate(),
+                            db_stack.raw_template))
+                else:
+                    stack['raw_template'] = (
+                        raw_template.RawTemplate.get_by_id(
+                            context, db_stack['raw_template_id']))
             elif field == 'tags':
-                if db_stack.get(field) is not None:
+                if summary:
+                    stack['tags'] = stack_tag.StackTagList.from_db_objects(
+                        context, db_stack.tags)
+                elif db_stack.get(field) is not None:
                     stack['tags'] = stack_tag.StackTagList.get(
                         context, db_stack['id'])
                 else:
@@ -93,6 +106,14 @@ class Stack(
         stack = cls._from_db_object(context, cls(context), db_stack)
         return stack
 
+    @classmethod
+    def get_status(cls, context, stack_id, **kwargs):
+        '''Return the (action, status, status_reason, updated_at) of a stack.
+
+        Returns None if the stack does not exist.
+        '''
+        return db_api.stack_get_status(context, stack_id, **kwargs)
+
     @classmethod
     def get_by_name_and_owner_id(cls, context, stack_name, owner_id):
         db_stack = db_api.stack_get_by_name_and_owner_id(
@@ -115,12 +136,14 @@ class Stack(
 
     @classmethod
     def get_all(cls, context, *args, **kwargs):
+        summary = kwargs.get('summary', False)
         db_stacks = db_api.stack_get_all(context, *args, **kwargs)
         stacks = map(
             lambda db_stack: cls._from_db_object(
                 context,
                 cls(context),
-                db_stack),
+                db_stack,
+                summary),
             db_stacks)
         return stacks
 
@@ -139,6 +162,16 @@ class Stack(
     def count_all(cls, context, **kwargs):
         return db_api.stack_count_all(context, **kwargs)
 
+    @classmethod
+    def get_nested_ids(cls, context, stack_id):
+        return db_api.stack_get_nested_ids(context, stack_id)
+
+    @classmethod
+    def get_all_nested(cls, context, stack_id, nested_depth):
+        return [cls._from_db_object(context, cls(context), db_stack)
+                for db_stack in db_api.stack_get_all_nested(context, stack_id,
+                                                            nested_depth)]
+
     @classmethod
     def count_total_resources(cls, context, stack_id):
         return db_api.stack_count_total_resources(context, stack_id)
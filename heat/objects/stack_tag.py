@@ -68,6 +68,11 @@ class StackTagList(base.VersionedObject,
         if db_tags:
             return base.obj_make_list(context, cls(), StackTag, db_tags)
 
+    @classmethod
+    def from_db_objects(cls, context, db_tags):
+        if db_tags:
+            return base.obj_make_list(context, cls(), StackTag, db_tags)
+
     @classmethod
     def set(cls, context, stack_id, tags):
         db_tags = db_api.stack_tags_set(context, stack_id, tags)
@@ -66,6 +66,24 @@ class SyncPoint(base.VersionedObject,
         sync_point_db = db_api.sync_point_create(context, values)
         return cls._from_db_object(context, cls(), sync_point_db)
 
+    @classmethod
+    def create_many(cls, context, values_list):
+        db_api.sync_point_create_many(context, values_list)
+
+    @classmethod
+    def add_input(cls, context, values):
+        return db_api.sync_point_input_create(context, values)
+
+    @classmethod
+    def count_inputs(cls, context, entity_id, traversal_id, is_update):
+        return db_api.sync_point_input_count(context, entity_id,
+                                             traversal_id, is_update)
+
+    @classmethod
+    def get_inputs(cls, context, entity_id, traversal_id, is_update):
+        return db_api.sync_point_input_get_all(context, entity_id,
+                                               traversal_id, is_update)
+
     @classmethod
     def update_input_data(cls,
                           context,
@@ -36,15 +36,12 @@ class WatchData(base.VersionedObject, base.VersionedObjectDictCompat):
 
     @staticmethod
     def _from_db_object(context, rule, db_data):
-        from heat.objects import watch_rule
         for field in rule.fields:
             if field == 'watch_rule':
-                rule[field] = watch_rule.WatchRule._from_db_object(
-                    context,
-                    watch_rule.WatchRule(),
-                    db_data['watch_rule'])
-            else:
-                rule[field] = db_data[field]
+                # The watch rule is not loaded with each sample, callers that
+                # need it look it up by watch_rule_id
+                continue
+            rule[field] = db_data[field]
         rule._context = context
         rule.obj_reset_changes()
         return rule
@@ -64,3 +61,14 @@ class WatchData(base.VersionedObject, base.VersionedObjectDictCompat):
         return (cls._from_db_object(context, cls(), db_data)
                 for db_data in db_api.watch_data_get_all_by_watch_rule_id(
                     context, watch_rule_id))
+
+    @classmethod
+    def get_by_rule_since(cls, context, watch_rule_id, since):
+        return (cls._from_db_object(context, cls(), db_data)
+                for db_data in db_api.watch_data_get_by_rule_since(
+                    context, watch_rule_id, since))
+
+    @classmethod
+    def delete_by_rule_before(cls, context, watch_rule_id, before):
+        return db_api.watch_data_delete_by_rule_before(context,
+                                                       watch_rule_id, before)
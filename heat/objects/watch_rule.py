@@ -43,14 +43,13 @@ class WatchRule(base.VersionedObject, base.VersionedObjectDictCompat):
     @staticmethod
     def _from_db_object(context, rule, db_rule):
         for field in rule.fields:
-            if field == 'stack':
-                rule[field] = stack.Stack._from_db_object(
-                    context, stack.Stack(), db_rule[field])
-            elif field == 'watch_data':
-                rule[field] = watch_data.WatchData.get_all_by_watch_rule_id(
-                    context, db_rule['id'])
-            else:
-                rule[field] = db_rule[field]
+            if field in ('stack', 'watch_data'):
+                # The stack and the watch data are not loaded with the rule,
+                # since a rule may have a very large number of samples and
+                # loading a stack also reads its template. Callers that need
+                # them look them up by stack_id and id.
+                continue
+            rule[field] = db_rule[field]
         rule._context = context
         rule.obj_reset_changes()
         return rule
@@ -66,9 +65,10 @@ class WatchRule(base.VersionedObject, base.VersionedObjectDictCompat):
         return cls._from_db_object(context, cls(), db_rule)
 
     @classmethod
-    def get_all(cls, context):
+    def get_all(cls, context, exclude_states=None):
         return [cls._from_db_object(context, cls(), db_rule)
-                for db_rule in db_api.watch_rule_get_all(context)]
+                for db_rule in db_api.watch_rule_get_all(
+                    context, exclude_states=exclude_states)]
 
     @classmethod
     def get_all_by_stack(cls, context, stack_id):
@@ -80,6 +80,10 @@ class WatchRule(base.VersionedObject, base.VersionedObjectDictCompat):
     def update_by_id(cls, context, watch_id, values):
         db_api.watch_rule_update(context, watch_id, values)
 
+    @classmethod
+    def update_all(cls, context, values):
+        return db_api.watch_rule_update_all(context, values)
+
     @classmethod
     def create(cls, context, values):
         return cls._from_db_object(context, cls(),
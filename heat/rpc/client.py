@@ -17,6 +17,8 @@
 Client side of the heat engine RPC API.
 """
 
+import oslo_messaging
+
 from heat.common import messaging
 from heat.rpc import api as rpc_api
 
@@ -36,6 +38,7 @@ class EngineClient(object):
         1.13 - Add support for template functions list
         1.14 - Add cancel_with_rollback option to stack_cancel_update
         1.15 - Add preview_update_stack() call
+        1.16 - Add summary option to list_stacks()
     '''
 
     BASE_RPC_API_VERSION = '1.0'
@@ -100,7 +103,7 @@ class EngineClient(object):
                     sort_dir=None, filters=None, tenant_safe=True,
                     show_deleted=False, show_nested=False, show_hidden=False,
                     tags=None, tags_any=None, not_tags=None,
-                    not_tags_any=None):
+                    not_tags_any=None, summary=False):
         """
         The list_stacks method returns attributes of all stacks.  It supports
         pagination (``limit`` and ``marker``), sorting (``sort_keys`` and
@@ -124,19 +127,27 @@ class EngineClient(object):
             multiple tags using the boolean AND expression
         :param not_tags_any: show stacks not containing these tags, combine
             multiple tags using the boolean OR expression
+        :param summary: if true, return only the attributes needed to list
+            stacks. Engines older than RPC API 1.16 return full stacks.
         :returns: a list of stacks
         """
-        return self.call(ctxt,
-                         self.make_msg('list_stacks', limit=limit,
-                                       sort_keys=sort_keys, marker=marker,
-                                       sort_dir=sort_dir, filters=filters,
-                                       tenant_safe=tenant_safe,
-                                       show_deleted=show_deleted,
-                                       show_nested=show_nested,
-                                       show_hidden=show_hidden,
-                                       tags=tags, tags_any=tags_any,
-                                       not_tags=not_tags,
-                                       not_tags_any=not_tags_any),
+        kwargs = dict(limit=limit, sort_keys=sort_keys, marker=marker,
+                      sort_dir=sort_dir, filters=filters,
+                      tenant_safe=tenant_safe, show_deleted=show_deleted,
+                      show_nested=show_nested, show_hidden=show_hidden,
+                      tags=tags, tags_any=tags_any, not_tags=not_tags,
+                      not_tags_any=not_tags_any)
+        if summary:
+            try:
+                return self.call(ctxt,
+                                 self.make_msg('list_stacks', summary=True,
+                                               **kwargs),
+                                 version='1.16')
+            except oslo_messaging.RemoteError as ex:
+                # The engine has not been upgraded yet
+                if ex.exc_type != 'UnsupportedVersion':
+                    raise
+        return self.call(ctxt, self.make_msg('list_stacks', **kwargs),
                          version='1.8')
 
     def count_stacks(self, ctxt, filters=None, tenant_safe=True,
@@ -267,9 +267,9 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
                         'show_deleted': False, 'show_nested': False,
                         'show_hidden': False, 'tags': None,
                         'tags_any': None, 'not_tags': None,
-                        'not_tags_any': None}
+                        'not_tags_any': None, 'summary': True}
         mock_call.assert_called_once_with(
-            req.context, ('list_stacks', default_args), version='1.8')
+            req.context, ('list_stacks', default_args), version='1.16')
 
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test_index_whitelists_pagination_params(self, mock_call, mock_enforce):
@@ -288,7 +288,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
 
         rpc_call_args, _ = mock_call.call_args
         engine_args = rpc_call_args[1][1]
-        self.assertEqual(13, len(engine_args))
+        self.assertEqual(14, len(engine_args))
         self.assertIn('limit', engine_args)
         self.assertIn('sort_keys', engine_args)
         self.assertIn('marker', engine_args)
@@ -419,6 +419,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         self.controller.index(req, tenant_id=self.tenant)
         rpc_client.list_stacks.assert_called_once_with(mock.ANY,
                                                        filters=mock.ANY,
+                                                       summary=True,
                                                        tenant_safe=False)
 
     def test_global_index_show_deleted_false(self, mock_enforce):
@@ -431,6 +432,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         self.controller.index(req, tenant_id=self.tenant)
         rpc_client.list_stacks.assert_called_once_with(mock.ANY,
                                                        filters=mock.ANY,
+                                                       summary=True,
                                                        tenant_safe=True,
                                                        show_deleted=False)
 
@@ -444,6 +446,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         self.controller.index(req, tenant_id=self.tenant)
         rpc_client.list_stacks.assert_called_once_with(mock.ANY,
                                                        filters=mock.ANY,
+                                                       summary=True,
                                                        tenant_safe=True,
                                                        show_deleted=True)
 
@@ -457,6 +460,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         self.controller.index(req, tenant_id=self.tenant)
         rpc_client.list_stacks.assert_called_once_with(mock.ANY,
                                                        filters=mock.ANY,
+                                                       summary=True,
                                                        tenant_safe=True,
                                                        show_nested=False)
 
@@ -470,6 +474,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         self.controller.index(req, tenant_id=self.tenant)
         rpc_client.list_stacks.assert_called_once_with(mock.ANY,
                                                        filters=mock.ANY,
+                                                       summary=True,
                                                        tenant_safe=True,
                                                        show_nested=True)
 
@@ -485,6 +490,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         self.assertEqual(0, result['count'])
         rpc_client.list_stacks.assert_called_once_with(mock.ANY,
                                                        filters=mock.ANY,
+                                                       summary=True,
                                                        tenant_safe=True,
                                                        show_deleted=True)
         rpc_client.count_stacks.assert_called_once_with(mock.ANY,
@@ -575,7 +581,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         self.assertEqual(400, resp.json['code'])
         self.assertEqual('AttributeError', resp.json['error']['type'])
         mock_call.assert_called_once_with(
-            req.context, ('list_stacks', mock.ANY), version='1.8')
+            req.context, ('list_stacks', mock.ANY), version='1.16')
 
     def test_index_err_denied_policy(self, mock_enforce):
         self._mock_enforce_setup(mock_enforce, 'index', False)
@@ -603,7 +609,7 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         self.assertEqual(500, resp.json['code'])
         self.assertEqual('Exception', resp.json['error']['type'])
         mock_call.assert_called_once_with(
-            req.context, ('list_stacks', mock.ANY), version='1.8')
+            req.context, ('list_stacks', mock.ANY), version='1.16')
 
     def test_create(self, mock_enforce):
         self._mock_enforce_setup(mock_enforce, 'create', True)
@@ -443,7 +443,7 @@ class HeatScalingGroupAttrTest(common.HeatTestCase):
         self.assertEqual(4, self.group.FnGetAtt('current_size', 'name'))
 
     def test_index_dotted_attribute(self):
-        mock_members = self.patchobject(grouputils, 'get_members')
+        mock_index = self.patchobject(grouputils, 'get_member_index')
         self.group.nested = mock.Mock()
         members = []
         output = []
@@ -453,7 +453,7 @@ class HeatScalingGroupAttrTest(common.HeatTestCase):
             inst.FnGetAtt.return_value = '2.1.3.%d' % ip_ex
             output.append('2.1.3.%d' % ip_ex)
             members.append(inst)
-        mock_members.return_value = members
+        mock_index.return_value.members = members
         self.assertEqual(output[0], self.group.FnGetAtt('resource.0', 'Bar'))
         self.assertEqual(output[1], self.group.FnGetAtt('resource.1.Bar'))
         self.assertRaises(exception.InvalidTemplateAttribute,
@@ -316,6 +316,60 @@ class ClientPluginTest(common.HeatTestCase):
 
         self.assertRaises(TypeError, client_plugin.ClientPlugin, c)
 
+    def test_cached_lookup(self):
+        class LookupClientsPlugin(FooClientsPlugin):
+            lookups = []
+
+            @client_plugin.cached_lookup
+            def get_thing_id(self, name):
+                self.lookups.append(name)
+                if name == 'missing':
+                    raise exception.EntityNotFound(entity='Thing', name=name)
+                return name + '-id'
+
+        con = utils.dummy_context()
+        plugin = LookupClientsPlugin(con)
+        self.assertEqual('foo-id', plugin.get_thing_id('foo'))
+        self.assertEqual('foo-id', plugin.get_thing_id('foo'))
+        self.assertEqual('bar-id', plugin.get_thing_id('bar'))
+        self.assertEqual(['foo', 'bar'], LookupClientsPlugin.lookups)
+
+        # lookups that fail are not remembered
+        self.assertRaises(exception.EntityNotFound,
+                          plugin.get_thing_id, 'missing')
+        self.assertRaises(exception.EntityNotFound,
+                          plugin.get_thing_id, 'missing')
+        self.assertEqual(['foo', 'bar', 'missing', 'missing'],
+                         LookupClientsPlugin.lookups)
+
+        # lookups are not shared with other contexts
+        other_plugin = LookupClientsPlugin(utils.dummy_context())
+        self.assertEqual('foo-id', other_plugin.get_thing_id('foo'))
+        self.assertEqual(['foo', 'bar', 'missing', 'missing', 'foo'],
+                         LookupClientsPlugin.lookups)
+
+        # lookups are always made without the remembered results
+        with client_plugin.uncached_lookups():
+            self.assertEqual('foo-id', plugin.get_thing_id('foo'))
+        self.assertEqual(['foo', 'bar', 'missing', 'missing', 'foo', 'foo'],
+                         LookupClientsPlugin.lookups)
+        self.assertEqual('foo-id', plugin.get_thing_id('foo'))
+        self.assertEqual(6, len(LookupClientsPlugin.lookups))
+
+    def test_cached_lookup_unhashable(self):
+        class LookupClientsPlugin(FooClientsPlugin):
+            lookups = []
+
+            @client_plugin.cached_lookup
+            def get_thing_ids(self, names):
+                self.lookups.append(names)
+                return [n + '-id' for n in names]
+
+        plugin = LookupClientsPlugin(utils.dummy_context())
+        self.assertEqual(['foo-id'], plugin.get_thing_ids(['foo']))
+        self.assertEqual(['foo-id'], plugin.get_thing_ids(['foo']))
+        self.assertEqual([['foo'], ['foo']], LookupClientsPlugin.lookups)
+
 
 class TestClientPluginsInitialise(common.HeatTestCase):
 
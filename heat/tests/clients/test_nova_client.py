@@ -92,6 +92,24 @@ class NovaClientPluginTests(NovaClientPluginTestCase):
         self.assertEqual([(), (), ()],
                          self.nova_client.flavors.list.call_args_list)
 
+    def test_get_flavor_id_cached(self):
+        """Tests that get_flavor_id only looks a flavor up once."""
+        flav_id = str(uuid.uuid4())
+        flav_name = 'X-Large'
+        my_flavor = mock.MagicMock()
+        my_flavor.name = flav_name
+        my_flavor.id = flav_id
+        self.nova_client.flavors.list.return_value = [my_flavor]
+        for i in range(3):
+            self.assertEqual(flav_id,
+                             self.nova_plugin.get_flavor_id(flav_name))
+        self.assertEqual(1, self.nova_client.flavors.list.call_count)
+
+        for i in range(2):
+            self.assertRaises(exception.FlavorMissing,
+                              self.nova_plugin.get_flavor_id, 'noflavor')
+        self.assertEqual(3, self.nova_client.flavors.list.call_count)
+
     def test_get_keypair(self):
         """Tests the get_keypair function."""
         my_pub_key = 'a cool public key string'
@@ -315,6 +333,108 @@ class NovaClientPluginCheckActiveTests(NovaClientPluginTestCase):
         self.assertEqual(0, self.r_mock.call_count)
 
 
+class NovaClientPluginServerPollerTests(NovaClientPluginTestCase):
+
+    def setUp(self):
+        super(NovaClientPluginServerPollerTests, self).setUp()
+        cfg.CONF.set_override('server_status_poll_interval', 5)
+        self.addCleanup(nova._server_pollers.clear)
+        self.now = 0
+        self.patchobject(nova.timeutils, 'wallclock',
+                         side_effect=lambda: self.now)
+
+    def _server(self, server_id, status, updated):
+        server = mock.Mock()
+        server.id = server_id
+        server.status = status
+        server.updated = updated
+        return server
+
+    def test_check_active_batched(self):
+        servers = dict((s.id, s) for s in [
+            self._server('a', 'BUILD', '2015-10-10T12:00:02Z'),
+            self._server('b', 'BUILD', '2015-10-10T12:00:01Z'),
+            self._server('c', 'BUILD', '2015-10-10T12:00:03Z')])
+        self.nova_client.servers.get.side_effect = lambda i: servers[i]
+
+        for server_id in 'abc':
+            self.assertFalse(self.nova_plugin._check_active(server_id))
+        self.now = 1
+        for server_id in 'abc':
+            self.assertFalse(self.nova_plugin._check_active(server_id))
+        self.assertEqual(3, self.nova_client.servers.get.call_count)
+        self.assertEqual(0, self.nova_client.servers.list.call_count)
+
+        self.nova_client.servers.list.return_value = [
+            self._server('a', 'ACTIVE', '2015-10-10T12:00:04Z'),
+            self._server('b', 'BUILD', '2015-10-10T12:00:05Z'),
+            self._server('other', 'ACTIVE', '2015-10-10T12:00:05Z')]
+        self.now = 6
+        self.assertTrue(self.nova_plugin._check_active('a'))
+        self.assertFalse(self.nova_plugin._check_active('b'))
+        self.assertFalse(self.nova_plugin._check_active('c'))
+
+        self.assertEqual(3, self.nova_client.servers.get.call_count)
+        self.nova_client.servers.list.assert_called_once_with(
+            search_opts={'changes-since': '2015-10-10T12:00:01Z'})
+        poller = nova._server_pollers.get(self.nova_plugin.context.tenant_id)
+        self.assertEqual(2, len(poller._servers))
+        self.assertNotIn('a', poller._servers)
+        self.assertNotIn('other', poller._servers)
+
+    def test_check_active_batched_expired(self):
+        servers = dict((s.id, s) for s in [
+            self._server('a', 'BUILD', '2015-10-10T12:00:02Z'),
+            self._server('b', 'BUILD', '2015-10-10T12:00:01Z')])
+        self.nova_client.servers.get.side_effect = lambda i: servers[i]
+        self.nova_client.servers.list.return_value = [servers['a']]
+
+        self.assertFalse(self.nova_plugin._check_active('a'))
+        self.assertFalse(self.nova_plugin._check_active('b'))
+        poller = nova._server_pollers.get(self.nova_plugin.context.tenant_id)
+
+        # The status of 'b' is no longer requested, e.g. because its
+        # resource was deleted, so it stops being polled after a few
+        # intervals
+        for now in (6, 12):
+            self.now = now
+            self.assertFalse(self.nova_plugin._check_active('a'))
+        self.assertIn('b', poller._servers)
+        self.now = 18
+        self.assertFalse(self.nova_plugin._check_active('a'))
+        self.assertNotIn('b', poller._servers)
+        self.assertIn('a', poller._servers)
+        self.assertEqual(
+            [mock.call(search_opts={'changes-since': '2015-10-10T12:00:01Z'}),
+             mock.call(search_opts={'changes-since': '2015-10-10T12:00:01Z'}),
+             mock.call(search_opts={'changes-since': '2015-10-10T12:00:02Z'})],
+            self.nova_client.servers.list.call_args_list)
+
+    def test_check_active_batched_list_unavailable(self):
+        server = self._server('a', 'BUILD', '2015-10-10T12:00:00Z')
+        self.nova_client.servers.get.return_value = server
+        self.nova_client.servers.list.side_effect = (
+            nova_exceptions.OverLimit(413))
+
+        self.assertFalse(self.nova_plugin._check_active('a'))
+        self.now = 6
+        self.assertFalse(self.nova_plugin._check_active('a'))
+        self.assertEqual(1, self.nova_client.servers.list.call_count)
+        self.assertEqual(1, self.nova_client.servers.get.call_count)
+
+    def test_check_active_batched_fake_client(self):
+        fc = fakes_nova.FakeClient()
+        self.nova_plugin._client = fc
+
+        self.assertFalse(self.nova_plugin._check_active('1234'))
+        self.now = 6
+        self.assertFalse(self.nova_plugin._check_active('1234'))
+        self.now = 7
+        self.assertFalse(self.nova_plugin._check_active('1234'))
+        self.assertEqual(['/servers/1234', '/servers/detail'],
+                         [url for method, url, body in fc.client.callstack])
+
+
 class NovaClientPluginUserdataTests(NovaClientPluginTestCase):
 
     def test_build_userdata(self):
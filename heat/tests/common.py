@@ -33,6 +33,7 @@ from heat.engine.clients.os import neutron
 from heat.engine.clients.os import nova
 from heat.engine.clients.os import trove
 from heat.engine import environment
+from heat.engine import event
 from heat.engine import resource
 from heat.engine import resources
 from heat.engine import scheduler
@@ -132,6 +133,10 @@ class HeatTestCase(testscenarios.WithScenarios,
         utils.setup_dummy_db()
         self.register_test_resources()
         self.addCleanup(utils.reset_dummy_db)
+        # Event counts must not be carried over from one test's database to
+        # another's
+        self.useFixture(fixtures.MonkeyPatch('heat.engine.event.writer',
+                                             event.EventWriter()))
 
     def register_test_resources(self):
         resource._register_class('GenericResourceType',
@@ -619,6 +619,50 @@ class HeatMigrationsCheckers(test_migrations.WalkVersionsMixin,
         self.assertColumnNotExists(engine, 'raw_template',
                                    'predecessor')
 
+    def _check_065(self, engine, data):
+        column_list = [('entity_id', False),
+                       ('traversal_id', False),
+                       ('is_update', False),
+                       ('sender', False),
+                       ('stack_id', False),
+                       ('input_data', True)]
+        for column in column_list:
+            self.assertColumnExists(engine, 'sync_point_input', column[0])
+            if not column[1]:
+                self.assertColumnIsNotNullable(engine, 'sync_point_input',
+                                               column[0])
+            else:
+                self.assertColumnIsNullable(engine, 'sync_point_input',
+                                            column[0])
+
+    def _check_066(self, engine, data):
+        self.assertColumnExists(engine, 'resource_properties_data', 'id')
+        self.assertColumnIsNotNullable(engine, 'resource_properties_data',
+                                       'id')
+        self.assertColumnExists(engine, 'resource_properties_data', 'data')
+        self.assertColumnExists(engine, 'resource_properties_data',
+                                'encrypted')
+        self.assertColumnExists(engine, 'event', 'rsrc_prop_data_id')
+        self.assertColumnIsNullable(engine, 'event', 'rsrc_prop_data_id')
+
+    def _check_067(self, engine, data):
+        self.assertColumnExists(engine, 'raw_template_blob', 'id')
+        self.assertColumnIsNotNullable(engine, 'raw_template_blob', 'id')
+        self.assertColumnExists(engine, 'raw_template_blob', 'data')
+        for column in ('template_blob_id', 'files_blob_id',
+                       'environment_blob_id'):
+            self.assertColumnExists(engine, 'raw_template', column)
+            self.assertColumnIsNullable(engine, 'raw_template', column)
+
+    def _check_068(self, engine, data):
+        self.assertColumnExists(engine, 'stack', 'root_stack_id')
+        self.assertColumnIsNullable(engine, 'stack', 'root_stack_id')
+        self.assertIndexExists(engine, 'stack', 'ix_stack_root_stack_id')
+
+    def _check_069(self, engine, data):
+        self.assertIndexExists(engine, 'watch_data',
+                               'ix_watch_data_watch_rule_id_created_at')
+
 
 class TestHeatMigrationsMySQL(HeatMigrationsCheckers,
                               test_base.MySQLOpportunisticTestCase):
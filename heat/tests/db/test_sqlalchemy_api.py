@@ -399,6 +399,23 @@ class SqlAlchemyTest(common.HeatTestCase):
         st = db_api.stack_get(self.ctx, UUID1, show_deleted=True)
         self.assertEqual(UUID1, st.id)
 
+    def test_stack_get_status(self):
+        stack = self._setup_test_stack('stack', UUID1)[1]
+        db_api.stack_get(self.ctx, UUID1)
+
+        stack.state_set(stack.UPDATE, stack.FAILED, 'broken')
+        st = db_api.stack_get_status(self.ctx, UUID1)
+        self.assertEqual(('UPDATE', 'FAILED', 'broken'), st[:3])
+
+        other_ctx = utils.dummy_context(tenant_id='other_tenant')
+        self.assertIsNone(db_api.stack_get_status(other_ctx, UUID1))
+        self.assertIsNone(db_api.stack_get_status(self.ctx, UUID2))
+
+        stack.delete()
+        self.assertIsNone(db_api.stack_get_status(self.ctx, UUID1))
+        st = db_api.stack_get_status(self.ctx, UUID1, show_deleted=True)
+        self.assertEqual(('DELETE', 'COMPLETE'), st[:2])
+
     def test_stack_get_show_deleted_context(self):
         stack = self._setup_test_stack('stack', UUID1)[1]
 
@@ -592,6 +609,27 @@ class SqlAlchemyTest(common.HeatTestCase):
         st_db = db_api.stack_get_all(self.ctx, tags=['tag1', 'tag2', 'tag3'])
         self.assertEqual(1, len(st_db))
 
+    def test_stack_get_all_summary(self):
+        stacks = [self._setup_test_stack('stack', x)[1] for x in UUIDs]
+        stacks[0].tags = ['tag1', 'tag2']
+        stacks[0].store()
+
+        st_db = db_api.stack_get_all(self.ctx, summary=True,
+                                     sort_keys=['name'], sort_dir='asc')
+        self.assertEqual(3, len(st_db))
+        for st in st_db:
+            self.assertIn('status', st.__dict__)
+            self.assertIn('tags', st.__dict__)
+            self.assertNotIn('raw_template', st.__dict__)
+            self.assertNotIn('current_deps', st.__dict__)
+        tags = dict((st.id, sorted(t.tag for t in st.tags)) for st in st_db)
+        self.assertEqual(['tag1', 'tag2'], tags[stacks[0].id])
+        self.assertEqual([], tags[stacks[1].id])
+
+        st_db = db_api.stack_get_all(self.ctx, summary=True, limit=1,
+                                     tags=['tag2'])
+        self.assertEqual([stacks[0].id], [st.id for st in st_db])
+
     def test_stack_get_all_by_tags_any(self):
         stacks = [self._setup_test_stack('stack', x)[1] for x in UUIDs]
         stacks[0].tags = ['tag2']
@@ -1490,6 +1528,59 @@ class DBAPIRawTemplateTest(common.HeatTestCase):
         self.assertRaises(exception.NotFound, db_api.raw_template_get,
                           self.ctx, tp.id)
 
+    def test_raw_template_content_stored_once(self):
+        files = {'nested.yaml': 'heat_template_version: 2013-05-23'}
+        tps = [create_raw_template(self.ctx, files=files) for i in range(3)]
+
+        self.assertEqual(1, len(set(tp.files_blob_id for tp in tps)))
+        self.assertEqual(1, len(set(tp.template_blob_id for tp in tps)))
+        self.assertIsNone(tps[0].environment_blob_id)
+        blobs = self.ctx.session.query(models.RawTemplateBlob).all()
+        self.assertEqual(2, len(blobs))
+
+        db_api._template_blob_cache.clear()
+        template = db_api.raw_template_get(self.ctx, tps[1].id)
+        self.assertEqual(files, template.files)
+        self.assertEqual(template_format.parse(wp_template),
+                         template.template)
+
+    def test_raw_template_get_inline_content(self):
+        t = template_format.parse(wp_template)
+        raw_template_ref = models.RawTemplate()
+        raw_template_ref.update({'template': t, 'files': {'foo': 'bar'}})
+        raw_template_ref.save(self.ctx.session)
+
+        template = db_api.raw_template_get(self.ctx, raw_template_ref.id)
+        self.assertEqual(t, template.template)
+        self.assertEqual({'foo': 'bar'}, template.files)
+
+    def test_raw_template_get_templates(self):
+        t = template_format.parse(wp_template)
+        tps = [create_raw_template(self.ctx) for i in range(2)]
+        inline_ref = models.RawTemplate()
+        inline_ref.update({'template': {'foo': 'bar'}})
+        inline_ref.save(self.ctx.session)
+
+        db_api._template_blob_cache.clear()
+        template_ids = [tp.id for tp in tps] + [inline_ref.id]
+        templates = db_api.raw_template_get_templates(self.ctx, template_ids)
+        self.assertEqual({tps[0].id: t, tps[1].id: t,
+                          inline_ref.id: {'foo': 'bar'}}, templates)
+        # raw templates that share a template share its content
+        self.assertIs(templates[tps[0].id], templates[tps[1].id])
+
+    def test_raw_template_update_content(self):
+        tp = create_raw_template(self.ctx)
+        files_blob_id = tp.files_blob_id
+        updated_tp = db_api.raw_template_update(self.ctx, tp.id,
+                                                {'files': {'foo': 'baz'}})
+
+        self.assertNotEqual(files_blob_id, updated_tp.files_blob_id)
+        self.assertEqual({'foo': 'baz'}, updated_tp.files)
+        db_api._template_blob_cache.clear()
+        template = db_api.raw_template_get(self.ctx, tp.id)
+        self.assertEqual({'foo': 'baz'}, template.files)
+
 
 class DBAPIUserCredsTest(common.HeatTestCase):
     def setUp(self):
@@ -1807,6 +1898,78 @@ class DBAPIStackTest(common.HeatTestCase):
         self._deleted_stack_existance(utils.dummy_context(), stacks,
                                       (), (0, 1, 2, 3, 4))
 
+    def test_purge_deleted_template_blobs(self):
+        deleted = datetime.datetime.now() - datetime.timedelta(days=2)
+        shared_files = {'shared.yaml': 'shared'}
+        templates = [create_raw_template(self.ctx, files=shared_files),
+                     create_raw_template(self.ctx, files=shared_files),
+                     create_raw_template(self.ctx, files={'own.yaml': 'own'})]
+        self.ctx.session.query(models.RawTemplateBlob).update(
+            {'created_at': deleted, 'updated_at': deleted})
+        create_stack(self.ctx, templates[0], self.user_creds)
+        for tp in templates[1:]:
+            create_stack(self.ctx, tp, self.user_creds, deleted_at=deleted)
+
+        db_api.purge_deleted(age=1, granularity='days')
+
+        blob_ids = set(b.id for b in self.ctx.session.query(
+            models.RawTemplateBlob).all())
+        self.assertEqual(set([templates[0].template_blob_id,
+                              templates[0].files_blob_id]), blob_ids)
+        db_api._template_blob_cache.clear()
+        self.assertEqual(shared_files, db_api.raw_template_get(
+            self.ctx, templates[0].id).files)
+
+    def test_purge_deleted_template_blob_reused(self):
+        deleted = datetime.datetime.now() - datetime.timedelta(days=2)
+        files = {'reused.yaml': 'reused'}
+        old_template = create_raw_template(self.ctx, files=files)
+        create_stack(self.ctx, old_template, self.user_creds,
+                     deleted_at=deleted)
+        self.ctx.session.query(models.RawTemplateBlob).update(
+            {'created_at': deleted, 'updated_at': None})
+
+        # Purge between storing the content of a new raw template and
+        # storing the raw template that refers to it
+        blob_store = db_api._template_blob_store
+
+        def store_then_purge(context, data):
+            blob_id = blob_store(context, data)
+            db_api.purge_deleted(age=1, granularity='days')
+            return blob_id
+
+        self.patchobject(db_api, '_template_blob_store',
+                         side_effect=store_then_purge)
+        new_template = create_raw_template(self.ctx, files=files)
+        create_stack(self.ctx, new_template, self.user_creds)
+        self.assertEqual(old_template.files_blob_id,
+                         new_template.files_blob_id)
+
+        db_api._template_blob_cache.clear()
+        self.assertEqual(files, db_api.raw_template_get(
+            self.ctx, new_template.id).files)
+
+    def test_purge_deleted_template_blob_recently_reused(self):
+        deleted = datetime.datetime.now() - datetime.timedelta(days=2)
+        used = datetime.datetime.now() - datetime.timedelta(minutes=30)
+        files = {'reused.yaml': 'reused'}
+        old_template = create_raw_template(self.ctx, files=files)
+        create_stack(self.ctx, old_template, self.user_creds,
+                     deleted_at=deleted)
+        self.ctx.session.query(models.RawTemplateBlob).update(
+            {'created_at': deleted, 'updated_at': used})
+
+        # A blob that has been used recently is not written to again, and
+        # is kept by a purge that runs before the raw template is stored
+        new_template = create_raw_template(self.ctx, files=files)
+        blob = self.ctx.session.query(models.RawTemplateBlob).get(
+            new_template.files_blob_id)
+        self.assertEqual(used, blob.updated_at)
+
+        db_api.purge_deleted(age=1, granularity='seconds')
+        self.assertIsNotNone(self.ctx.session.query(
+            models.RawTemplateBlob).get(new_template.files_blob_id))
+
     def _deleted_stack_existance(self, ctx, stacks, existing, deleted):
         for s in existing:
             self.assertIsNotNone(db_api.stack_get(ctx, stacks[s].id,
@@ -1847,6 +2010,62 @@ class DBAPIStackTest(common.HeatTestCase):
         self.assertEqual(root.id, db_api.stack_get_root_id(
             self.ctx, child_1.id))
 
+    def _create_stack_tree(self):
+        root = create_stack(self.ctx, self.template, self.user_creds,
+                            name='root stack')
+        child_1 = create_stack(self.ctx, self.template, self.user_creds,
+                               name='child 1 stack', owner_id=root.id)
+        child_2 = create_stack(self.ctx, self.template, self.user_creds,
+                               name='child 2 stack', owner_id=root.id)
+        child_1_1 = create_stack(self.ctx, self.template, self.user_creds,
+                                 name='child 1 1 stack', owner_id=child_1.id)
+        create_stack(self.ctx, self.template, self.user_creds,
+                     name='other stack')
+        return root, child_1, child_2, child_1_1
+
+    def test_stack_create_root_stack_id(self):
+        root, child_1, child_2, child_1_1 = self._create_stack_tree()
+        self.assertIsNone(root.root_stack_id)
+        self.assertEqual(root.id, child_1.root_stack_id)
+        self.assertEqual(root.id, child_2.root_stack_id)
+        self.assertEqual(root.id, child_1_1.root_stack_id)
+
+    def test_stack_get_nested_ids(self):
+        root, child_1, child_2, child_1_1 = self._create_stack_tree()
+        self.assertEqual(
+            sorted([root.id, child_1.id, child_2.id, child_1_1.id]),
+            sorted(db_api.stack_get_nested_ids(self.ctx, root.id)))
+        self.assertEqual(
+            [child_1.id, child_1_1.id],
+            db_api.stack_get_nested_ids(self.ctx, child_1.id))
+        self.assertEqual([child_1_1.id],
+                         db_api.stack_get_nested_ids(self.ctx, child_1_1.id))
+        self.assertEqual([], db_api.stack_get_nested_ids(self.ctx, UUID1))
+
+    def test_stack_get_all_nested(self):
+        root, child_1, child_2, child_1_1 = self._create_stack_tree()
+        self.assertEqual(
+            sorted([child_1.id, child_2.id]),
+            sorted(s.id for s in db_api.stack_get_all_nested(
+                self.ctx, root.id, 1)))
+        self.assertEqual(
+            sorted([child_1.id, child_2.id, child_1_1.id]),
+            sorted(s.id for s in db_api.stack_get_all_nested(
+                self.ctx, root.id, 3)))
+        self.assertEqual([], db_api.stack_get_all_nested(
+            self.ctx, child_2.id, 1))
+
+    def test_stack_get_nested_ids_without_root_stack_id(self):
+        root, child_1, child_2, child_1_1 = self._create_stack_tree()
+        for stack in (child_1, child_2, child_1_1):
+            stack.update_and_save({'root_stack_id': None})
+
+        self.assertEqual(
+            [child_1.id, child_1_1.id],
+            db_api.stack_get_nested_ids(self.ctx, child_1.id))
+        self.assertEqual(root.id,
+                         db_api.stack_get_root_id(self.ctx, child_1_1.id))
+
     def test_stack_count_total_resources(self):
 
         def add_resources(stack, count):
@@ -2007,6 +2226,25 @@ class DBAPIResourceTest(common.HeatTestCase):
         self.assertRaises(exception.NotFound, db_api.resource_get_all_by_stack,
                           self.ctx, self.stack2.id)
 
+    def test_resource_get_all_by_stack_ids(self):
+        self.stack1 = create_stack(self.ctx, self.template, self.user_creds)
+        self.stack2 = create_stack(self.ctx, self.template, self.user_creds)
+        values = [
+            {'name': 'res1', 'stack_id': self.stack.id},
+            {'name': 'res2', 'stack_id': self.stack.id},
+            {'name': 'res3', 'stack_id': self.stack1.id},
+            {'name': 'res4', 'stack_id': self.stack2.id},
+        ]
+        [create_resource(self.ctx, self.stack, **val) for val in values]
+
+        resources = db_api.resource_get_all_by_stack_ids(
+            self.ctx, [self.stack.id, self.stack1.id])
+        self.assertEqual(set([self.stack.id, self.stack1.id]),
+                         set(resources))
+        self.assertEqual(['res1', 'res2'],
+                         sorted(resources[self.stack.id]))
+        self.assertEqual('res3', resources[self.stack1.id]['res3'].name)
+
 
 class DBAPIStackLockTest(common.HeatTestCase):
     def setUp(self):
@@ -2241,6 +2479,63 @@ class DBAPIEventTest(common.HeatTestCase):
         self.assertEqual(1, db_api.event_count_all_by_stack(self.ctx,
                                                             self.stack2.id))
 
+    def test_event_create_many(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        values = [{'stack_id': stack.id, 'resource_name': 'res%d' % i,
+                   'resource_properties': {'name': 'foo'}}
+                  for i in range(3)]
+
+        events = db_api.event_create_many(self.ctx, values)
+
+        self.assertEqual(3, len(events))
+        self.assertEqual(3, len(set(e.uuid for e in events)))
+        for i, event in enumerate(events):
+            ret_event = db_api.event_get(self.ctx, event.id)
+            self.assertEqual('res%d' % i, ret_event.resource_name)
+            self.assertEqual({'name': 'foo'}, ret_event.resource_properties)
+            self.assertIsNotNone(ret_event.created_at)
+
+    def test_event_prune_by_stack(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        events = [create_event(self.ctx, stack_id=stack.id) for i in range(4)]
+
+        self.assertEqual(3, db_api.event_prune_by_stack(self.ctx,
+                                                        stack.id, 3))
+        remaining = db_api.event_get_all_by_stack(self.ctx, stack.id)
+        self.assertEqual([events[-1].id], [e.id for e in remaining])
+
+    def test_resource_prop_data_create(self):
+        values = {'id': 'abc123', 'data': {'foo': 'bar'}, 'encrypted': False}
+        self.assertTrue(db_api.resource_prop_data_create(self.ctx, values))
+        self.assertFalse(db_api.resource_prop_data_create(self.ctx, values))
+
+        stored = db_api.resource_prop_data_get_all(self.ctx,
+                                                   ['abc123', 'missing'])
+        self.assertEqual(1, len(stored))
+        self.assertEqual({'foo': 'bar'}, stored[0].data)
+        self.assertEqual([], db_api.resource_prop_data_get_all(self.ctx, []))
+
+    def test_purge_deleted_prop_data(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds,
+                             deleted_at=datetime.datetime.now() -
+                             datetime.timedelta(days=2))
+        for prop_data_id in ('used', 'unused'):
+            db_api.resource_prop_data_create(
+                self.ctx, {'id': prop_data_id, 'data': {},
+                           'created_at': (datetime.datetime.now() -
+                                          datetime.timedelta(days=2))})
+        live_stack = create_stack(self.ctx, self.template, self.user_creds)
+        create_event(self.ctx, stack_id=live_stack.id,
+                     rsrc_prop_data_id='used')
+        create_event(self.ctx, stack_id=stack.id,
+                     rsrc_prop_data_id='unused')
+
+        db_api.purge_deleted(age=1, granularity='days')
+
+        stored = db_api.resource_prop_data_get_all(self.ctx,
+                                                   ['used', 'unused'])
+        self.assertEqual(['used'], [pd.id for pd in stored])
+
 
 class DBAPIWatchRuleTest(common.HeatTestCase):
     def setUp(self):
@@ -2279,6 +2574,31 @@ class DBAPIWatchRuleTest(common.HeatTestCase):
         names = [wr.name for wr in wrs]
         [self.assertIn(val['name'], names) for val in values]
 
+    def test_watch_rule_get_all_exclude_states(self):
+        values = [
+            {'name': 'rule1', 'state': 'NORMAL'},
+            {'name': 'rule2', 'state': 'SUSPENDED'},
+            {'name': 'rule3', 'state': 'ALARM'},
+        ]
+        [create_watch_rule(self.ctx, self.stack, **val) for val in values]
+
+        wrs = db_api.watch_rule_get_all(self.ctx,
+                                        exclude_states=['SUSPENDED'])
+        self.assertEqual(['rule1', 'rule3'], sorted(wr.name for wr in wrs))
+
+    def test_watch_rule_update_all(self):
+        past = timeutils.utcnow() - datetime.timedelta(days=1)
+        [create_watch_rule(self.ctx, self.stack, name=name,
+                           last_evaluated=past)
+         for name in ('rule1', 'rule2')]
+
+        now = timeutils.utcnow()
+        self.assertEqual(2, db_api.watch_rule_update_all(
+            self.ctx, {'last_evaluated': now}))
+        for wr in db_api.watch_rule_get_all(self.ctx):
+            self.ctx.session.refresh(wr)
+            self.assertEqual(now, wr.last_evaluated)
+
     def test_watch_rule_get_all_by_stack(self):
         self.stack1 = create_stack(self.ctx, self.template, self.user_creds)
 
@@ -2352,6 +2672,42 @@ class DBAPIWatchDataTest(common.HeatTestCase):
         data = [wd.data for wd in watch_data]
         [self.assertIn(val['data'], data) for val in values]
 
+    def test_watch_data_get_by_rule_since(self):
+        now = timeutils.utcnow()
+        for age in (400, 200, 100):
+            timeutils.set_time_override(now - datetime.timedelta(seconds=age))
+            create_watch_data(self.ctx, self.watch_rule,
+                              data={'foo': 'age %d' % age})
+        timeutils.clear_time_override()
+        other_rule = create_watch_rule(self.ctx, self.stack, name='other_rule')
+        create_watch_data(self.ctx, other_rule)
+
+        since = now - datetime.timedelta(seconds=300)
+        watch_data = db_api.watch_data_get_by_rule_since(
+            self.ctx, self.watch_rule.id, since)
+        self.assertEqual([{'foo': 'age 200'}, {'foo': 'age 100'}],
+                         [wd.data for wd in watch_data])
+
+    def test_watch_data_delete_by_rule_before(self):
+        now = timeutils.utcnow()
+        for age in (400, 350, 100):
+            timeutils.set_time_override(now - datetime.timedelta(seconds=age))
+            create_watch_data(self.ctx, self.watch_rule,
+                              data={'foo': 'age %d' % age})
+        timeutils.clear_time_override()
+        other_rule = create_watch_rule(self.ctx, self.stack, name='other_rule')
+        create_watch_data(self.ctx, other_rule)
+
+        before = now - datetime.timedelta(seconds=300)
+        self.assertEqual(2, db_api.watch_data_delete_by_rule_before(
+            self.ctx, self.watch_rule.id, before))
+        self.assertEqual(
+            [{'foo': 'age 100'}],
+            [wd.data for wd in db_api.watch_data_get_all_by_watch_rule_id(
+                self.ctx, self.watch_rule.id)])
+        self.assertEqual(1, len(db_api.watch_data_get_all_by_watch_rule_id(
+            self.ctx, other_rule.id)))
+
 
 class DBAPIServiceTest(common.HeatTestCase):
     def setUp(self):
@@ -2451,6 +2807,22 @@ class DBAPIResourceUpdateTest(common.HeatTestCase):
         self.assertEqual('IN_PROGRESS', db_res.status)
         self.assertEqual(1, db_res.atomic_key)
 
+    def test_resource_update_in_transaction(self):
+        values = {'engine_id': 'engine-1',
+                  'action': 'CREATE',
+                  'status': 'IN_PROGRESS'}
+        with db_api.transaction(self.ctx):
+            ret = db_api.resource_update(self.ctx, self.resource.id,
+                                         values, 0, None)
+            self.assertTrue(ret)
+            ret = db_api.resource_update(self.ctx, self.resource.id,
+                                         {'status': 'COMPLETE'}, 1,
+                                         'engine-1')
+            self.assertTrue(ret)
+        db_res = db_api.resource_get(self.ctx, self.resource.id)
+        self.assertEqual('COMPLETE', db_res.status)
+        self.assertEqual(2, db_res.atomic_key)
+
     def test_locked_resource_update_by_same_engine(self):
         values = {'engine_id': 'engine-1',
                   'action': 'CREATE',
@@ -2604,6 +2976,32 @@ class DBAPISyncPointTest(common.HeatTestCase):
         self.assertEqual(sync_point_stack.input_data,
                          ret_sync_point_stack.input_data)
 
+    def test_sync_point_create_many(self):
+        entities = [(res.id, True) for res in self.resources]
+        entities.append((self.stack.id, True))
+        db_api.sync_point_create_many(
+            self.ctx,
+            [{'entity_id': entity_id, 'is_update': is_update,
+              'traversal_id': self.stack.current_traversal,
+              'atomic_key': 0, 'stack_id': self.stack.id,
+              'input_data': {}} for entity_id, is_update in entities])
+
+        for entity_id, is_update in entities:
+            ret_sync_point = db_api.sync_point_get(
+                self.ctx, entity_id, self.stack.current_traversal, is_update)
+            self.assertIsNotNone(ret_sync_point)
+            self.assertEqual(str(entity_id), ret_sync_point.entity_id)
+            self.assertEqual(self.stack.id, ret_sync_point.stack_id)
+            self.assertEqual(0, ret_sync_point.atomic_key)
+            self.assertEqual({}, ret_sync_point.input_data)
+            self.assertIsNotNone(ret_sync_point.created_at)
+
+    def test_sync_point_create_many_empty(self):
+        db_api.sync_point_create_many(self.ctx, [])
+        rows_deleted = db_api.sync_point_delete_all_by_stack_and_traversal(
+            self.ctx, self.stack.id, self.stack.current_traversal)
+        self.assertEqual(0, rows_deleted)
+
     def test_sync_point_update(self):
         sync_point = create_sync_point(
             self.ctx, entity_id=str(self.resources[0].id),
@@ -2670,6 +3068,44 @@ class DBAPISyncPointTest(common.HeatTestCase):
         )
         self.assertEqual(0, rows_updated)
 
+    def test_sync_point_input(self):
+        entity_id = str(self.resources[0].id)
+        traversal_id = self.stack.current_traversal
+        for res in self.resources[1:]:
+            created = db_api.sync_point_input_create(
+                self.ctx, {'entity_id': entity_id,
+                           'traversal_id': traversal_id,
+                           'is_update': True,
+                           'sender': '%s:True' % res.id,
+                           'stack_id': self.stack.id,
+                           'input_data': {'input_data': []}})
+            self.assertTrue(created)
+
+        # a second input from the same sender is ignored
+        created = db_api.sync_point_input_create(
+            self.ctx, {'entity_id': entity_id,
+                       'traversal_id': traversal_id,
+                       'is_update': True,
+                       'sender': '%s:True' % self.resources[1].id,
+                       'stack_id': self.stack.id,
+                       'input_data': {'input_data': []}})
+        self.assertFalse(created)
+
+        self.assertEqual(2, db_api.sync_point_input_count(
+            self.ctx, entity_id, traversal_id, True))
+        self.assertEqual(0, db_api.sync_point_input_count(
+            self.ctx, entity_id, traversal_id, False))
+        inputs = db_api.sync_point_input_get_all(
+            self.ctx, entity_id, traversal_id, True)
+        self.assertEqual(set('%s:True' % res.id
+                             for res in self.resources[1:]),
+                         set(i.sender for i in inputs))
+
+        db_api.sync_point_delete_all_by_stack_and_traversal(
+            self.ctx, self.stack.id, traversal_id)
+        self.assertEqual(0, db_api.sync_point_input_count(
+            self.ctx, entity_id, traversal_id, True))
+
     def test_sync_point_delete(self):
         for res in self.resources:
             sync_point_rsrc = create_sync_point(
@@ -2737,10 +3173,15 @@ class DBAPICryptParamsPropsTest(common.HeatTestCase):
                                            'param2': 'bar'}}}
         return db_api.raw_template_create(self.ctx, template)
 
+    def _raw_templates(self, session):
+        # The environment is stored in a blob, which the DB API loads
+        return [db_api._raw_template_load_blobs(self.ctx, raw_template)
+                for raw_template in session.query(models.RawTemplate).all()]
+
     def _test_db_encrypt_decrypt(self, batch_size=50):
         session = db_api.get_session()
 
-        for r_tmpl in session.query(models.RawTemplate).all():
+        for r_tmpl in self._raw_templates(session):
             self.assertEqual('bar', r_tmpl.environment['parameters']['param2'])
         for resource in session.query(models.Resource).all():
             self.assertEqual('bar1', resource.properties_data['foo1'])
@@ -2749,7 +3190,7 @@ class DBAPICryptParamsPropsTest(common.HeatTestCase):
         db_api.db_encrypt_parameters_and_properties(
             self.ctx, cfg.CONF.auth_encryption_key, batch_size=batch_size)
         session = db_api.get_session()
-        for enc_tmpl in session.query(models.RawTemplate).all():
+        for enc_tmpl in self._raw_templates(session):
             self.assertEqual('cryptography_decrypt_v1',
                              enc_tmpl.environment['parameters']['param2'][0])
         encrypt_value = enc_tmpl.environment['parameters']['param2'][1]
@@ -2761,7 +3202,7 @@ class DBAPICryptParamsPropsTest(common.HeatTestCase):
         db_api.db_encrypt_parameters_and_properties(
             self.ctx, cfg.CONF.auth_encryption_key, batch_size=batch_size)
         session = db_api.get_session()
-        for enc_tmpl in session.query(models.RawTemplate).all():
+        for enc_tmpl in self._raw_templates(session):
             self.assertEqual('cryptography_decrypt_v1',
                              enc_tmpl.environment['parameters']['param2'][0])
         for enc_prop in session.query(models.Resource).all():
@@ -2772,7 +3213,7 @@ class DBAPICryptParamsPropsTest(common.HeatTestCase):
         db_api.db_decrypt_parameters_and_properties(
             self.ctx, cfg.CONF.auth_encryption_key, batch_size=batch_size)
         session = db_api.get_session()
-        for dec_tmpl in session.query(models.RawTemplate).all():
+        for dec_tmpl in self._raw_templates(session):
             self.assertEqual('bar',
                              dec_tmpl.environment['parameters']['param2'])
         for dec_prop in session.query(models.Resource).all():
@@ -2782,7 +3223,7 @@ class DBAPICryptParamsPropsTest(common.HeatTestCase):
         db_api.db_decrypt_parameters_and_properties(
             self.ctx, cfg.CONF.auth_encryption_key, batch_size=batch_size)
         session = db_api.get_session()
-        for dec_tmpl in session.query(models.RawTemplate).all():
+        for dec_tmpl in self._raw_templates(session):
             self.assertEqual('bar',
                              dec_tmpl.environment['parameters']['param2'])
         for dec_prop in session.query(models.Resource).all():
@@ -2793,7 +3234,7 @@ class DBAPICryptParamsPropsTest(common.HeatTestCase):
             self.ctx, '774c15be099ea74123a9b9592ff12680',
             batch_size=batch_size)
         session = db_api.get_session()
-        for r_tmpl in session.query(models.RawTemplate).all():
+        for r_tmpl in self._raw_templates(session):
             self.assertNotEqual(encrypt_value,
                                 r_tmpl.environment['parameters']['param2'][1])
 
@@ -2801,7 +3242,7 @@ class DBAPICryptParamsPropsTest(common.HeatTestCase):
             self.ctx, '774c15be099ea74123a9b9592ff12680',
             batch_size=batch_size)
         session = db_api.get_session()
-        for r_tmpl in session.query(models.RawTemplate).all():
+        for r_tmpl in self._raw_templates(session):
             self.assertEqual('bar',
                              r_tmpl.environment['parameters']['param2'])
 
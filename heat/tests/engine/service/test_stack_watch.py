@@ -38,25 +38,22 @@ class StackWatchTest(common.HeatTestCase):
         self.eng.create_periodic_tasks()
         # self.eng.engine_id = 'engine-fake-uuid'
 
+    @mock.patch.object(service_stack_watch.StackWatch, 'start_watch_tasks')
     @mock.patch.object(service_stack_watch.StackWatch, 'start_watch_task')
     @mock.patch.object(stack_object.Stack, 'get_all')
     @mock.patch.object(service.service.Service, 'start')
     def test_start_watches_all_stacks(self, mock_super_start, mock_get_all,
-                                      start_watch_task):
-        s1 = mock.Mock(id=1)
-        s2 = mock.Mock(id=2)
-        mock_get_all.return_value = [s1, s2]
-        start_watch_task.return_value = None
-
+                                      start_watch_task, start_watch_tasks):
         self.eng.thread_group_mgr = None
+        self.eng.engine_id = 'engine-fake-uuid'
         self.eng.create_periodic_tasks()
 
-        mock_get_all.assert_called_once_with(mock.ANY, tenant_safe=False,
-                                             show_hidden=True)
-        calls = start_watch_task.call_args_list
-        self.assertEqual(2, start_watch_task.call_count)
-        self.assertIn(mock.call(1, mock.ANY), calls)
-        self.assertIn(mock.call(2, mock.ANY), calls)
+        # The stacks are not loaded to start a task for each of them
+        self.assertFalse(mock_get_all.called)
+        self.assertFalse(start_watch_task.called)
+        start_watch_tasks.assert_called_once_with(mock.ANY)
+        # The rules are partitioned by the engine_id of this worker
+        self.assertEqual('engine-fake-uuid', self.eng.stack_watch.engine_id)
 
     @tools.stack_context('service_show_watch_test_stack', False)
     def test_show_watch(self):
@@ -158,6 +155,8 @@ class StackWatchTest(common.HeatTestCase):
         # Check the response has all keys defined in the engine API
         for key in rpc_api.WATCH_DATA_KEYS:
             self.assertIn(key, result[0])
+        self.assertEqual('show_watch_metric_1',
+                         result[0][rpc_api.WATCH_DATA_ALARM])
 
     @tools.stack_context('service_show_watch_state_test_stack')
     @mock.patch.object(stack.Stack, 'resource_by_refid')
@@ -242,3 +242,23 @@ class dependenciesTest(common.HeatTestCase):
         leaves = sorted(list(d.roots()))
 
         self.assertEqual(['last1', 'last2'], leaves)
+
+    def test_large_chain(self):
+        num_nodes = 10000
+        d = dependencies.Dependencies([(i + 1, i)
+                                       for i in range(num_nodes - 1)])
+
+        self.assertEqual(list(range(num_nodes)), list(iter(d)))
+        self.assertEqual(list(reversed(range(num_nodes))),
+                         list(reversed(d)))
+
+    def test_circular_deps_partial(self):
+        d = dependencies.Dependencies([('first', 'second'),
+                                       ('second', 'third'),
+                                       ('third', 'second'),
+                                       ('third', 'last')])
+
+        order = iter(d)
+        self.assertEqual('last', next(order))
+        self.assertRaises(dependencies.CircularDependencyException,
+                          next, order)
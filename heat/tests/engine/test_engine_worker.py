@@ -20,6 +20,7 @@ from heat.engine import resource
 from heat.engine import scheduler
 from heat.engine import stack
 from heat.engine import sync_point
+from heat.engine import template
 from heat.engine import worker
 from heat.rpc import worker_client
 from heat.tests import common
@@ -94,6 +95,59 @@ class WorkerServiceTest(common.HeatTestCase):
             mock_rpc_server.wait.assert_called_once_with()
 
 
+class TraversalCacheTest(common.HeatTestCase):
+    def setUp(self):
+        super(TraversalCacheTest, self).setUp()
+        self.ctx = utils.dummy_context()
+        self.stack = tools.get_stack(
+            'check_workflow_create_stack', self.ctx,
+            template=tools.string_template_five, convergence=True)
+        self.stack.converge_stack(self.stack.t)
+        self.cache = worker.TraversalCache(2)
+
+    def test_load_template_cached(self):
+        tmpl_load = self.patchobject(template.Template, 'load',
+                                     return_value=self.stack.t)
+        for i in range(3):
+            tmpl = self.cache.load_template(self.ctx, self.stack.id,
+                                            self.stack.current_traversal,
+                                            self.stack.t.id)
+            self.assertIs(self.stack.t, tmpl)
+        tmpl_load.assert_called_once_with(self.ctx, self.stack.t.id, None)
+
+    def test_new_traversal_invalidates(self):
+        tmpl_load = self.patchobject(template.Template, 'load',
+                                     return_value=self.stack.t)
+        self.cache.load_template(self.ctx, self.stack.id, 'traversal-1',
+                                 self.stack.t.id)
+        self.cache.load_template(self.ctx, 'other-stack', 'traversal-1',
+                                 self.stack.t.id)
+        self.cache.load_template(self.ctx, self.stack.id, 'traversal-2',
+                                 self.stack.t.id)
+        self.assertEqual(3, tmpl_load.call_count)
+        self.assertEqual(2, len(self.cache._cache))
+        self.assertNotIn((self.stack.id, 'traversal-1', self.stack.t.id),
+                         self.cache._cache)
+
+    def test_state_reused(self):
+        state = self.cache.get_state(self.stack)
+        deps = state.convergence_dependencies(self.stack)
+        self.assertEqual({'value'},
+                         state.dependent_attrs(self.stack, 'A'))
+
+        self.patchobject(self.stack, 'dependent_attrs_index',
+                         side_effect=AssertionError)
+        state = self.cache.get_state(self.stack)
+        self.assertIs(deps, state.convergence_dependencies(self.stack))
+        self.assertEqual({'value'},
+                         state.dependent_attrs(self.stack, 'A'))
+
+    def test_invalidate(self):
+        self.cache.get_state(self.stack)
+        self.cache.invalidate(self.stack.id)
+        self.assertEqual(0, len(self.cache._cache))
+
+
 @mock.patch.object(worker, 'construct_input_data')
 @mock.patch.object(worker, 'check_stack_complete')
 @mock.patch.object(worker, 'propagate_check_resource')
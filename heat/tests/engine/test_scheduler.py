@@ -312,6 +312,57 @@ class DependencyTaskGroupTest(common.HeatTestCase):
         self.assertEqual(e1, exc)
 
 
+class DependencyTaskGroupScaleTest(common.HeatTestCase):
+    num_nodes = 10000
+
+    def _synthetic_graph(self):
+        """
+        Return the edges of a synthetic graph made up of a long chain, with a
+        wide fan of nodes that each depend on a node in the chain.
+        """
+        chain = self.num_nodes // 10
+        edges = [(('chain', i + 1), ('chain', i)) for i in range(chain - 1)]
+        edges.extend((('fan', i), ('chain', i % chain))
+                     for i in range(self.num_nodes - chain))
+        return edges
+
+    def _run(self, reverse=False):
+        deps = dependencies.Dependencies(self._synthetic_graph())
+        graph = deps.graph(reverse=reverse)
+        complete = set()
+        steps = {'count': 0}
+
+        def task(key):
+            for requirement in graph[key]:
+                self.assertIn(requirement, complete)
+            for i in range(3):
+                steps['count'] += 1
+                yield
+            complete.add(key)
+
+        tg = scheduler.DependencyTaskGroup(deps, task, reverse=reverse)
+        runner = scheduler.TaskRunner(tg)
+        runner.start()
+        group_steps = 1
+        while not runner.step():
+            group_steps += 1
+
+        self.assertEqual(set(graph), complete)
+        self.assertEqual(3 * self.num_nodes, steps['count'])
+        self.assertFalse(tg._running_keys)
+        self.assertFalse(tg._ready_keys)
+        return group_steps
+
+    def test_large_graph(self):
+        # The fan nodes run alongside the chain, so the group takes only as
+        # many steps as the chain plus the last set of fan nodes.
+        self.assertEqual(3 * (self.num_nodes // 10 + 1), self._run())
+
+    def test_large_graph_reverse(self):
+        self.assertEqual(3 * (self.num_nodes // 10 + 1),
+                         self._run(reverse=True))
+
+
 class TaskTest(common.HeatTestCase):
 
     def setUp(self):
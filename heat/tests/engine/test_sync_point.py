@@ -12,9 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import eventlet
 import mock
+from oslo_config import cfg
 
 from heat.engine import sync_point
+from heat.objects import sync_point as sync_point_object
 from heat.tests import common
 from heat.tests.engine import tools
 from heat.tests import utils
@@ -66,3 +69,99 @@ class SyncPointTestCase(common.HeatTestCase):
     def test_serialize_input_data(self):
         res = sync_point.serialize_input_data({(3, 8): None})
         self.assertEqual({'input_data': [[[3, 8], None]]}, res)
+
+
+class AppendOnlySyncPointTestCase(common.HeatTestCase):
+    def setUp(self):
+        super(AppendOnlySyncPointTestCase, self).setUp()
+        cfg.CONF.set_override('sync_point_storage', 'append_only')
+        self.ctx = utils.dummy_context()
+        self.stack = tools.get_stack('test_stack', utils.dummy_context(),
+                                     template=tools.string_template_five,
+                                     convergence=True)
+        self.stack.converge_stack(self.stack.t, action=self.stack.CREATE)
+        self.traversal = self.stack.current_traversal
+
+    def test_sync_waiting(self):
+        resource = self.stack['C']
+        graph = self.stack.convergence_dependencies.graph()
+        update_input_data = self.patchobject(sync_point, 'update_input_data')
+
+        sender = (4, True)
+        mock_callback = mock.Mock()
+        sync_point.sync(self.ctx, resource.id, self.traversal, True,
+                        mock_callback, set(graph[(resource.id, True)]),
+                        {sender: None})
+        self.assertEqual({sender: None},
+                         sync_point.get_inputs(self.ctx, resource.id,
+                                               self.traversal, True))
+        self.assertFalse(mock_callback.called)
+        self.assertFalse(update_input_data.called)
+
+    def test_sync_non_waiting(self):
+        resource = self.stack['A']
+        graph = self.stack.convergence_dependencies.graph()
+
+        sender = (3, True)
+        mock_callback = mock.Mock()
+        sync_point.sync(self.ctx, resource.id, self.traversal, True,
+                        mock_callback, set(graph[(resource.id, True)]),
+                        {sender: None})
+        mock_callback.assert_called_once_with(
+            resource.id, sync_point.serialize_input_data({sender: None}))
+
+        # A repeated notification must not propagate a second time
+        sync_point.sync(self.ctx, resource.id, self.traversal, True,
+                        mock_callback, set(graph[(resource.id, True)]),
+                        {sender: None})
+        self.assertEqual(1, mock_callback.call_count)
+
+    def test_sync_not_found(self):
+        self.assertRaises(sync_point.SyncPointNotFound,
+                          sync_point.sync, self.ctx, 'missing',
+                          self.traversal, True, mock.Mock(),
+                          {(1, True)}, {(1, True): None})
+
+    def test_sync_concurrent_predecessors(self):
+        entity_id = 'load-balancer'
+        sync_point.create(self.ctx, entity_id, self.traversal, True,
+                          self.stack.id)
+        predecessors = set((i, True) for i in range(500))
+        mock_callback = mock.Mock()
+
+        count_inputs = sync_point_object.SyncPoint.count_inputs
+
+        def yielding_count(*args):
+            # Let every other predecessor record its input before any of
+            # them counts, so that they all race to propagate.
+            eventlet.sleep(0)
+            return count_inputs(*args)
+
+        self.patchobject(sync_point_object.SyncPoint, 'count_inputs',
+                         side_effect=yielding_count)
+        update_input_data = self.patchobject(
+            sync_point, 'update_input_data',
+            wraps=sync_point.update_input_data)
+        sync_point.stats.clear()
+
+        def predecessor_done(sender):
+            sync_point.sync(self.ctx, entity_id, self.traversal, True,
+                            mock_callback, predecessors,
+                            {sender: {'id': sender[0]}})
+
+        pool = eventlet.GreenPool(len(predecessors))
+        for sender in predecessors:
+            pool.spawn(predecessor_done, sender)
+        pool.waitall()
+
+        self.assertEqual(1, mock_callback.call_count)
+        entity, data = mock_callback.call_args[0]
+        self.assertEqual(entity_id, entity)
+        input_data = sync_point.deserialize_input_data(data)
+        self.assertEqual(predecessors, set(input_data))
+        # No predecessor ever retries: each one writes its own row and makes
+        # at most a single attempt to claim the sync point.
+        self.assertEqual(len(predecessors), update_input_data.call_count)
+        self.assertEqual(len(predecessors) - 1,
+                         sync_point.stats['lost_claims'])
+        self.assertEqual(0, sync_point.stats['retries'])
@@ -0,0 +1,68 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from heat.common import lru_cache
+from heat.tests import common
+
+
+class LRUCacheTest(common.HeatTestCase):
+
+    def test_get_put(self):
+        cache = lru_cache.LRUCache(2)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', 1)
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual('x', cache.get('b', 'x'))
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(2, cache.misses)
+
+    def test_evicts_least_recently_used(self):
+        cache = lru_cache.LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(2, len(cache))
+
+    def test_zero_size(self):
+        cache = lru_cache.LRUCache(0)
+        cache.put('a', 1)
+        self.assertEqual(0, len(cache))
+
+    def test_evict(self):
+        cache = lru_cache.LRUCache(10)
+        for key in [('s1', 't1'), ('s1', 't2'), ('s2', 't1')]:
+            cache.put(key, True)
+        cache.evict(lambda k: k[0] == 's1')
+        self.assertEqual(1, len(cache))
+        self.assertIn(('s2', 't1'), cache)
+
+    def test_pop_clear(self):
+        cache = lru_cache.LRUCache(10)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(1, cache.pop('a'))
+        self.assertIsNone(cache.pop('a'))
+        cache.clear()
+        self.assertEqual(0, len(cache))
+
+    def test_values(self):
+        cache = lru_cache.LRUCache(10)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        self.assertEqual([2, 1], cache.values())
+        self.assertEqual([('b', 2), ('a', 1)], cache.items())
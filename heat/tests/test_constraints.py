@@ -11,12 +11,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
 import six
 
 from heat.common import exception
 from heat.engine import constraints
 from heat.engine import environment
 from heat.tests import common
+from heat.tests import utils
 
 
 class SchemaTest(common.HeatTestCase):
@@ -511,3 +513,74 @@ class CustomConstraintTest(common.HeatTestCase):
 
         constraint = constraints.CustomConstraint("zero", environment=self.env)
         self.assertEqual("zero", constraint["custom_constraint"])
+
+
+class BaseCustomConstraintTest(common.HeatTestCase):
+
+    class TestConstraint(constraints.BaseCustomConstraint):
+        expected_exceptions = (ValueError,)
+
+        def validate_with_client(self, client, value):
+            if value != 'foo':
+                raise ValueError('%s not found' % value)
+
+    def setUp(self):
+        super(BaseCustomConstraintTest, self).setUp()
+        self.ctx = utils.dummy_context()
+        self.lookup = self.patchobject(
+            self.TestConstraint, 'validate_with_client',
+            side_effect=self.TestConstraint.validate_with_client,
+            autospec=True)
+
+    def test_lookups_repeated_outside_validation_pass(self):
+        self.assertTrue(self.TestConstraint().validate('foo', self.ctx))
+        self.assertTrue(self.TestConstraint().validate('foo', self.ctx))
+        self.assertEqual(2, self.lookup.call_count)
+
+    def test_lookups_shared_within_validation_pass(self):
+        with constraints.validation_pass(self.ctx):
+            self.assertTrue(self.TestConstraint().validate('foo', self.ctx))
+            self.assertTrue(self.TestConstraint().validate('foo', self.ctx))
+            constraint = self.TestConstraint()
+            self.assertFalse(constraint.validate('bar', self.ctx))
+            self.assertFalse(constraint.validate('bar', self.ctx))
+            self.assertEqual("Error validating value 'bar': bar not found",
+                             constraint.error('bar'))
+            with constraints.validation_pass(self.ctx):
+                self.assertTrue(self.TestConstraint().validate('foo',
+                                                               self.ctx))
+        self.assertEqual(2, self.lookup.call_count)
+
+        self.assertTrue(self.TestConstraint().validate('foo', self.ctx))
+        self.assertEqual(3, self.lookup.call_count)
+
+    def test_lookups_not_shared_between_contexts(self):
+        other_ctx = utils.dummy_context()
+        with constraints.validation_pass(self.ctx):
+            with constraints.validation_pass(other_ctx):
+                self.assertTrue(self.TestConstraint().validate('foo',
+                                                               self.ctx))
+                self.assertTrue(self.TestConstraint().validate('foo',
+                                                               other_ctx))
+        self.assertEqual(2, self.lookup.call_count)
+
+    def test_lookups_not_shared_between_classes_with_same_name(self):
+        class TestConstraint(constraints.BaseCustomConstraint):
+            expected_exceptions = (ValueError,)
+
+            def validate_with_client(self, client, value):
+                raise ValueError('%s not found' % value)
+
+        with constraints.validation_pass(self.ctx):
+            self.assertTrue(self.TestConstraint().validate('foo', self.ctx))
+            self.assertFalse(TestConstraint().validate('foo', self.ctx))
+        self.assertEqual(1, self.lookup.call_count)
+
+    def test_unexpected_error_not_shared(self):
+        self.lookup.side_effect = [KeyError('boom'), None]
+        with constraints.validation_pass(self.ctx):
+            self.assertRaises(KeyError, self.TestConstraint().validate,
+                              'foo', self.ctx)
+            self.assertTrue(self.TestConstraint().validate('foo', self.ctx))
+        self.assertEqual([mock.call(mock.ANY, self.ctx.clients, 'foo')] * 2,
+                         self.lookup.call_args_list)
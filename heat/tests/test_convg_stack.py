@@ -442,6 +442,51 @@ class StackConvergenceCreateUpdateDeleteTest(common.HeatTestCase):
         # should return resource with template id 2 which is prev template
         self.assertEqual(a_res_2.id, best_res.id)
 
+    def test_get_best_existing_db_resources(self, mock_cr):
+        stack = tools.get_stack('test_stack', utils.dummy_context(),
+                                template=tools.string_template_five,
+                                convergence=True)
+        stack.store()
+        stack.prev_raw_template_id = 2
+        stack.t.id = 1
+        dummy_res = stack.resources['A']
+
+        def existing(name, rsrc_id, tmpl_id):
+            ext_rsrc = res.Resource(name, dummy_res.t, stack)
+            ext_rsrc.current_template_id = tmpl_id
+            ext_rsrc.id = rsrc_id
+            return ext_rsrc
+
+        stack.ext_rsrcs_db = {1: existing('A', 1, 1),
+                              2: existing('A', 2, 2),
+                              3: existing('B', 3, 2),
+                              4: existing('B', 4, 3),
+                              5: existing('C', 5, 3)}
+        best = stack._get_best_existing_rsrcs_db()
+        self.assertEqual({'A': 1, 'B': 3},
+                         dict((n, r.id) for n, r in best.items()))
+
+    def test_update_or_store_resources_indexes_once(self, mock_cr):
+        stack = tools.get_stack('test_stack', utils.dummy_context(),
+                                template=tools.string_template_five,
+                                convergence=True)
+        stack.store()
+        stack.converge_stack(template=stack.t, action=stack.CREATE)
+
+        mock_index = self.patchobject(
+            stack, '_get_best_existing_rsrcs_db',
+            wraps=stack._get_best_existing_rsrcs_db)
+        mock_trans = self.patchobject(parser.db_api, 'transaction',
+                                      wraps=parser.db_api.transaction)
+        # update using the same template, so every resource is reused
+        rsrcs = stack._update_or_store_resources()
+
+        self.assertEqual(1, mock_index.call_count)
+        self.assertEqual(1, mock_trans.call_count)
+        self.assertEqual(set(['A', 'B', 'C', 'D', 'E']), set(rsrcs))
+        for name, rsrc in rsrcs.items():
+            self.assertEqual(stack.ext_rsrcs_db[rsrc.id].name, name)
+
 
 class TestConvgStackRollback(common.HeatTestCase):
 
@@ -13,6 +13,7 @@
 
 import uuid
 
+import eventlet
 from eventlet import event as grevent
 import mock
 import mox
@@ -92,6 +93,30 @@ policy_template = '''
 }
 '''
 
+policy_metadata_template = '''
+{
+  "AWSTemplateFormatVersion" : "2010-09-09",
+  "Description" : "alarming",
+  "Resources" : {
+    "WebServerScaleDownPolicy" : {
+      "Type" : "AWS::AutoScaling::ScalingPolicy",
+      "Properties" : {
+        "AdjustmentType" : "ChangeInCapacity",
+        "AutoScalingGroupName" : "",
+        "Cooldown" : "60",
+        "ScalingAdjustment" : "-1"
+      }
+    },
+    "Random" : {
+      "Type" : "OS::Heat::RandomString",
+      "Metadata" : {
+        "policy" : {"Ref" : "WebServerScaleDownPolicy"}
+      }
+    }
+  }
+}
+'''
+
 user_policy_template = '''
 {
   "AWSTemplateFormatVersion" : "2010-09-09",
@@ -1225,25 +1250,23 @@ class StackServiceAuthorizeTest(common.HeatTestCase):
 
     @tools.stack_context('service_authorize_user_attribute_error_test_stack')
     def test_stack_authorize_stack_user_attribute_error(self):
-        self.m.StubOutWithMock(json, 'loads')
-        json.loads(None).AndRaise(AttributeError)
-        self.m.ReplayAll()
-        self.assertFalse(self.eng._authorize_stack_user(self.ctx,
-                                                        self.stack,
-                                                        'foo'))
-        self.m.VerifyAll()
+        # Only stub json.loads for the call, since loading the stack's
+        # template to delete the stack afterwards also uses it
+        with mock.patch.object(json, 'loads',
+                               side_effect=AttributeError) as mock_loads:
+            self.assertFalse(self.eng._authorize_stack_user(self.ctx,
+                                                            self.stack,
+                                                            'foo'))
+        mock_loads.assert_called_once_with(None)
 
     @tools.stack_context('service_authorize_stack_user_type_error_test_stack')
     def test_stack_authorize_stack_user_type_error(self):
-        self.m.StubOutWithMock(json, 'loads')
-        json.loads(mox.IgnoreArg()).AndRaise(TypeError)
-        self.m.ReplayAll()
-
-        self.assertFalse(self.eng._authorize_stack_user(self.ctx,
-                                                        self.stack,
-                                                        'foo'))
-
-        self.m.VerifyAll()
+        with mock.patch.object(json, 'loads',
+                               side_effect=TypeError) as mock_loads:
+            self.assertFalse(self.eng._authorize_stack_user(self.ctx,
+                                                            self.stack,
+                                                            'foo'))
+        self.assertEqual(1, mock_loads.call_count)
 
     def test_stack_authorize_stack_user(self):
         self.ctx = utils.dummy_context()
@@ -1390,6 +1413,31 @@ class StackServiceTest(common.HeatTestCase):
 
         self.m.VerifyAll()
 
+    @tools.stack_context('service_list_summary_test_stack')
+    def test_stack_list_summary(self):
+        self.stack.tags = ['tag1']
+        self.stack.store()
+
+        with mock.patch.object(parser.Stack, '_from_db') as mock_from_db:
+            with mock.patch.object(templatem.Template,
+                                   'load') as mock_load:
+                sl = self.eng.list_stacks(self.ctx, summary=True)
+        self.assertFalse(mock_from_db.called)
+        self.assertFalse(mock_load.called)
+
+        self.assertEqual(1, len(sl))
+        s = sl[0]
+        self.assertEqual(self.stack.name, s['stack_name'])
+        self.assertEqual(dict(self.stack.identifier()), s['stack_identity'])
+        self.assertEqual(self.stack.action, s['stack_action'])
+        self.assertEqual(self.stack.status, s['stack_status'])
+        self.assertEqual(self.stack.status_reason, s['stack_status_reason'])
+        self.assertEqual(['tag1'], s['tags'])
+        self.assertIsNotNone(s['creation_time'])
+        self.assertEqual(self.stack.t[self.stack.t.DESCRIPTION],
+                         s['description'])
+        self.assertNotIn('parameters', s)
+
     @mock.patch.object(stack_object.Stack, 'get_all')
     def test_stack_list_passes_marker_info(self, mock_stack_get_all):
         limit = object()
@@ -2243,7 +2291,8 @@ class StackServiceTest(common.HeatTestCase):
         self.m.VerifyAll()
 
     def test_signal_calls_metadata_update(self):
-        stack = tools.get_stack('signal_reception', self.ctx, policy_template)
+        stack = tools.get_stack('signal_reception', self.ctx,
+                                policy_metadata_template)
         self.stack = stack
         tools.setup_keystone_mocks(self.m, stack)
         self.m.ReplayAll()
@@ -2268,6 +2317,161 @@ class StackServiceTest(common.HeatTestCase):
                                  sync_call=True)
         self.m.VerifyAll()
 
+    def test_signal_skips_unrelated_metadata_update(self):
+        stack = tools.get_stack('signal_reception', self.ctx, policy_template)
+        self.stack = stack
+        tools.setup_keystone_mocks(self.m, stack)
+        self.m.ReplayAll()
+        stack.store()
+        stack.create()
+
+        self.m.StubOutWithMock(service.EngineService, '_get_stack')
+        s = stack_object.Stack.get_by_id(self.ctx, self.stack.id)
+        service.EngineService._get_stack(self.ctx,
+                                         self.stack.identifier()).AndReturn(s)
+
+        self.m.StubOutWithMock(res.Resource, 'signal')
+        res.Resource.signal(mox.IgnoreArg()).AndReturn(None)
+        # this will never be called, as the metadata of the Random resource
+        # does not refer to the policy
+        self.m.StubOutWithMock(res.Resource, 'metadata_update')
+        self.m.ReplayAll()
+
+        self.eng.resource_signal(self.ctx,
+                                 dict(self.stack.identifier()),
+                                 'WebServerScaleDownPolicy', None,
+                                 sync_call=True)
+        self.m.VerifyAll()
+
+    @mock.patch.object(service.eventlet, 'sleep')
+    @mock.patch.object(parser.Stack, 'load')
+    def test_signal_metadata_refresh_coalesced(self, mock_load, mock_sleep):
+        cfg.CONF.set_override('signal_metadata_refresh_delay', 0.5)
+        self.eng.thread_group_mgr = mock.Mock()
+        refresh = self.patchobject(self.eng, '_refresh_metadata')
+
+        self.eng._refresh_metadata_later(self.ctx, 'stack_id', ['S1'])
+        self.eng._refresh_metadata_later(self.ctx, 'stack_id', ['S1', 'S2'])
+        self.assertEqual({'stack_id': set(['S1', 'S2'])},
+                         self.eng._pending_metadata_refreshes)
+        self.assertEqual(1, self.eng.thread_group_mgr.start.call_count)
+
+        stack_id, refresh_task = self.eng.thread_group_mgr.start.call_args[0]
+        self.assertEqual('stack_id', stack_id)
+        refresh_task()
+        mock_sleep.assert_called_once_with(0.5)
+        mock_load.assert_called_once_with(self.ctx, stack_id='stack_id',
+                                          use_stored_context=True)
+        refresh.assert_called_once_with(mock_load.return_value,
+                                        set(['S1', 'S2']))
+        self.assertEqual({}, self.eng._pending_metadata_refreshes)
+
+    def test_signal_reception_batched(self):
+        cfg.CONF.set_override('batch_resource_signals', True)
+        self.eng.thread_group_mgr = mock.Mock()
+        stack = tools.get_stack('signal_reception_batched', self.ctx,
+                                policy_template)
+        self.stack = stack
+        tools.setup_keystone_mocks(self.m, stack)
+        self.m.ReplayAll()
+        stack.store()
+        stack.create()
+
+        s = stack_object.Stack.get_by_id(self.ctx, self.stack.id)
+        self.patchobject(service.EngineService, '_get_stack', return_value=s)
+        mock_load = self.patchobject(parser.Stack, 'load',
+                                     wraps=parser.Stack.load)
+        mock_signal = self.patchobject(res.Resource, 'signal')
+
+        for data in ({'food': 'yum'}, {'food': 'mmm'}):
+            self.eng.resource_signal(self.ctx,
+                                     dict(self.stack.identifier()),
+                                     'WebServerScaleDownPolicy', data)
+
+        # The second signal is queued, without loading the stack again
+        self.assertEqual(1, mock_load.call_count)
+        self.assertEqual(1, self.eng.thread_group_mgr.start.call_count)
+        key = (self.stack.id, 'WebServerScaleDownPolicy')
+        self.assertEqual([{'food': 'yum'}, {'food': 'mmm'}],
+                         self.eng._queued_signals[key])
+
+        args = self.eng.thread_group_mgr.start.call_args[0]
+        self.assertEqual(self.stack.id, args[0])
+        args[1](*args[2:])
+        self.assertEqual([mock.call({'food': 'yum'}),
+                          mock.call({'food': 'mmm'})],
+                         mock_signal.call_args_list)
+        self.assertEqual({}, self.eng._queued_signals)
+
+    def test_signal_reception_batched_load_yields(self):
+        cfg.CONF.set_override('batch_resource_signals', True)
+        self.eng.thread_group_mgr = mock.Mock()
+        stack = tools.get_stack('signal_reception_batched', self.ctx,
+                                policy_template)
+        self.stack = stack
+        tools.setup_keystone_mocks(self.m, stack)
+        self.m.ReplayAll()
+        stack.store()
+        stack.create()
+
+        s = stack_object.Stack.get_by_id(self.ctx, self.stack.id)
+        self.patchobject(service.EngineService, '_get_stack', return_value=s)
+        load = parser.Stack.load
+
+        def yielding_load(*args, **kwargs):
+            eventlet.sleep(0)
+            return load(*args, **kwargs)
+
+        mock_load = self.patchobject(parser.Stack, 'load',
+                                     side_effect=yielding_load)
+        self.patchobject(res.Resource, 'signal')
+
+        pool = eventlet.GreenPool()
+        for data in ({'food': 'yum'}, {'food': 'mmm'}):
+            pool.spawn(self.eng.resource_signal, self.ctx,
+                       dict(self.stack.identifier()),
+                       'WebServerScaleDownPolicy', data)
+        pool.waitall()
+
+        # The signal that arrives while the stack is loading is queued
+        # behind the first one, rather than loading the stack again
+        self.assertEqual(1, mock_load.call_count)
+        self.assertEqual(1, self.eng.thread_group_mgr.start.call_count)
+        key = (self.stack.id, 'WebServerScaleDownPolicy')
+        self.assertEqual([{'food': 'yum'}, {'food': 'mmm'}],
+                         self.eng._queued_signals[key])
+
+    def test_signal_reception_batched_load_failed(self):
+        cfg.CONF.set_override('batch_resource_signals', True)
+        self.eng.thread_group_mgr = mock.Mock()
+        stack = tools.get_stack('signal_reception_batched', self.ctx,
+                                policy_template)
+        self.stack = stack
+        tools.setup_keystone_mocks(self.m, stack)
+        self.m.ReplayAll()
+        stack.store()
+        stack.create()
+
+        s = stack_object.Stack.get_by_id(self.ctx, self.stack.id)
+        self.patchobject(service.EngineService, '_get_stack', return_value=s)
+        mock_load = self.patchobject(parser.Stack, 'load',
+                                     side_effect=exception.NotFound())
+        ex = self.assertRaises(dispatcher.ExpectedException,
+                               self.eng.resource_signal, self.ctx,
+                               dict(self.stack.identifier()),
+                               'WebServerScaleDownPolicy', {'food': 'yum'})
+        self.assertEqual(exception.NotFound, ex.exc_info[0])
+
+        # The queue reserved for the signal is dropped, so that the next
+        # signal loads the stack again
+        self.assertEqual({}, self.eng._queued_signals)
+        mock_load.side_effect = None
+        mock_load.return_value = stack
+        self.eng.resource_signal(self.ctx, dict(self.stack.identifier()),
+                                 'WebServerScaleDownPolicy', {'food': 'mmm'})
+        self.assertEqual(2, mock_load.call_count)
+        self.assertEqual(1, self.eng.thread_group_mgr.start.call_count)
+
     def test_signal_no_calls_metadata_update(self):
         stack = tools.get_stack('signal_reception', self.ctx, policy_template)
         self.stack = stack
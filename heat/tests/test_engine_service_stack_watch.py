@@ -11,7 +11,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
 import mock
+from oslo_config import cfg
+from oslo_utils import timeutils
+import six
 
 from heat.engine import service_stack_watch
 from heat.rpc import api as rpc_api
@@ -26,38 +31,16 @@ class StackServiceWatcherTest(common.HeatTestCase):
         self.ctx = utils.dummy_context(tenant_id='stack_service_test_tenant')
 
     @mock.patch.object(service_stack_watch.stack_object.Stack,
-                       'get_all_by_owner_id')
+                       'get_nested_ids')
     @mock.patch.object(service_stack_watch.watch_rule_object.WatchRule,
                        'get_all_by_stack')
     @mock.patch.object(service_stack_watch.watch_rule_object.WatchRule,
                        'update_by_id')
     def test_periodic_watch_task_not_created(self, watch_rule_update,
                                              watch_rule_get_all_by_stack,
-                                             stack_get_all_by_owner_id):
-        """If there is no cloud watch lite alarm, then don't create
-        a periodic task for it.
-        """
-        stack_id = 83
-        watch_rule_get_all_by_stack.return_value = []
-        stack_get_all_by_owner_id.return_value = []
-        tg = mock.Mock()
-        sw = service_stack_watch.StackWatch(tg)
-        sw.start_watch_task(stack_id, self.ctx)
-
-        # assert that add_timer is NOT called.
-        self.assertEqual([], tg.add_timer.call_args_list)
-
-    @mock.patch.object(service_stack_watch.stack_object.Stack,
-                       'get_all_by_owner_id')
-    @mock.patch.object(service_stack_watch.watch_rule_object.WatchRule,
-                       'get_all_by_stack')
-    @mock.patch.object(service_stack_watch.watch_rule_object.WatchRule,
-                       'update_by_id')
-    def test_periodic_watch_task_created(self, watch_rule_update,
-                                         watch_rule_get_all_by_stack,
-                                         stack_get_all_by_owner_id):
-        """If there is no cloud watch lite alarm, then DO create
-        a periodic task for it.
+                                             stack_get_nested_ids):
+        """A stack does not get a periodic task of its own, since the
+        watch rules of every stack are evaluated by a single task.
         """
         stack_id = 86
         wr1 = mock.Mock()
@@ -65,25 +48,26 @@ class StackServiceWatcherTest(common.HeatTestCase):
         wr1.state = rpc_api.WATCH_STATE_NODATA
 
         watch_rule_get_all_by_stack.return_value = [wr1]
-        stack_get_all_by_owner_id.return_value = []
+        stack_get_nested_ids.return_value = [stack_id]
         tg = mock.Mock()
-        sw = service_stack_watch.StackWatch(tg)
+        sw = service_stack_watch.StackWatch(tg, 'engine-1')
         sw.start_watch_task(stack_id, self.ctx)
 
-        # assert that add_timer IS called.
-        self.assertEqual([mock.call(stack_id, sw.periodic_watcher_task,
-                                    sid=stack_id)],
-                         tg.add_timer.call_args_list)
+        # assert that add_timer is NOT called.
+        self.assertEqual([], tg.add_timer.call_args_list)
+        self.assertEqual([mock.call(self.ctx, 4,
+                                    {'last_evaluated': mock.ANY})],
+                         watch_rule_update.call_args_list)
 
     @mock.patch.object(service_stack_watch.stack_object.Stack,
-                       'get_all_by_owner_id')
+                       'get_nested_ids')
     @mock.patch.object(service_stack_watch.watch_rule_object.WatchRule,
                        'get_all_by_stack')
     @mock.patch.object(service_stack_watch.watch_rule_object.WatchRule,
                        'update_by_id')
-    def test_periodic_watch_task_created_nested(self, watch_rule_update,
-                                                watch_rule_get_all_by_stack,
-                                                stack_get_all_by_owner_id):
+    def test_start_watch_task_nested(self, watch_rule_update,
+                                     watch_rule_get_all_by_stack,
+                                     stack_get_nested_ids):
         stack_id = 90
 
         def my_wr_get(cnxt, sid):
@@ -96,19 +80,127 @@ class StackServiceWatcherTest(common.HeatTestCase):
 
         watch_rule_get_all_by_stack.side_effect = my_wr_get
 
-        def my_nested_get(cnxt, sid):
-            if sid == stack_id:
-                nested_stack = mock.Mock()
-                nested_stack.id = 55
-                return [nested_stack]
-            return []
-
-        stack_get_all_by_owner_id.side_effect = my_nested_get
+        stack_get_nested_ids.return_value = [stack_id, 55]
         tg = mock.Mock()
-        sw = service_stack_watch.StackWatch(tg)
+        sw = service_stack_watch.StackWatch(tg, 'engine-1')
         sw.start_watch_task(stack_id, self.ctx)
 
-        # assert that add_timer IS called.
-        self.assertEqual([mock.call(stack_id, sw.periodic_watcher_task,
-                                    sid=stack_id)],
+        # assert that the rule of the nested stack is reset
+        self.assertEqual([mock.call(self.ctx, 4,
+                                    {'last_evaluated': mock.ANY})],
+                         watch_rule_update.call_args_list)
+
+    @mock.patch.object(service_stack_watch.watch_rule_object.WatchRule,
+                       'update_all')
+    def test_start_watch_tasks(self, watch_rule_update_all):
+        tg = mock.Mock()
+        sw = service_stack_watch.StackWatch(tg, 'engine-1')
+        sw.start_watch_tasks(self.ctx)
+
+        watch_rule_update_all.assert_called_once_with(
+            self.ctx, {'last_evaluated': mock.ANY})
+        # assert that a single periodic task is created
+        self.assertEqual([mock.call(cfg.CONF.periodic_interval,
+                                    sw.periodic_watcher_task)],
                          tg.add_timer.call_args_list)
+
+    @mock.patch.object(service_stack_watch.service_objects.Service,
+                       'get_all')
+    @mock.patch.object(service_stack_watch.watch_rule_object.WatchRule,
+                       'get_all')
+    @mock.patch.object(service_stack_watch.watchrule.WatchRule, 'load')
+    def test_check_watches(self, watch_rule_load, watch_rule_get_all,
+                           service_get_all):
+        service_get_all.return_value = []
+        wr1 = mock.Mock(stack_id='stack1')
+        wr2 = mock.Mock(stack_id='stack2')
+        watch_rule_get_all.return_value = [wr1, wr2]
+        action = mock.Mock()
+        rule1 = mock.Mock()
+        rule1.evaluate.return_value = [action]
+        rule2 = mock.Mock()
+        rule2.evaluate.return_value = []
+        watch_rule_load.side_effect = [rule1, rule2]
+
+        tg = mock.Mock()
+        sw = service_stack_watch.StackWatch(tg, 'engine-1')
+        sw.check_watches()
+
+        watch_rule_get_all.assert_called_once_with(
+            mock.ANY,
+            exclude_states=[rpc_api.WATCH_STATE_CEILOMETER_CONTROLLED,
+                            rpc_api.WATCH_STATE_SUSPENDED])
+        self.assertEqual([mock.call(mock.ANY, watch=wr1),
+                          mock.call(mock.ANY, watch=wr2)],
+                         watch_rule_load.call_args_list)
+        rule1.evaluate.assert_called_once_with(use_stored_context=True)
+        rule2.evaluate.assert_called_once_with(use_stored_context=True)
+        # assert that actions are only run for the rule that needs them
+        self.assertEqual([mock.call('stack1', sw._run_alarm_actions,
+                                    [action], rule1.get_details())],
+                         tg.start.call_args_list)
+
+    @mock.patch.object(service_stack_watch.service_objects.Service,
+                       'get_all')
+    @mock.patch.object(service_stack_watch.watch_rule_object.WatchRule,
+                       'get_all')
+    @mock.patch.object(service_stack_watch.watchrule.WatchRule, 'load')
+    def test_check_watches_partitioned(self, watch_rule_load,
+                                       watch_rule_get_all, service_get_all):
+        now = timeutils.utcnow()
+        up = mock.Mock(binary='heat-engine', engine_id='engine-a',
+                       updated_at=now, report_interval=60)
+        down = mock.Mock(binary='heat-engine', engine_id='engine-c',
+                         updated_at=now - datetime.timedelta(seconds=3600),
+                         report_interval=60)
+        service_get_all.return_value = [up, down]
+
+        sw = service_stack_watch.StackWatch(mock.Mock(), 'engine-b')
+        stack_ids = ['stack%d' % i for i in six.moves.xrange(20)]
+        watch_rule_get_all.return_value = [mock.Mock(stack_id=sid)
+                                           for sid in stack_ids]
+        sw.check_watches()
+
+        # assert that only this engine's share of the stacks is evaluated,
+        # and that the engine which is down is not given a share
+        expected = [sid for sid in stack_ids
+                    if sw._partition(sid, 2) == 1]
+        self.assertNotEqual([], expected)
+        self.assertNotEqual(stack_ids, expected)
+        self.assertEqual(expected,
+                         [c[1]['watch'].stack_id
+                          for c in watch_rule_load.call_args_list])
+
+    @mock.patch.object(service_stack_watch.service_objects.Service,
+                       'get_all')
+    @mock.patch.object(service_stack_watch.watch_rule_object.WatchRule,
+                       'get_all')
+    @mock.patch.object(service_stack_watch.watchrule.WatchRule, 'load')
+    def test_check_watches_workers_same_host(self, watch_rule_load,
+                                             watch_rule_get_all,
+                                             service_get_all):
+        now = timeutils.utcnow()
+        workers = [mock.Mock(binary='heat-engine', engine_id=engine_id,
+                             updated_at=now, report_interval=60)
+                   for engine_id in ('engine-a', 'engine-b')]
+        for srv in workers:
+            srv.host = 'engine-host'
+        service_get_all.return_value = workers
+        stack_ids = ['stack%d' % i for i in six.moves.xrange(20)]
+        watch_rule_get_all.return_value = [mock.Mock(stack_id=sid)
+                                           for sid in stack_ids]
+
+        evaluated = []
+        for srv in workers:
+            sw = service_stack_watch.StackWatch(mock.Mock(), srv.engine_id)
+            sw.check_watches()
+            evaluated.append([c[1]['watch'].stack_id
+                              for c in watch_rule_load.call_args_list])
+            watch_rule_load.reset_mock()
+
+        # assert that the workers on a host share the stacks between them,
+        # so that the rules of each stack are evaluated exactly once
+        self.assertNotEqual([], evaluated[0])
+        self.assertNotEqual([], evaluated[1])
+        self.assertEqual(stack_ids, sorted(evaluated[0] + evaluated[1],
+                                           key=stack_ids.index))
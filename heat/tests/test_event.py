@@ -14,13 +14,16 @@
 import datetime
 import mock
 from oslo_config import cfg
+from oslo_context import context as oslo_context
 
 from heat.common import exception
+from heat.db import api as db_api
 from heat.engine import event
 from heat.engine import rsrc_defn
 from heat.engine import stack
 from heat.engine import template
 from heat.objects import event as event_object
+from heat.objects import resource_properties_data as rpd_objects
 from heat.objects import stack as stack_object
 from heat.tests import common
 from heat.tests import generic_resource as generic_rsrc
@@ -28,6 +31,7 @@ from heat.tests import utils
 
 cfg.CONF.import_opt('event_purge_batch_size', 'heat.common.config')
 cfg.CONF.import_opt('max_events_per_stack', 'heat.common.config')
+cfg.CONF.import_opt('event_properties_storage', 'heat.common.config')
 
 tmpl = {
     'HeatTemplateFormatVersion': '2012-12-12',
@@ -125,6 +129,62 @@ class EventTest(common.HeatTestCase):
         self.assertIsNotNone(loaded_e.timestamp)
         self.assertEqual({'Foo': 'goo'}, loaded_e.resource_properties)
 
+    def test_store_properties_reference(self):
+        cfg.CONF.set_override('event_properties_storage', 'reference')
+        self.resource._update_stored_properties()
+
+        self.resource._add_event('TEST', 'IN_PROGRESS', 'Testing')
+        self.resource._add_event('TEST', 'COMPLETE', 'Tested')
+        event.writer.flush(self.stack.id)
+
+        events = event_object.Event.get_all_by_stack(self.ctx, self.stack.id)
+        self.assertEqual(2, len(events))
+        prop_data_id = events[0].rsrc_prop_data_id
+        self.assertIsNotNone(prop_data_id)
+        self.assertEqual(prop_data_id, events[1].rsrc_prop_data_id)
+        self.assertIsNone(events[0].resource_properties)
+        self.assertEqual(1, len(db_api.resource_prop_data_get_all(
+            self.ctx, [prop_data_id])))
+
+        loaded_e = event.Event.load(self.ctx, events[0].id)
+        self.assertEqual({'Foo': 'goo'}, loaded_e.resource_properties)
+
+    def test_store_properties_reference_unchanged(self):
+        cfg.CONF.set_override('event_properties_storage', 'reference')
+        self.resource._update_stored_properties()
+        create = self.patchobject(db_api, 'resource_prop_data_create',
+                                  wraps=db_api.resource_prop_data_create)
+
+        self.resource._add_event('TEST', 'IN_PROGRESS', 'Testing')
+        self.resource._add_event('TEST', 'COMPLETE', 'Tested')
+        self.assertEqual(1, create.call_count)
+
+        self.resource._update_stored_properties()
+        self.resource._add_event('TEST', 'IN_PROGRESS', 'Testing again')
+        self.assertEqual(2, create.call_count)
+        event.writer.flush(self.stack.id)
+
+        events = event_object.Event.get_all_by_stack(self.ctx, self.stack.id)
+        self.assertEqual(1, len(set(ev.rsrc_prop_data_id for ev in events)))
+
+    def test_load_given_prop_data(self):
+        cfg.CONF.set_override('event_properties_storage', 'reference')
+        self.resource._update_stored_properties()
+        self.resource._add_event('TEST', 'IN_PROGRESS', 'Testing')
+        event.writer.flush(self.stack.id)
+
+        ev = event_object.Event.get_all_by_stack(self.ctx, self.stack.id)[0]
+        prop_data = rpd_objects.ResourcePropertiesData.get_all(
+            self.ctx, [ev.rsrc_prop_data_id])
+
+        with mock.patch.object(rpd_objects.ResourcePropertiesData,
+                               'get_all') as mock_get_all:
+            loaded_e = event.Event.load(self.ctx, ev.id, event=ev,
+                                        stack=self.stack,
+                                        prop_data=prop_data)
+            self.assertEqual({'Foo': 'goo'}, loaded_e.resource_properties)
+        self.assertFalse(mock_get_all.called)
+
     def test_store_caps_events(self):
         cfg.CONF.set_override('event_purge_batch_size', 1)
         cfg.CONF.set_override('max_events_per_stack', 1)
@@ -145,6 +205,139 @@ class EventTest(common.HeatTestCase):
         self.assertEqual(1, len(events))
         self.assertEqual('arizona', events[0].physical_resource_id)
 
+    def test_store_counts_events(self):
+        cfg.CONF.set_override('event_purge_batch_size', 2)
+        cfg.CONF.set_override('max_events_per_stack', 3)
+        count = self.patchobject(event_object.Event, 'count_all_by_stack',
+                                 wraps=event_object.Event.count_all_by_stack)
+
+        for i in range(4):
+            e = event.Event(self.ctx, self.stack, 'TEST', 'IN_PROGRESS',
+                            'Testing', 'phys-%d' % i,
+                            self.resource.properties,
+                            self.resource.name, self.resource.type())
+            e.store()
+        # counted initially, after a batch of two events, and before pruning
+        self.assertEqual(3, count.call_count)
+        events = sorted(event_object.Event.get_all_by_stack(self.ctx,
+                                                            self.stack.id),
+                        key=lambda ev: ev.id)
+        self.assertEqual(['phys-2', 'phys-3'],
+                         [ev.physical_resource_id for ev in events])
+
+    def test_store_counts_events_from_other_engines(self):
+        cfg.CONF.set_override('event_purge_batch_size', 1)
+        cfg.CONF.set_override('max_events_per_stack', 4)
+        writers = [event.EventWriter(), event.EventWriter()]
+
+        def write(writer, i):
+            writer.write(self.ctx, {'stack_id': self.stack.id,
+                                    'resource_name': self.resource.name,
+                                    'physical_resource_id': 'phys-%d' % i})
+
+        for i, writer in enumerate(writers * 3):
+            write(writer, i)
+        events = event_object.Event.get_all_by_stack(self.ctx, self.stack.id)
+        self.assertEqual(4, len(events))
+
+    def test_store_deferred(self):
+        cfg.CONF.set_override('event_write_batch_size', 3)
+        spawn = self.patchobject(event.eventlet, 'spawn_after')
+
+        def store(i):
+            e = event.Event(self.ctx, self.stack, 'TEST', 'IN_PROGRESS',
+                            'Testing', 'phys-%d' % i,
+                            self.resource.properties,
+                            self.resource.name, self.resource.type())
+            self.assertIsNone(e.store(defer=True))
+
+        store(0)
+        store(1)
+        self.assertEqual([], event_object.Event.get_all_by_stack(
+            self.ctx, self.stack.id))
+        spawn.assert_called_once_with(1.0, event.writer._flush_later,
+                                      self.stack.id)
+        store(2)
+        self.assertEqual(3, len(event_object.Event.get_all_by_stack(
+            self.ctx, self.stack.id)))
+
+        store(3)
+        event.writer._flush_later(self.stack.id)
+        self.assertEqual(4, len(event_object.Event.get_all_by_stack(
+            self.ctx, self.stack.id)))
+
+    def test_store_deferred_unbatched(self):
+        spawn = self.patchobject(event.eventlet, 'spawn_after')
+        create = self.patchobject(event_object.Event, 'create_many',
+                                  wraps=event_object.Event.create_many)
+        current = oslo_context.get_current()
+
+        e = event.Event(self.ctx, self.stack, 'TEST', 'IN_PROGRESS',
+                        'Testing', 'phys-0', self.resource.properties,
+                        self.resource.name, self.resource.type())
+        e.store(defer=True)
+        self.assertFalse(spawn.called)
+        self.assertIs(self.ctx, create.call_args[0][0])
+        self.assertIs(current, oslo_context.get_current())
+
+    def test_store_deferred_context(self):
+        cfg.CONF.set_override('event_write_batch_size', 2)
+        self.patchobject(event.eventlet, 'spawn_after')
+        create = self.patchobject(event_object.Event, 'create_many',
+                                  wraps=event_object.Event.create_many)
+        current = oslo_context.get_current()
+
+        def store(i):
+            e = event.Event(self.ctx, self.stack, 'TEST', 'IN_PROGRESS',
+                            'Testing', 'phys-%d' % i,
+                            self.resource.properties,
+                            self.resource.name, self.resource.type())
+            e.store(defer=True)
+
+        # a full batch is written by the request that fills it
+        store(0)
+        store(1)
+        self.assertIs(self.ctx, create.call_args[0][0])
+
+        # a batch flushed later is written from a thread of its own, so it
+        # uses an admin context without replacing the thread's context
+        store(2)
+        event.writer._flush_later(self.stack.id)
+        context = create.call_args[0][0]
+        self.assertIsNot(self.ctx, context)
+        self.assertTrue(context.is_admin)
+        self.assertIs(current, oslo_context.get_current())
+
+    def test_store_flushes_deferred(self):
+        cfg.CONF.set_override('event_write_batch_size', 10)
+        self.patchobject(event.eventlet, 'spawn_after')
+
+        for i, defer in enumerate((True, True, False)):
+            e = event.Event(self.ctx, self.stack, 'TEST', 'IN_PROGRESS',
+                            'Testing', 'phys-%d' % i,
+                            self.resource.properties,
+                            self.resource.name, self.resource.type())
+            e.store(defer=defer)
+        self.assertIsNotNone(e.id)
+        events = sorted(event_object.Event.get_all_by_stack(self.ctx,
+                                                            self.stack.id),
+                        key=lambda ev: ev.id)
+        self.assertEqual(['phys-0', 'phys-1', 'phys-2'],
+                         [ev.physical_resource_id for ev in events])
+
+    def test_stack_complete_flushes_deferred(self):
+        cfg.CONF.set_override('event_write_batch_size', 10)
+        self.patchobject(event.eventlet, 'spawn_after')
+
+        self.stack.state_set(self.stack.CREATE, self.stack.IN_PROGRESS, '')
+        self.resource.state_set(self.resource.CREATE,
+                                self.resource.COMPLETE)
+        self.assertEqual([], event_object.Event.get_all_by_stack(
+            self.ctx, self.stack.id))
+        self.stack.state_set(self.stack.CREATE, self.stack.COMPLETE, '')
+        self.assertEqual(3, len(event_object.Event.get_all_by_stack(
+            self.ctx, self.stack.id)))
+
     def test_identifier(self):
         event_uuid = 'abc123yc-9f88-404d-a85b-531529456xyz'
         e = event.Event(self.ctx, self.stack, 'TEST', 'IN_PROGRESS', 'Testing',
@@ -79,3 +79,51 @@ class GroupUtilsTest(common.HeatTestCase):
         self.assertEqual([rsrc_ok], grouputils.get_members(group))
         self.assertEqual(['ID-r1'], grouputils.get_member_refids(group))
         self.assertEqual(['r1'], grouputils.get_member_names(group))
+
+    def test_member_index_reused(self):
+        group = mock.Mock()
+        t = template_format.parse(nested_stack)
+        stack = utils.parse_stack(t)
+        self.patchobject(group, 'nested', return_value=stack)
+
+        index = grouputils.get_member_index(group)
+        self.assertIs(index, grouputils.get_member_index(group))
+        self.assertEqual(['r0', 'r1'], grouputils.get_member_names(group))
+        self.assertIs(stack['r1'],
+                      grouputils.get_resource(group, '1', True, 'key'))
+
+    def test_member_index_rebuilt_on_reload(self):
+        group = mock.Mock()
+        t = template_format.parse(nested_stack)
+        stack = utils.parse_stack(t)
+        self.patchobject(group, 'nested', return_value=stack)
+
+        index = grouputils.get_member_index(group)
+        self.assertEqual(['ID-r0', 'ID-r1'],
+                         grouputils.get_member_refids(group))
+
+        reloaded = utils.parse_stack(t)
+        rsrc_err = reloaded.resources['r0']
+        rsrc_err.status = rsrc_err.FAILED
+        group.nested.return_value = reloaded
+        self.assertIsNot(index, grouputils.get_member_index(group))
+        self.assertEqual(['ID-r1'], grouputils.get_member_refids(group))
+        self.assertIs(reloaded['r1'],
+                      grouputils.get_resource(group, '0', True, 'key'))
+
+    def test_large_group_indexed_once(self):
+        group = mock.Mock()
+        members = dict(('r%d' % i, {'type': 'OverwrittenFnGetRefIdType'})
+                       for i in range(1000))
+        t = {'heat_template_version': '2013-05-23', 'resources': members}
+        stack = utils.parse_stack(t)
+        self.patchobject(group, 'nested', return_value=stack)
+
+        names = sorted(members)
+        index = grouputils.get_member_index(group)
+        for i in range(1000):
+            self.assertIs(stack[names[i]],
+                          grouputils.get_resource(group, str(i), True, 'key'))
+        self.assertEqual(1000, len(grouputils.get_member_refids(group)))
+        self.assertIs(index, grouputils.get_member_index(group))
+        self.assertIs(index.refids, index.refids)
@@ -1842,6 +1842,101 @@ class ResourceTest(common.HeatTestCase):
                           1, {}, 'engine-007', timeout)
 
 
+class ResourceCheckPollPolicyTest(common.HeatTestCase):
+    def setUp(self):
+        super(ResourceCheckPollPolicyTest, self).setUp()
+        self.stack = parser.Stack(utils.dummy_context(), 'test_stack',
+                                  template.Template(empty_template),
+                                  stack_id=str(uuid.uuid4()))
+        tmpl = rsrc_defn.ResourceDefinition('test_res', 'GenericResourceType')
+        self.res = generic_rsrc.GenericResource('test_res', tmpl, self.stack)
+        self.res.check_create_complete = mock.Mock(
+            side_effect=[False, False, True])
+        self.now = 0.0
+        self.patchobject(timeutils, 'wallclock', side_effect=lambda: self.now)
+        resource.check_complete_calls.clear()
+        self.addCleanup(resource.check_complete_calls.clear)
+
+    def _step_at(self, runner, now):
+        self.now = now
+        return runner.step()
+
+    def _assert_checked_every_step(self):
+        runner = scheduler.TaskRunner(self.res.action_handler_task,
+                                      self.res.CREATE)
+        runner.start()
+        self.assertFalse(self._step_at(runner, 0.1))
+        self.assertFalse(self._step_at(runner, 0.2))
+        self.assertTrue(self._step_at(runner, 0.3))
+        self.assertEqual(3, self.res.check_create_complete.call_count)
+        self.assertEqual(3, resource.check_complete_calls[
+            'GenericResourceType'])
+
+    def test_no_policy(self):
+        self._assert_checked_every_step()
+
+    def test_policy_not_matched(self):
+        cfg.CONF.set_override('check_complete_poll_policy',
+                              ['OS::Nova::*=2,30,1'])
+        self._assert_checked_every_step()
+
+    def test_invalid_policy(self):
+        cfg.CONF.set_override('check_complete_poll_policy',
+                              ['Generic*=fast'])
+        self._assert_checked_every_step()
+
+    def test_policy_backoff(self):
+        cfg.CONF.set_override('check_complete_poll_policy',
+                              ['Generic*=2,3'])
+        runner = scheduler.TaskRunner(self.res.action_handler_task,
+                                      self.res.CREATE)
+        runner.start()
+        check = self.res.check_create_complete
+
+        self.assertFalse(self._step_at(runner, 0.5))
+        self.assertEqual(0, check.call_count)
+        self.assertFalse(self._step_at(runner, 2))
+        self.assertEqual(0, check.call_count)
+        self.assertFalse(self._step_at(runner, 2.6))
+        self.assertEqual(1, check.call_count)
+        # the interval doubles, but is capped at the maximum
+        self.assertFalse(self._step_at(runner, 5))
+        self.assertEqual(1, check.call_count)
+        self.assertFalse(self._step_at(runner, 6))
+        self.assertEqual(2, check.call_count)
+        self.assertFalse(self._step_at(runner, 8.5))
+        self.assertEqual(2, check.call_count)
+        self.assertTrue(self._step_at(runner, 9.5))
+        self.assertEqual(3, check.call_count)
+        self.assertEqual(3, resource.check_complete_calls[
+            'GenericResourceType'])
+
+    def test_policy_jitter(self):
+        cfg.CONF.set_override('check_complete_poll_policy',
+                              ['GenericResourceType=1,10,5'])
+        self.patchobject(timeutils.random, 'random', return_value=0.5)
+        runner = scheduler.TaskRunner(self.res.action_handler_task,
+                                      self.res.CREATE)
+        runner.start()
+
+        self.assertFalse(self._step_at(runner, 0))
+        self.assertFalse(self._step_at(runner, 3))
+        self.assertEqual(0, self.res.check_create_complete.call_count)
+        self.assertFalse(self._step_at(runner, 3.6))
+        self.assertEqual(1, self.res.check_create_complete.call_count)
+
+    def test_policy_jitter_after_maximum(self):
+        self.patchobject(timeutils.random, 'random', return_value=0.5)
+        # once the maximum is reached, the jitter still spreads the checks
+        self.assertEqual(6.5, resource._next_check((1, 4, 5), 3).endtime())
+        self.assertEqual(6.5, resource._next_check((1, 4, 5), 10).endtime())
+
+    def test_policy_many_attempts(self):
+        next_check = resource._next_check((1, None, 0), 2000)
+        self.assertEqual(2 ** resource._MAX_BACKOFF_ATTEMPT,
+                         next_check.endtime())
+
+
 class ResourceAdoptTest(common.HeatTestCase):
 
     def test_adopt_resource_success(self):
@@ -20,6 +20,7 @@ Unit Tests for heat.rpc.client
 import copy
 
 import mock
+import oslo_messaging
 from oslo_messaging._drivers import common as rpc_common
 import stubout
 
@@ -123,6 +124,36 @@ class EngineRpcAPITestCase(common.HeatTestCase):
         }
         self._test_engine_api('list_stacks', 'call', **default_args)
 
+    def test_list_stacks_summary(self):
+        ctxt = utils.dummy_context()
+        with mock.patch.object(self.rpcapi, 'call') as mock_call:
+            mock_call.return_value = 'foo'
+            self.assertEqual('foo', self.rpcapi.list_stacks(ctxt,
+                                                            summary=True))
+        mock_call.assert_called_once_with(ctxt, ('list_stacks', mock.ANY),
+                                          version='1.16')
+        self.assertTrue(mock_call.call_args[0][1][1]['summary'])
+
+    def test_list_stacks_summary_older_engine(self):
+        ctxt = utils.dummy_context()
+        with mock.patch.object(self.rpcapi, 'call') as mock_call:
+            mock_call.side_effect = [
+                oslo_messaging.RemoteError('UnsupportedVersion'), 'foo']
+            self.assertEqual('foo', self.rpcapi.list_stacks(ctxt,
+                                                            summary=True))
+        self.assertEqual(2, mock_call.call_count)
+        args, kwargs = mock_call.call_args
+        self.assertEqual('1.8', kwargs['version'])
+        self.assertNotIn('summary', args[1][1])
+
+    def test_list_stacks_summary_error(self):
+        ctxt = utils.dummy_context()
+        with mock.patch.object(self.rpcapi, 'call') as mock_call:
+            mock_call.side_effect = oslo_messaging.RemoteError('StackNotFound')
+            self.assertRaises(oslo_messaging.RemoteError,
+                              self.rpcapi.list_stacks, ctxt, summary=True)
+        self.assertEqual(1, mock_call.call_count)
+
     def test_count_stacks(self):
         default_args = {
             'filters': mock.ANY,
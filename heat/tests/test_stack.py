@@ -17,6 +17,7 @@ import datetime
 import json
 import time
 
+import eventlet
 import mock
 import mox
 from oslo_config import cfg
@@ -272,6 +273,84 @@ class StackTest(common.HeatTestCase):
         all_resources = list(self.stack.iter_resources(1))
         self.assertEqual(5, len(all_resources))
 
+    def test_iter_resources_loads_nested_stacks(self):
+        tpl = {'HeatTemplateFormatVersion': '2012-12-12',
+               'Resources':
+               {'A': {'Type': 'StackResourceType'},
+                'B': {'Type': 'GenericResourceType'}}}
+        nested_tpl = {'HeatTemplateFormatVersion': '2012-12-12',
+                      'Resources':
+                      {'C': {'Type': 'GenericResourceType'}}}
+        parent = stack.Stack(self.ctx, 'test_stack', template.Template(tpl))
+        parent.store()
+        nested = stack.Stack(self.ctx, 'nested_stack',
+                             template.Template(nested_tpl),
+                             owner_id=parent.id, parent_resource='A')
+        nested.store()
+        nested['C']._store()
+        parent['A']._store()
+        parent['A'].resource_id_set(nested.id)
+        parent['B']._store()
+
+        self.stack = stack.Stack.load(self.ctx, parent.id)
+        # load the parent stack's own resources
+        self.assertEqual(nested.id, self.stack['A'].resource_id)
+        get_by_id = self.patchobject(stack_object.Stack, 'get_by_id')
+        get_all_by_stack = self.patchobject(
+            stack.resource_objects.Resource, 'get_all_by_stack')
+        get_template = self.patchobject(raw_template_object.RawTemplate,
+                                        'get_by_id')
+
+        resources = list(self.stack.iter_resources(1))
+        self.assertEqual(['A', 'B', 'C'],
+                         sorted(res.name for res in resources))
+        self.assertEqual(nested.id, self.stack['A'].nested().id)
+        self.assertFalse(get_by_id.called)
+        self.assertFalse(get_all_by_stack.called)
+        self.assertFalse(get_template.called)
+
+    def test_prefetch_output_attributes(self):
+        tpl = {'HeatTemplateFormatVersion': '2012-12-12',
+               'Resources':
+               {'A': {'Type': 'GenericResourceType'},
+                'B': {'Type': 'GenericResourceType'},
+                'C': {'Type': 'GenericResourceType'}},
+               'Outputs':
+               {'a': {'Value': {'Fn::GetAtt': ['A', 'Foo']}},
+                'a2': {'Value': {'Fn::GetAtt': ['A', 'foo']}},
+                'b': {'Value': {'Fn::GetAtt': ['B', 'Foo']}},
+                'bad': {'Value': {'Fn::GetAtt': ['D', 'Foo']}}}}
+        self.stack = stack.Stack(self.ctx, 'test_stack',
+                                 template.Template(tpl))
+        self.stack['B'].concurrent_attribute_lookups = True
+        resolve_a = self.patchobject(self.stack['A'], 'resolve_attributes')
+        resolve_b = self.patchobject(self.stack['B'], 'resolve_attributes')
+        resolve_c = self.patchobject(self.stack['C'], 'resolve_attributes')
+
+        self.stack.prefetch_output_attributes()
+
+        resolve_a.assert_called_once_with(set(['Foo', 'foo']))
+        resolve_b.assert_called_once_with(set(['Foo']))
+        self.assertFalse(resolve_c.called)
+
+    def test_prefetch_attributes_cached(self):
+        tpl = {'HeatTemplateFormatVersion': '2012-12-12',
+               'Resources':
+               {'A': {'Type': 'GenericResourceType'}},
+               'Outputs':
+               {'a': {'Value': {'Fn::GetAtt': ['A', 'Foo']}}}}
+        self.stack = stack.Stack(self.ctx, 'test_stack',
+                                 template.Template(tpl))
+        res = self.stack['A']
+        res.action = res.CREATE
+        res.status = res.COMPLETE
+        resolve = self.patchobject(res, '_resolve_attribute',
+                                   return_value='bar')
+
+        self.stack.prefetch_output_attributes()
+        self.assertEqual('bar', self.stack.output('a'))
+        resolve.assert_called_once_with('Foo')
+
     @mock.patch.object(stack.Stack, 'db_resource_get')
     def test_iter_resources_cached(self, mock_drg):
         tpl = {'HeatTemplateFormatVersion': '2012-12-12',
@@ -1282,6 +1361,50 @@ class StackTest(common.HeatTestCase):
         expected_err = 'Attempt to use stored_context with no user_creds'
         self.assertEqual(expected_err, six.text_type(ex))
 
+    def test_stored_context_cached(self):
+        cfg.CONF.set_override('stored_context_cache_ttl', 60)
+        self.addCleanup(stack.stored_creds_cache().clear)
+        ctx_init = utils.dummy_context(user='my_user',
+                                       password='my_pass')
+        ctx_init.request_id = self.ctx.request_id
+        creds = ucreds_object.UserCreds.create(ctx_init)
+        self.stack = stack.Stack(self.ctx, 'creds_cached', self.tmpl,
+                                 user_creds_id=creds.id)
+
+        get_creds = self.patchobject(ucreds_object.UserCreds, 'get_by_id',
+                                     wraps=ucreds_object.UserCreds.get_by_id)
+        first = self.stack.stored_context().to_dict()
+        second = self.stack.stored_context().to_dict()
+        self.assertEqual(first, second)
+        self.assertEqual('my_user', second['username'])
+        self.assertEqual(1, get_creds.call_count)
+
+        stack.stored_creds_cache().pop(creds.id)
+        self.stack.stored_context()
+        self.assertEqual(2, get_creds.call_count)
+
+    def test_resource_get(self):
+        tmpl = {'HeatTemplateFormatVersion': '2012-12-12',
+                'Resources': {'A': {'Type': 'GenericResourceType'},
+                              'B': {'Type': 'GenericResourceType'}}}
+        self.stack = stack.Stack(self.ctx, 'resource_get_test',
+                                 template.Template(tmpl))
+        self.stack.store()
+        self.stack.create()
+        self.assertEqual((stack.Stack.CREATE, stack.Stack.COMPLETE),
+                         self.stack.state)
+
+        s = stack.Stack.load(self.ctx, stack_id=self.stack.id)
+        self.assertIsNone(s.resource_get('C'))
+        rsrc = s.resource_get('A')
+        self.assertIsNone(s._resources)
+        self.assertEqual(self.stack['A'].id, rsrc.id)
+        self.assertIs(rsrc, s.resource_get('A'))
+
+        # The resource is reused when all of the resources are loaded
+        self.assertIs(rsrc, s['A'])
+        self.assertIsNotNone(s['B'].id)
+
     def test_store_gets_username_from_stack(self):
         self.stack = stack.Stack(self.ctx, 'username_stack',
                                  self.tmpl, username='foobar')
@@ -2203,6 +2326,86 @@ class StackTest(common.HeatTestCase):
         self.assertIsNone(tmpl_stack.prev_raw_template_id)
         self.assertFalse(mock_store.called)
 
+    def test_metadata_dependents(self):
+        tmpl = template.Template({
+            'HeatTemplateFormatVersion': '2012-12-12',
+            'Resources': {
+                'Handle': {'Type': 'GenericResourceType'},
+                'Waiter': {'Type': 'GenericResourceType',
+                           'DependsOn': 'Handle'},
+                'ByAttr': {'Type': 'GenericResourceType',
+                           'Metadata': {'data': {'Fn::GetAtt': ['Waiter',
+                                                                'foo']}}},
+                'ByRef': {'Type': 'GenericResourceType',
+                          'Metadata': {'handle': {'Ref': 'Handle'}}},
+                'Other': {'Type': 'GenericResourceType',
+                          'DependsOn': 'Handle',
+                          'Metadata': {'static': 'data'}}
+            }
+        })
+        stc = stack.Stack(self.ctx, 'metadata_dependents_test', tmpl)
+        self.assertEqual(['ByAttr', 'ByRef'],
+                         sorted(r.name
+                                for r in stc.metadata_dependents('Handle')))
+        self.assertEqual(['ByAttr'],
+                         [r.name for r in stc.metadata_dependents('Waiter')])
+        self.assertEqual([], stc.metadata_dependents('Other'))
+
+    def test_validate_reports_first_error_in_dependency_order(self):
+        tmpl = template.Template({
+            'HeatTemplateFormatVersion': '2012-12-12',
+            'Resources': {
+                'AResource': {'Type': 'GenericResourceType'},
+                'BResource': {'Type': 'GenericResourceType',
+                              'DependsOn': 'AResource'},
+                'CResource': {'Type': 'GenericResourceType',
+                              'DependsOn': 'BResource'}
+            }
+        })
+        stc = stack.Stack(self.ctx, 'validate_order_test', tmpl)
+        errors = {'BResource': 'B is invalid',
+                  'CResource': 'C is invalid'}
+        validated = []
+
+        def validate(res):
+            validated.append(res.name)
+            return errors.get(res.name)
+
+        with mock.patch.object(generic_rsrc.GenericResource, 'validate',
+                               autospec=True, side_effect=validate):
+            ex = self.assertRaises(exception.StackValidationFailed,
+                                   stc.validate)
+        self.assertIn('B is invalid', six.text_type(ex))
+        self.assertEqual(['AResource', 'BResource', 'CResource'],
+                         sorted(validated))
+
+    def test_validate_concurrent_only_if_allowed(self):
+        tmpl = template.Template({
+            'HeatTemplateFormatVersion': '2012-12-12',
+            'Resources': {
+                'AResource': {'Type': 'GenericResourceType'},
+                'BResource': {'Type': 'GenericResourceType'},
+                'CResource': {'Type': 'GenericResourceType'}
+            }
+        })
+        stc = stack.Stack(self.ctx, 'validate_concurrent_test', tmpl)
+        stc['BResource'].concurrent_validation = True
+        threads = {}
+
+        def validate(res):
+            threads[res.name] = eventlet.getcurrent()
+
+        with mock.patch.object(generic_rsrc.GenericResource, 'validate',
+                               autospec=True, side_effect=validate):
+            stc.validate()
+
+        # assert that only the resource which allows it is validated in a
+        # green thread of its own
+        current = eventlet.getcurrent()
+        self.assertIs(current, threads['AResource'])
+        self.assertIsNot(current, threads['BResource'])
+        self.assertIs(current, threads['CResource'])
+
     @mock.patch.object(function, 'validate')
     def test_validate_assertion_exception_rethrow(self, func_val):
         expected_msg = 'Expected Assertion Error'
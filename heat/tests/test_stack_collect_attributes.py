@@ -11,9 +11,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
 import six
 
 from heat.common import template_format
+from heat.engine import rsrc_defn
 from heat.engine import stack
 from heat.engine import template
 from heat.tests import common
@@ -177,3 +179,61 @@ class DepAttrsTest(common.HeatTestCase):
             self.assertEqual(self.expected[res.name],
                              self.stack.get_dep_attrs(resources, outputs,
                                                       res.name))
+
+    def test_dependent_attrs(self):
+        parsed_tmpl = template_format.parse(self.tmpl)
+        self.stack = stack.Stack(self.ctx, 'test_stack',
+                                 template.Template(parsed_tmpl))
+
+        for res in six.itervalues(self.stack):
+            self.assertEqual(self.expected[res.name],
+                             self.stack.dependent_attrs(res.name))
+
+
+class DepAttrsIndexTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(DepAttrsIndexTest, self).setUp()
+        self.ctx = utils.dummy_context()
+
+    def _chain_stack(self, size):
+        resources = {'R0': {'type': 'ResourceWithPropsType',
+                            'properties': {'Foo': 'abc'}}}
+        for i in range(1, size):
+            resources['R%d' % i] = {
+                'type': 'ResourceWithPropsType',
+                'properties': {
+                    'Foo': {'get_attr': ['R%d' % (i - 1), 'attr']}}}
+        tmpl = {'heat_template_version': '2014-10-16',
+                'resources': resources,
+                'outputs': {'out': {'value': {'get_attr': ['R0', 'out']}}}}
+        return stack.Stack(self.ctx, 'test_stack', template.Template(tmpl))
+
+    def _count_walks(self, size):
+        test_stack = self._chain_stack(size)
+        with mock.patch.object(rsrc_defn.ResourceDefinition,
+                               'all_dep_attrs', autospec=True,
+                               side_effect=lambda defn: iter([])) as walk:
+            for res_name in test_stack:
+                test_stack.dependent_attrs(res_name)
+            return walk.call_count
+
+    def test_index_built_once(self):
+        # Looking up the attributes of every resource must walk each resource
+        # definition once in total, not once per lookup, so that the
+        # per-resource cost of propagating input data stays flat as the
+        # stack grows.
+        self.assertEqual(10, self._count_walks(10))
+        self.assertEqual(200, self._count_walks(200))
+
+    def test_index_contents(self):
+        test_stack = self._chain_stack(3)
+        self.assertEqual({'attr', 'out'}, test_stack.dependent_attrs('R0'))
+        self.assertEqual({'attr'}, test_stack.dependent_attrs('R1'))
+        self.assertEqual(set(), test_stack.dependent_attrs('R2'))
+
+    def test_index_reset(self):
+        test_stack = self._chain_stack(3)
+        self.assertEqual({'attr'}, test_stack.dependent_attrs('R1'))
+        test_stack.remove_resource('R2')
+        self.assertEqual(set(), test_stack.dependent_attrs('R1'))
@@ -27,6 +27,7 @@ from heat.engine import resource
 from heat.engine.resources import stack_resource
 from heat.engine import stack as parser
 from heat.engine import template as templatem
+from heat.objects import stack as stack_object
 from heat.tests import common
 from heat.tests import generic_resource as generic_rsrc
 from heat.tests import utils
@@ -713,9 +714,22 @@ class StackResourceCheckCompleteTest(StackResourceBaseTest):
         self.nested.name = 'nested-stack'
         self.parent_resource.nested = mock.MagicMock(return_value=self.nested)
         self.parent_resource._nested = self.nested
+        self.parent_resource.resource_id = 'nested-stack-id'
         setattr(self.nested, self.action.upper(), self.action.upper())
         self.nested.action = self.action.upper()
         self.nested.COMPLETE = 'COMPLETE'
+        self.get_status = self.patchobject(
+            stack_object.Stack, 'get_status',
+            side_effect=lambda *args, **kwargs: (self.nested.action,
+                                                 self.nested.status,
+                                                 self.nested.status_reason,
+                                                 self.nested.updated_time))
+
+    def _assert_status_read(self):
+        self.get_status.assert_called_once_with(
+            self.parent_resource.context, 'nested-stack-id',
+            show_deleted=self.show_deleted)
+        self.assertFalse(self.parent_resource.nested.called)
 
     def test_state_ok(self):
         """
@@ -726,8 +740,16 @@ class StackResourceCheckCompleteTest(StackResourceBaseTest):
         complete = getattr(self.parent_resource,
                            'check_%s_complete' % self.action)
         self.assertIs(True, complete(None))
-        self.parent_resource.nested.assert_called_once_with(
-            show_deleted=self.show_deleted, force_reload=True)
+        self._assert_status_read()
+        self.assertIsNone(self.parent_resource._nested)
+
+    def test_not_created(self):
+        self.get_status.return_value = None
+        self.get_status.side_effect = None
+        complete = getattr(self.parent_resource,
+                           'check_%s_complete' % self.action)
+        self.assertIs(self.action == 'delete', complete(None))
+        self._assert_status_read()
 
     def test_state_err(self):
         """
@@ -746,8 +768,7 @@ class StackResourceCheckCompleteTest(StackResourceBaseTest):
                            'check_%s_complete' % self.action)
         exc = self.assertRaises(exception.ResourceFailure, complete, None)
         self.assertEqual(exp, six.text_type(exc))
-        self.parent_resource.nested.assert_called_once_with(
-            show_deleted=self.show_deleted, force_reload=True)
+        self._assert_status_read()
 
     def test_state_unknown(self):
         """
@@ -759,16 +780,14 @@ class StackResourceCheckCompleteTest(StackResourceBaseTest):
         complete = getattr(self.parent_resource,
                            'check_%s_complete' % self.action)
         self.assertRaises(resource.ResourceUnknownStatus, complete, None)
-        self.parent_resource.nested.assert_called_once_with(
-            show_deleted=self.show_deleted, force_reload=True)
+        self._assert_status_read()
 
     def test_in_progress(self):
         self.nested.status = 'IN_PROGRESS'
         complete = getattr(self.parent_resource,
                            'check_%s_complete' % self.action)
         self.assertFalse(complete(None))
-        self.parent_resource.nested.assert_called_once_with(
-            show_deleted=self.show_deleted, force_reload=True)
+        self._assert_status_read()
 
     def test_update_not_started(self):
         if self.action != 'update':
@@ -785,16 +804,14 @@ class StackResourceCheckCompleteTest(StackResourceBaseTest):
                            'check_%s_complete' % self.action)
 
         self.assertFalse(complete(cookie=cookie))
-        self.parent_resource.nested.assert_called_once_with(
-            show_deleted=self.show_deleted, force_reload=True)
+        self._assert_status_read()
 
     def test_wrong_action(self):
         self.nested.action = 'COMPLETE'
         complete = getattr(self.parent_resource,
                            'check_%s_complete' % self.action)
         self.assertFalse(complete(None))
-        self.parent_resource.nested.assert_called_once_with(
-            show_deleted=self.show_deleted, force_reload=True)
+        self._assert_status_read()
 
 
 class WithTemplateTest(StackResourceBaseTest):
@@ -26,6 +26,7 @@ from heat.common import exception
 from heat.common import template_format
 from heat.engine.clients.os import swift
 from heat.engine import resource
+from heat.engine.resources.openstack.heat import swiftsignal
 from heat.engine import rsrc_defn
 from heat.engine import scheduler
 from heat.engine import stack
@@ -101,12 +102,15 @@ def create_stack(template, stack_id=None):
 def cont_index(obj_name, num_version_hist):
     objects = [{'bytes': 11,
                 'last_modified': '2014-07-03T19:42:03.281640',
-                'hash': '9214b4e4460fcdb9f3a369941400e71e',
-                'name': "02b" + obj_name + '/1404416326.51383',
-                'content_type': 'application/octet-stream'}] * num_version_hist
+                'hash': '9214b4e4460fcdb9f3a369941400e7%02x' % i,
+                'name': "02b" + obj_name + '/14044163%02d.51383' % i,
+                'content_type': 'application/octet-stream'}
+               for i in six.moves.xrange(num_version_hist)]
+    # The content of the current object changes with every signal
     objects.append({'bytes': 8,
                     'last_modified': '2014-07-03T19:42:03.849870',
-                    'hash': '9ab7c0738852d7dd6a2dc0b261edc300',
+                    'hash': '9ab7c0738852d7dd6a2dc0b261edc3%02x' %
+                            num_version_hist,
                     'name': obj_name,
                     'content_type': 'application/x-www-form-urlencoded'})
     return (container_header, objects)
@@ -348,19 +352,92 @@ class SwiftSignalTest(common.HeatTestCase):
         }
         obj_name = "%s-%s-abcdefghijkl" % (st.name, handle.name)
         mock_name.return_value = obj_name
-        mock_swift_object.get_container.return_value = cont_index(obj_name, 2)
+        mock_swift_object.get_container.side_effect = (
+            cont_index(obj_name, 1),
+            cont_index(obj_name, 2),
+        )
         mock_swift_object.get_object.side_effect = (
             (obj_header, json.dumps({'id': 1})),
             (obj_header, json.dumps({'id': 1})),
-            (obj_header, json.dumps({'id': 1})),
 
-            (obj_header, json.dumps({'id': 1})),
+            # Only the new and changed objects are fetched again
             (obj_header, json.dumps({'id': 2})),
             (obj_header, json.dumps({'id': 3})),
         )
 
         st.create()
         self.assertEqual(('CREATE', 'COMPLETE'), st.state)
+        self.assertEqual(4, mock_swift_object.get_object.call_count)
+
+    @mock.patch.object(swift.SwiftClientPlugin, '_create')
+    @mock.patch.object(resource.Resource, 'physical_resource_name')
+    def test_get_signals_fetches_changed_objects(self, mock_name,
+                                                 mock_swift):
+        st = create_stack(swiftsignal_template)
+        handle = st['test_wait_condition_handle']
+        wc = st['test_wait_condition']
+
+        mock_swift_object = mock.Mock()
+        mock_swift.return_value = mock_swift_object
+        obj_name = "%s-%s-abcdefghijkl" % (st.name, handle.name)
+        mock_name.return_value = obj_name
+        wc._obj_name = obj_name
+        index = cont_index(obj_name, 2)
+        mock_swift_object.get_container.return_value = index
+        mock_swift_object.get_object.side_effect = (
+            (obj_header, json.dumps({'id': 1, 'data': "foo"})),
+            (obj_header, json.dumps({'id': 2, 'data': "bar"})),
+            (obj_header, swift.IN_PROGRESS),
+
+            (obj_header, json.dumps({'id': 3, 'data': "baz"})),
+        )
+
+        expected = [{'status': 'SUCCESS', 'reason': 'Signal 1 received',
+                     'data': "foo", 'id': 1},
+                    {'status': 'SUCCESS', 'reason': 'Signal 2 received',
+                     'data': "bar", 'id': 2}]
+        self.assertEqual(expected, wc.get_signals())
+        self.assertEqual(3, mock_swift_object.get_object.call_count)
+
+        # Nothing is fetched again while the objects are unchanged
+        self.assertEqual(expected, wc.get_signals())
+        self.assertEqual(['Signal 1 received', 'Signal 2 received'],
+                         wc.get_status_reason(wc.STATUS_SUCCESS))
+        self.assertEqual({1: "foo", 2: "bar"}, wc.get_data())
+        self.assertEqual(3, mock_swift_object.get_object.call_count)
+
+        # Only the object whose content changed is fetched again
+        index[1][2]['hash'] = 'd41d8cd98f00b204e9800998ecf8427e'
+        self.assertEqual({1: "foo", 2: "bar", 3: "baz"}, wc.get_data())
+        self.assertEqual(4, mock_swift_object.get_object.call_count)
+        mock_swift_object.get_object.assert_called_with(st.id, obj_name)
+
+    @mock.patch.object(swift.SwiftClientPlugin, '_create')
+    @mock.patch.object(resource.Resource, 'physical_resource_name')
+    def test_check_create_complete_fetches_signals_once(self, mock_name,
+                                                        mock_swift):
+        st = create_stack(swiftsignal_template)
+        handle = st['test_wait_condition_handle']
+        wc = st['test_wait_condition']
+
+        mock_swift_object = mock.Mock()
+        mock_swift.return_value = mock_swift_object
+        obj_name = "%s-%s-abcdefghijkl" % (st.name, handle.name)
+        mock_name.return_value = obj_name
+        wc._obj_name = obj_name
+        mock_swift_object.get_container.return_value = cont_index(obj_name, 1)
+        mock_swift_object.get_object.side_effect = (
+            (obj_header, json.dumps({'id': 1, 'status': "FAILURE",
+                                     'reason': "foo"})),
+            (obj_header, json.dumps({'id': 2, 'status': "SUCCESS"})),
+        )
+
+        create_data = (timeutils.utcnow(), 60.0)
+        ex = self.assertRaises(swiftsignal.SwiftSignalFailure,
+                               wc.check_create_complete, create_data)
+        self.assertEqual('foo', six.text_type(ex))
+        self.assertEqual(1, mock_swift_object.get_container.call_count)
+        self.assertEqual(2, mock_swift_object.get_object.call_count)
 
     @mock.patch.object(swift.SwiftClientPlugin, '_create')
     @mock.patch.object(resource.Resource, 'physical_resource_name')
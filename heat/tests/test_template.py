@@ -21,6 +21,7 @@ import six
 from stevedore import extension
 
 from heat.common import exception
+from heat.common import lru_cache
 from heat.common import template_format
 from heat.engine.cfn import functions as cfn_funcs
 from heat.engine.cfn import template as cfn_t
@@ -965,6 +966,51 @@ class TemplateTest(common.HeatTestCase):
         self.assertEqual({}, empty_template['resources'])
         self.assertEqual({}, empty_template['outputs'])
 
+    def _store_hot_template(self):
+        self.patchobject(template, '_parsed_templates',
+                         new=lru_cache.LRUCache(10))
+        t = template_format.parse('''
+            heat_template_version: 2015-04-30
+            resources:
+              foo:
+                type: GenericResourceType
+            ''')
+        return template.Template(t).store(self.ctx)
+
+    def test_load_shares_parsed_state(self):
+        template_id = self._store_hot_template()
+        tmpl1 = template.Template.load(self.ctx, template_id)
+        tmpl2 = template.Template.load(self.ctx, template_id)
+        cache = template.parsed_template_cache()
+        self.assertEqual(1, len(cache))
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+        self.assertEqual(type(tmpl1), type(tmpl2))
+        self.assertIsNot(tmpl1.t, tmpl2.t)
+        tmpl1.validate()
+        self.assertIs(tmpl1['resources'], tmpl2['resources'])
+        self.assertEqual({'foo': {'Type': 'GenericResourceType'}},
+                         tmpl2['resources'])
+
+        self.patchobject(tmpl2, '_translate_resources')
+        tmpl2.validate()
+        self.assertFalse(tmpl2._translate_resources.called)
+
+    def test_modified_template_unshares_parsed_state(self):
+        template_id = self._store_hot_template()
+        tmpl1 = template.Template.load(self.ctx, template_id)
+        tmpl2 = template.Template.load(self.ctx, template_id)
+        tmpl1.validate()
+
+        defn = rsrc_defn.ResourceDefinition('bar', 'GenericResourceType')
+        tmpl2.add_resource(defn)
+        self.assertEqual(['foo'], list(tmpl1['resources']))
+        self.assertEqual(['bar', 'foo'], sorted(tmpl2['resources']))
+
+        tmpl2.t['resources']['baz'] = None
+        self.assertRaises(exception.StackValidationFailed, tmpl2.validate)
+
 
 class TemplateFnErrorTest(common.HeatTestCase):
     scenarios = [
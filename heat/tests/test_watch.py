@@ -23,6 +23,7 @@ from heat.common import exception
 from heat.engine import stack
 from heat.engine import template
 from heat.engine import watchrule
+from heat.objects import watch_data
 from heat.objects import watch_rule
 from heat.tests import common
 from heat.tests import utils
@@ -675,7 +676,8 @@ class WatchRuleTest(common.HeatTestCase):
         self.wr.create_watch_data(data)
 
         obj_wr = watch_rule.WatchRule.get_by_name(self.ctx, 'create_data_test')
-        obj_wds = [wd for wd in obj_wr.watch_data]
+        obj_wds = list(watch_data.WatchData.get_all_by_watch_rule_id(
+            self.ctx, obj_wr.id))
         self.assertEqual(data, obj_wds[0].data)
 
         # Note, would be good to write another datapoint and check it
@@ -685,6 +687,40 @@ class WatchRuleTest(common.HeatTestCase):
         # correctly get a list of all datapoints where watch_rule_id ==
         # watch_rule.id, so leave it as a single-datapoint test for now.
 
+    def test_evaluate_stored_watch_data(self):
+        rule = {u'EvaluationPeriods': u'1',
+                u'AlarmDescription': u'test alarm',
+                u'Period': u'300',
+                u'ComparisonOperator': u'GreaterThanThreshold',
+                u'Statistic': u'Average',
+                u'Threshold': u'30',
+                u'MetricName': u'test_metric'}
+        now = timeutils.utcnow()
+        self.wr = watchrule.WatchRule(context=self.ctx,
+                                      watch_name='stored_data_test',
+                                      stack_id=self.stack_id, rule=rule)
+        self.wr.store()
+
+        for value, age in ((100, 400), (40, 200), (30, 100)):
+            timeutils.set_time_override(now - datetime.timedelta(seconds=age))
+            self.wr.create_watch_data({u'test_metric': {"Unit": "Count",
+                                                        "Value": value}})
+        timeutils.set_time_override(now)
+        self.addCleanup(timeutils.clear_time_override)
+
+        # Only the samples within the period are read and used
+        wr = watchrule.WatchRule.load(self.ctx, 'stored_data_test')
+        self.assertIsNone(wr.watch_data)
+        self.assertEqual([40.0, 30.0], list(wr._window_values()))
+        self.assertEqual('ALARM', wr.get_alarm_state())
+
+        # Samples that are older than the period are pruned
+        wr.run_rule()
+        obj_wr = watch_rule.WatchRule.get_by_name(self.ctx, 'stored_data_test')
+        self.assertEqual(2, len(list(
+            watch_data.WatchData.get_all_by_watch_rule_id(self.ctx,
+                                                          obj_wr.id))))
+
     def test_create_watch_data_suspended(self):
         rule = {u'EvaluationPeriods': u'1',
                 u'AlarmDescription': u'test alarm',
@@ -706,7 +742,8 @@ class WatchRuleTest(common.HeatTestCase):
         self.wr.create_watch_data(data)
 
         obj_wr = watch_rule.WatchRule.get_by_name(self.ctx, 'create_data_test')
-        obj_wds = [wd for wd in obj_wr.watch_data]
+        obj_wds = list(watch_data.WatchData.get_all_by_watch_rule_id(
+            self.ctx, obj_wr.id))
         self.assertEqual([], obj_wds)
 
     def test_create_watch_data_match(self):